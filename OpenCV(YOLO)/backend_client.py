@@ -0,0 +1,139 @@
+"""
+Pooled HTTP client for the Node backend API
+
+One aiohttp session per process, opened and closed with the FastAPI app
+(see the lifespan in prediction.py), so requests to the backend reuse
+keep-alive connections and cached DNS instead of opening a new TCP
+connection each time. GET requests that fail with a connection error, a
+timeout or a 5xx answer are retried with exponential backoff.
+"""
+import asyncio
+import random
+import time
+from typing import Dict, Optional
+
+from parking_common.metrics import Histogram, LATENCY_BUCKETS_MS
+
+
+class BackendError(Exception):
+    """The backend could not be reached or did not answer with usable JSON"""
+
+
+class BackendClient:
+    """Keep-alive connection pool to one backend base URL, with retries and latency counters"""
+
+    def __init__(self, base_url: str, total_timeout: float = 10.0, connect_timeout: float = 2.0,
+                 retries: int = 2, backoff: float = 0.1, pool_size: int = 100, pool_per_host: int = 20,
+                 keepalive_timeout: float = 30.0):
+        """
+        Args:
+            base_url: Prefix for every request path (e.g. http://localhost:3000/api)
+            total_timeout: Seconds allowed for one attempt, connect to last byte
+            connect_timeout: Seconds allowed to get a connection from the pool or open one
+            retries: Extra attempts after a failed one (GET only)
+            backoff: Delay before the first retry; doubled for each further one, with jitter
+            pool_size: Open connections across all hosts
+            pool_per_host: Open connections to one host
+            keepalive_timeout: Seconds an idle connection is kept for reuse
+        """
+        self.base_url = base_url.rstrip("/")
+        self.total_timeout = total_timeout
+        self.connect_timeout = connect_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self.pool_per_host = pool_per_host
+        self.keepalive_timeout = keepalive_timeout
+
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+        self.last_error = None
+
+        self._session = None
+        self._loop = None
+
+    async def start(self):
+        """Open the connection pool (done by the app lifespan; otherwise on first use)"""
+        import aiohttp
+
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.pool_per_host,
+            ttl_dns_cache=300,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.total_timeout, sock_connect=self.connect_timeout),
+        )
+        self._loop = asyncio.get_running_loop()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get_json(self, path: str, params: Optional[Dict] = None) -> Dict:
+        """
+        GET base_url + path and return the decoded JSON body
+
+        Raises BackendError once all attempts failed, or at once for a 4xx
+        answer (retrying would not change it).
+        """
+        import aiohttp
+
+        session = await self._session_for_loop()
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        attempt = 0
+        while True:
+            self.requests += 1
+            start = time.perf_counter()
+            try:
+                async with session.get(url, params=params) as response:
+                    if response.status < 500:
+                        if response.status != 200:
+                            raise BackendError(f"GET {url} answered {response.status}")
+                        body = await response.json(content_type=None)
+                        self.latency_ms.observe((time.perf_counter() - start) * 1e3)
+                        return body
+                    error = BackendError(f"GET {url} answered {response.status}")
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                error = BackendError(f"GET {url} failed: {e!r}")
+            except BackendError as e:
+                self.failures += 1
+                self.last_error = str(e)
+                raise
+
+            if attempt >= self.retries:
+                self.failures += 1
+                self.last_error = str(error)
+                raise error
+            delay = self.backoff * (2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay))
+            attempt += 1
+            self.retried += 1
+
+    def stats(self) -> Dict:
+        return {
+            "base_url": self.base_url,
+            "open": self._session is not None and not self._session.closed,
+            "pool_size": self.pool_size,
+            "pool_per_host": self.pool_per_host,
+            "requests": self.requests,
+            "retries": self.retried,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "latency_ms": self.latency_ms.snapshot(),
+        }
+
+    async def _session_for_loop(self):
+        # A session belongs to the event loop it was opened on; outside the app
+        # lifespan (scripts, tests) each new loop gets a fresh pool
+        if self._session is None or self._session.closed or self._loop is not asyncio.get_running_loop():
+            self._session = None
+            await self.start()
+        return self._session
@@ -0,0 +1,89 @@
+"""
+Benchmark: building model input rows, per-row dicts vs the compiled FeatureSchema
+
+dicts:  _prepare_prediction_features for every row, then _feature_matrix
+schema: FeatureSchema.fill writing the dynamic columns into per-area templates
+
+Both must produce the same matrix (the dict route's values cast to float32,
+which is what XGBoost scores anyway) and the same predictions; the script
+fails if they do not. Needs the model files next to prediction.py.
+
+Usage:
+    python benchmarks/bench_feature_schema.py [--offsets 37] [--repeat 200]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+os.environ.setdefault('PREDICTION_WARMUP', 'eager')
+import prediction  # noqa: E402
+
+
+def random_features(rng, n_offsets: int) -> dict:
+    areas = list(prediction.PARKING_AREAS)
+    start = datetime(2025, 11, 10) + timedelta(minutes=int(rng.integers(0, 7 * 24 * 60)))
+    features = {'area_ids': [], 'arrival_times': [], 'current_occupancy': [], 'traffic_density': [], 'distance_km': []}
+    for offset in range(0, 5 * n_offsets, 5):
+        for area_id in areas:
+            features['area_ids'].append(area_id)
+            features['arrival_times'].append(start + timedelta(minutes=offset))
+            features['current_occupancy'].append(float(rng.uniform(0, 1)))
+            features['traffic_density'].append(float(rng.choice([0.2, 0.5, 0.8, 1.0])))
+            features['distance_km'].append(float(rng.uniform(0, 10)))
+    features['weather_data'] = {'weather_condition': str(rng.choice(['Clear', 'Cloudy', 'Rainy'])),
+                                'temperature_c': float(rng.uniform(18, 40))}
+    features['vehicle_type'] = str(rng.choice(['car', 'bike', 'truck']))
+    return features
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--offsets', type=int, default=37, help='Arrival times per request (37 = 3 h at 5 min)')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    bundle = prediction.current_model
+    if bundle.backend is None:
+        raise SystemExit('❌ No model loaded')
+    service = prediction.prediction_service
+    rng = np.random.default_rng(0)
+
+    for _ in range(50):
+        features = random_features(rng, args.offsets)
+        rows = asyncio.run(service._candidate_rows(features))
+        expected = prediction._feature_matrix(bundle, rows).astype(np.float32)
+        X = bundle.schema.fill(**features)
+        if not np.array_equal(expected, X, equal_nan=True):
+            raise SystemExit('❌ Schema rows differ from the dict route')
+        if not np.array_equal(bundle.backend.predict(expected), bundle.backend.predict(X)):
+            raise SystemExit('❌ Predictions differ')
+
+    print(f"{'rows':>6} {'dicts us':>10} {'schema us':>10} {'speedup':>8}")
+    for n_offsets in (1, args.offsets):
+        features = random_features(rng, n_offsets)
+
+        async def dict_route():
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                prediction._feature_matrix(bundle, await service._candidate_rows(features))
+            return (time.perf_counter() - start) / args.repeat * 1e6
+
+        dict_us = asyncio.run(dict_route())
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            bundle.schema.fill(**features)
+        schema_us = (time.perf_counter() - start) / args.repeat * 1e6
+        print(f"{len(features['area_ids']):>6} {dict_us:>10.0f} {schema_us:>10.0f} {dict_us / schema_us:>7.1f}x")
+    print("✅ Same matrices and predictions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: origin x destination travel matrices, scalar loop vs geodesic.py
+
+The scalar loop is get_travel_time's former per-pair calculation (math
+haversine, 30 km/h, hour-based traffic factor). Both ways must agree to
+within floating-point rounding; the script fails if they do not.
+
+Usage:
+    python benchmarks/bench_geodesic.py [--origins 50] [--destinations 10000] [--hour 9]
+"""
+import argparse
+import os
+import sys
+import time
+from math import asin, cos, radians, sin, sqrt
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from geodesic import travel_time_matrix  # noqa: E402
+
+
+def scalar_travel(origin, destination, hour):
+    lat1, lon1 = radians(origin[0]), radians(origin[1])
+    lat2, lon2 = radians(destination[0]), radians(destination[1])
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    distance_km = 6371 * 2 * asin(sqrt(a))
+    duration_minutes = (distance_km / 30) * 60
+    if 8 <= hour <= 10 or 17 <= hour <= 19:
+        traffic_factor = 1.5
+    elif 11 <= hour <= 16:
+        traffic_factor = 1.2
+    else:
+        traffic_factor = 1.0
+    return distance_km, duration_minutes * traffic_factor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--origins', type=int, default=50)
+    parser.add_argument('--destinations', type=int, default=10000)
+    parser.add_argument('--hour', type=int, default=9)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    origins = np.column_stack([rng.uniform(18.3, 18.7, args.origins), rng.uniform(73.65, 74.1, args.origins)])
+    destinations = np.column_stack([rng.uniform(18.3, 18.7, args.destinations),
+                                    rng.uniform(73.65, 74.1, args.destinations)])
+
+    start = time.perf_counter()
+    scalar = [[scalar_travel(o, d, args.hour) for d in destinations.tolist()] for o in origins.tolist()]
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrix = travel_time_matrix(origins, destinations, args.hour)
+    matrix_s = time.perf_counter() - start
+
+    scalar = np.array(scalar)
+    if not (np.allclose(scalar[..., 0], matrix.distance_km, rtol=1e-12, atol=1e-9)
+            and np.allclose(scalar[..., 1], matrix.duration_in_traffic_minutes, rtol=1e-12, atol=1e-9)):
+        raise SystemExit('❌ Matrix and scalar loop disagree')
+
+    pairs = args.origins * args.destinations
+    print(f"📐 {args.origins} x {args.destinations} = {pairs} pairs")
+    print(f"   scalar loop: {scalar_s * 1e3:8.1f} ms ({scalar_s / pairs * 1e9:6.0f} ns/pair)")
+    print(f"   matrix:      {matrix_s * 1e3:8.1f} ms ({matrix_s / pairs * 1e9:6.0f} ns/pair)")
+    print(f"   speedup:     {scalar_s / matrix_s:8.0f}x")
+    print("✅ Same distances and durations")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark: POST /predict-availability latency against a local fake backend
+
+Starts a stand-in for the Node backend (GET /api/parking-spot/nearby) and
+prediction.py under uvicorn, then sends requests one at a time and with
+several clients in parallel, and reports latency percentiles. Every request
+makes prediction.py fetch live slot data from the backend, so the numbers
+show what the backend HTTP path costs per prediction.
+
+To compare with another revision, point --app-dir at a checkout of it.
+
+Usage:
+    python benchmarks/bench_predict_availability.py [--requests 500] [--concurrency 16]
+                                                    [--backend-delay-ms 2] [--app-dir DIR]
+                                                    [--backend-port PORT]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+NEARBY_SPOTS = [
+    {'name': 'PICT Campus Parking', 'availableSpots': 42, 'totalSpots': 120, 'lastUpdated': '2025-11-11T10:00:00Z'},
+    {'name': 'Amanora Mall Parking', 'availableSpots': 310, 'totalSpots': 800, 'lastUpdated': '2025-11-11T10:00:00Z'},
+    {'name': 'Seasons Mall Parking', 'availableSpots': 95, 'totalSpots': 400, 'lastUpdated': '2025-11-11T10:00:00Z'},
+]
+
+REQUEST = {
+    'user_location': {'lat': 18.5204, 'lng': 73.8567},
+    'parking_area': 'amanora_mall',
+    'vehicle_type': 'car',
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def start_fake_backend(port: int, delay_ms: float):
+    # Distinct client ports = TCP connections opened by prediction.py
+    counters = {'requests': 0, 'peers': set()}
+
+    async def nearby(request):
+        counters['requests'] += 1
+        counters['peers'].add(request.transport.get_extra_info('peername'))
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        return web.json_response({'success': True, 'data': NEARBY_SPOTS})
+
+    app = web.Application()
+    app.router.add_get('/api/parking-spot/nearby', nearby)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', port)
+    await site.start()
+    return runner, counters
+
+
+async def wait_until_ready(session, url: str, timeout: float = 60.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            async with session.get(url + '/ready') as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError('prediction.py did not become ready')
+
+
+async def run_load(session, url: str, total: int, concurrency: int):
+    latencies = []
+    remaining = iter(range(total))
+
+    async def client():
+        for _ in remaining:
+            start = time.perf_counter()
+            async with session.post(url + '/predict-availability', json=REQUEST) as response:
+                body = await response.json()
+                if response.status != 200 or body.get('data_source') not in ('real-time', 'cached'):
+                    raise RuntimeError(f'Unexpected answer: {response.status} {body}')
+            latencies.append((time.perf_counter() - start) * 1e3)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'req_s': total / elapsed,
+        'p50': statistics.median(latencies),
+        'p95': latencies[int(0.95 * (len(latencies) - 1))],
+        'p99': latencies[int(0.99 * (len(latencies) - 1))],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--backend-delay-ms', type=float, default=2.0, help='Simulated backend processing time')
+    parser.add_argument('--app-dir', default=APP_DIR, help='Directory containing prediction.py')
+    parser.add_argument('--backend-port', type=int, default=0,
+                        help='Port for the fake backend (3000 for revisions without BACKEND_API_BASE)')
+    args = parser.parse_args()
+
+    backend_port, app_port = args.backend_port or free_port(), free_port()
+    runner, counters = await start_fake_backend(backend_port, args.backend_delay_ms)
+    env = dict(os.environ, BACKEND_API_BASE=f'http://127.0.0.1:{backend_port}/api', PREDICTION_WARMUP='eager')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'prediction:app', '--port', str(app_port), '--log-level', 'warning'],
+        cwd=os.path.abspath(args.app_dir), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f'http://127.0.0.1:{app_port}'
+    try:
+        async with aiohttp.ClientSession() as session:
+            await wait_until_ready(session, url)
+            await run_load(session, url, 20, 1)  # warm-up
+            print(f"\n{'clients':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'backend conns':>14}")
+            for concurrency in (1, args.concurrency):
+                before = len(counters['peers'])
+                r = await run_load(session, url, args.requests, concurrency)
+                print(f"{concurrency:>8} {r['req_s']:>8.0f} {r['p50']:>8.2f} {r['p95']:>8.2f} {r['p99']:>8.2f} "
+                      f"{len(counters['peers']) - before:>14}")
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+        await runner.cleanup()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+"""
+Benchmark: candidate selection over many parking areas, full scan vs AreaIndex
+
+Generates synthetic parking lots spread over a city-sized box around Pune
+and answers the same radius and nearest-k queries two ways:
+
+- scan: one scalar haversine per lot, as recommend_best_parking did
+  before the index
+- index: spatial_index.AreaIndex
+
+Both must return the same areas; the script fails if they do not.
+
+Usage:
+    python benchmarks/bench_spatial_index.py [--lots 10000] [--queries 1000] [--seed 0]
+"""
+import argparse
+import os
+import sys
+import time
+from math import asin, cos, radians, sin, sqrt
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from spatial_index import AreaIndex  # noqa: E402
+
+# Roughly 45 x 45 km around Pune
+LAT_RANGE = (18.30, 18.70)
+LNG_RANGE = (73.65, 74.10)
+
+
+def synthetic_lots(n: int, rng: np.random.Generator) -> dict:
+    lats = rng.uniform(*LAT_RANGE, n)
+    lngs = rng.uniform(*LNG_RANGE, n)
+    return {f'lot_{i}': {'lat': float(lat), 'lng': float(lng)} for i, (lat, lng) in enumerate(zip(lats, lngs))}
+
+
+def scan_distance(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = radians(lat1), radians(lng1), radians(lat2), radians(lng2)
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lng2 - lng1) / 2) ** 2
+    return 2 * asin(sqrt(a)) * 6371000
+
+
+def scan_within(lots, lat, lng, radius_m):
+    return [area_id for area_id, lot in lots.items() if scan_distance(lat, lng, lot['lat'], lot['lng']) <= radius_m]
+
+
+def scan_nearest(lots, lat, lng, k):
+    distances = [(scan_distance(lat, lng, lot['lat'], lot['lng']), area_id) for area_id, lot in lots.items()]
+    return [area_id for _, area_id in sorted(distances)[:k]]
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    results = [fn(lat, lng) for lat, lng in queries]
+    return results, (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lots', type=int, default=10000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    lots = synthetic_lots(args.lots, rng)
+    queries = list(zip(rng.uniform(*LAT_RANGE, args.queries).tolist(), rng.uniform(*LNG_RANGE, args.queries).tolist()))
+
+    start = time.perf_counter()
+    index = AreaIndex(lots)
+    print(f"🏗️  Built index over {len(index)} lots in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    cases = [(f'radius {radius} m',
+              lambda lat, lng, r=radius: scan_within(lots, lat, lng, r),
+              lambda lat, lng, r=radius: [area_id for area_id, _ in index.within(lat, lng, r)])
+             for radius in (500, 2000)]
+    cases += [(f'nearest k={k}',
+               lambda lat, lng, k=k: scan_nearest(lots, lat, lng, k),
+               lambda lat, lng, k=k: [area_id for area_id, _ in index.nearest(lat, lng, k)])
+              for k in (3, 10)]
+
+    print(f"\n{'query':<16} {'scan us':>10} {'index us':>10} {'speedup':>8} {'avg hits':>9}")
+    for name, scan, indexed in cases:
+        scan_results, scan_us = timed(scan, queries)
+        index_results, index_us = timed(indexed, queries)
+        if scan_results != index_results:
+            raise SystemExit(f'❌ {name}: index and scan disagree')
+        hits = sum(len(r) for r in index_results) / len(index_results)
+        print(f"{name:<16} {scan_us:>10.0f} {index_us:>10.1f} {scan_us / index_us:>7.0f}x {hits:>9.1f}")
+    print("\n✅ Index and scan returned the same areas for every query")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+"""
+Benchmark: synthetic training data, the former per-row loop vs the vectorized generator
+
+loop:       train_model.generate_realistic_parking_data as it was (random
+            calls, one dict and one strftime per row), kept below as the
+            reference
+vectorized: the current generator, whole columns per draw
+
+Both draw from the same distributions but not the same random streams, so
+they are compared on summary statistics: per numeric column the mean
+(within 4 standard errors), standard deviation and 5/25/50/75/95th
+percentiles; per categorical column the share of each label; and the mean
+target per weekend, holiday, weather and event combination, which covers
+the masked multipliers. The script fails if any of them disagree.
+
+Usage:
+    python benchmarks/bench_training_data.py [--samples 15000] [--check-samples 200000]
+                                             [--large 10000000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import train_model  # noqa: E402
+
+
+def loop_parking_data(num_samples, seed):
+    """train_model.generate_realistic_parking_data before vectorization, with its own Random"""
+    rng = random.Random(seed)
+
+    data = []
+    start_date = datetime(2023, 1, 1)
+
+    for i in range(num_samples):
+        # Random date and time over past 2 years
+        random_date = start_date + timedelta(days=rng.randint(0, 730))
+        hour = rng.randint(6, 22)  # College hours 6 AM to 10 PM
+        minute = rng.randint(0, 59)
+
+        # Time features
+        time_of_day = hour + minute / 60
+        day_of_week = random_date.strftime("%A")
+        is_weekend = 1 if random_date.weekday() >= 5 else 0
+        is_holiday = 1 if rng.random() < 0.05 else 0  # 5% chance of holiday
+
+        # Location features
+        parking_area = rng.choice(list(train_model.PARKING_AREAS.keys()))
+        area_info = train_model.PARKING_AREAS[parking_area]
+
+        # Weather based on month
+        month = random_date.month
+        season = None
+        for season_name, season_info in train_model.PUNE_WEATHER_PATTERNS.items():
+            if month in season_info["months"]:
+                season = season_info
+                break
+
+        weather_condition = rng.choice(season["conditions"])
+        temperature_c = rng.uniform(season["temp_range"][0], season["temp_range"][1])
+
+        # Traffic patterns
+        traffic_base = 0.3
+        if 8 <= hour <= 10 or 17 <= hour <= 19:  # Peak hours
+            traffic_base = 0.8
+        elif 11 <= hour <= 16:  # Normal college hours
+            traffic_base = 0.6
+        elif hour < 7 or hour > 20:  # Off hours
+            traffic_base = 0.2
+
+        # Add randomness and weather effect
+        traffic_density = traffic_base + rng.uniform(-0.2, 0.2)
+        if weather_condition == "Rainy":
+            traffic_density += 0.3  # More traffic in rain
+        traffic_density = max(0.1, min(1.0, traffic_density))
+
+        # Distance simulation (PICT students/staff coming from different areas of Pune)
+        distance_from_user_km = rng.uniform(0.5, 25.0)  # 0.5km to 25km
+
+        # Vehicle type
+        vehicle_type = rng.choices(
+            ["car", "motorcycle", "scooter", "bicycle"],
+            weights=[0.4, 0.3, 0.25, 0.05]
+        )[0]
+
+        # Event simulation
+        event_nearby = 1 if rng.random() < 0.1 else 0  # 10% chance of event
+
+        # Base occupancy patterns
+        base_occupancy = area_info["base_occupancy"]
+
+        # Time-based occupancy adjustments
+        if 8 <= hour <= 10:  # Morning rush (students arriving)
+            occupancy_multiplier = 1.4
+        elif 10 <= hour <= 16:  # Peak college hours
+            occupancy_multiplier = 1.2
+        elif 17 <= hour <= 19:  # Evening rush (students leaving)
+            occupancy_multiplier = 0.8  # People leaving, so less occupancy
+        elif hour < 8 or hour > 19:  # Off hours
+            occupancy_multiplier = 0.3
+        else:
+            occupancy_multiplier = 1.0
+
+        # Weekend adjustments
+        if is_weekend:
+            occupancy_multiplier *= 0.4  # Much less crowded on weekends
+
+        # Holiday adjustments
+        if is_holiday:
+            occupancy_multiplier *= 0.2  # Very less crowded on holidays
+
+        # Weather effects
+        if weather_condition == "Rainy":
+            occupancy_multiplier *= 1.2  # More people drive instead of walking
+
+        # Event effects
+        if event_nearby:
+            occupancy_multiplier *= 1.5  # Events increase parking demand
+
+        # Distance effect on area popularity
+        if distance_from_user_km < 2:  # Nearby users prefer convenient spots
+            occupancy_multiplier *= area_info["popularity"]
+
+        # Calculate final occupancy
+        final_occupancy = min(0.98, max(0.05, base_occupancy * occupancy_multiplier + rng.uniform(-0.1, 0.1)))
+
+        # Slot calculations
+        total_slots = area_info["total_slots"]
+        occupied_slots = int(final_occupancy * total_slots)
+        free_slots = total_slots - occupied_slots
+
+        # Future predictions (slots that will be free in 15 min)
+        turnover_rate = 0.1 + rng.uniform(-0.05, 0.05)  # 10% turnover every 15 min
+        slots_free_in_15min = min(total_slots, free_slots + int(occupied_slots * turnover_rate))
+        future_bookings_15min = max(0, int(free_slots * 0.3 * rng.uniform(0.5, 1.5)))
+
+        # Pricing (simple dynamic pricing)
+        base_price = 50.0  # Base price in rupees
+        dynamic_multiplier = 1.0
+
+        if final_occupancy > 0.8:  # High occupancy
+            dynamic_multiplier = 1.5
+        elif final_occupancy > 0.6:
+            dynamic_multiplier = 1.2
+        elif final_occupancy < 0.3:  # Low occupancy
+            dynamic_multiplier = 0.8
+
+        if weather_condition == "Rainy":
+            dynamic_multiplier *= 1.2
+
+        if event_nearby:
+            dynamic_multiplier *= 1.3
+
+        final_price = base_price * dynamic_multiplier
+
+        # Target variable: availability when user reaches (0-1 scale)
+        # This is what we want to predict
+        # Predict availability after travel time
+        future_occupancy_change = rng.uniform(-0.15, 0.15)  # Natural fluctuation
+        if 8 <= hour <= 10:  # Morning rush - occupancy increases
+            future_occupancy_change += 0.1
+        elif 17 <= hour <= 19:  # Evening - occupancy decreases
+            future_occupancy_change -= 0.1
+
+        predicted_occupancy = max(0.02, min(0.98, final_occupancy + future_occupancy_change))
+        availability_score = 1 - predicted_occupancy  # Convert occupancy to availability
+
+        # Create data point
+        data_point = {
+            "city": "Pune",
+            "area": area_info["area"],  # Use the actual area (Kharadi, Hadapsar, etc.)
+            "parking_lot_name": parking_area,
+            "day_of_week": day_of_week,
+            "time_of_day": round(time_of_day, 2),
+            "is_weekend": is_weekend,
+            "is_holiday": is_holiday,
+            "weather_condition": weather_condition,
+            "temperature_c": round(temperature_c, 1),
+            "traffic_density": round(traffic_density, 3),
+            "distance_from_user_km": round(distance_from_user_km, 2),
+            "vehicle_type": vehicle_type,
+            "base_price": base_price,
+            "dynamic_multiplier": round(dynamic_multiplier, 2),
+            "final_price": round(final_price, 2),
+            "event_nearby": event_nearby,
+            "total_slots": total_slots,
+            "occupied_slots": occupied_slots,
+            "free_slots": free_slots,
+            "slots_free_in_15min": slots_free_in_15min,
+            "future_bookings_15min": future_bookings_15min,
+            "availability_score": round(availability_score, 4)  # Target variable
+        }
+
+        data.append(data_point)
+
+    return pd.DataFrame(data)
+
+
+def quiet(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+def proportion_mismatches(name, a: pd.Series, b: pd.Series, z: float = 4.0):
+    pa, pb = a.value_counts(normalize=True), b.value_counts(normalize=True)
+    errors = []
+    for label in pa.index.union(pb.index):
+        p, q = pa.get(label, 0.0), pb.get(label, 0.0)
+        pooled = (p * len(a) + q * len(b)) / (len(a) + len(b))
+        tolerance = z * np.sqrt(pooled * (1 - pooled) * (1 / len(a) + 1 / len(b))) + 1e-3
+        if abs(p - q) > tolerance:
+            errors.append(f"{name}={label}: share {p:.4f} vs {q:.4f}")
+    return errors
+
+
+def summary_mismatches(loop: pd.DataFrame, vectorized: pd.DataFrame, z: float = 4.0):
+    """Statistics on which the two datasets disagree, as messages"""
+    errors = []
+    if list(loop.columns) != list(vectorized.columns):
+        return [f"columns differ: {list(loop.columns)} vs {list(vectorized.columns)}"]
+    for column in loop.columns:
+        a, b = loop[column], vectorized[column]
+        if not pd.api.types.is_numeric_dtype(a):
+            errors += proportion_mismatches(column, a.astype(str), b.astype(str), z)
+            continue
+        if a.dtype.kind != b.dtype.kind:
+            errors.append(f"{column}: dtype {a.dtype} vs {b.dtype}")
+        a, b = a.to_numpy(dtype=np.float64), b.to_numpy(dtype=np.float64)
+        spread = max(a.std(), b.std(), 1e-12)
+        standard_error = np.sqrt(a.var() / len(a) + b.var() / len(b))
+        if abs(a.mean() - b.mean()) > z * standard_error + 1e-9:
+            errors.append(f"{column}: mean {a.mean():.4f} vs {b.mean():.4f}")
+        if abs(a.std() - b.std()) > 0.02 * spread + 1e-9:
+            errors.append(f"{column}: std {a.std():.4f} vs {b.std():.4f}")
+        for q in (5, 25, 50, 75, 95):
+            qa, qb = np.percentile(a, q), np.percentile(b, q)
+            if abs(qa - qb) > 0.05 * spread + 1e-9:
+                errors.append(f"{column}: p{q} {qa:.4f} vs {qb:.4f}")
+        if a.min() < b.min() - 0.05 * spread or a.max() > b.max() + 0.05 * spread:
+            errors.append(f"{column}: range [{a.min()}, {a.max()}] vs [{b.min()}, {b.max()}]")
+
+    keys = ['is_weekend', 'is_holiday', 'weather_condition', 'event_nearby']
+    groups_a = loop.groupby([loop[k].astype(str) for k in keys])['availability_score'].agg(['mean', 'var', 'count'])
+    groups_b = vectorized.groupby([vectorized[k].astype(str) for k in keys],
+                                  observed=True)['availability_score'].agg(['mean', 'var', 'count'])
+    for group, row in groups_a.join(groups_b, lsuffix='_a', rsuffix='_b', how='outer').iterrows():
+        if not (row['count_a'] >= 30 and row['count_b'] >= 30):
+            continue  # too rare to compare
+        standard_error = np.sqrt(row['var_a'] / row['count_a'] + row['var_b'] / row['count_b'])
+        if abs(row['mean_a'] - row['mean_b']) > z * standard_error:
+            errors.append(f"availability_score | {dict(zip(keys, group))}: "
+                          f"mean {row['mean_a']:.4f} vs {row['mean_b']:.4f}")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=15000, help='Rows for the timing comparison')
+    parser.add_argument('--check-samples', type=int, default=200000, help='Rows for the statistics comparison')
+    parser.add_argument('--large', type=int, default=10_000_000, help='Rows for the vectorized-only run (0: skip)')
+    args = parser.parse_args()
+
+    loop = loop_parking_data(args.check_samples, seed=1)
+    vectorized = quiet(train_model.generate_realistic_parking_data, args.check_samples, seed=1)
+    errors = summary_mismatches(loop, vectorized)
+    if errors:
+        print("\n".join(errors))
+        raise SystemExit(f'❌ {len(errors)} summary statistics differ')
+
+    start = time.perf_counter()
+    loop_parking_data(args.samples, seed=2)
+    loop_s = time.perf_counter() - start
+    start = time.perf_counter()
+    quiet(train_model.generate_realistic_parking_data, args.samples, seed=2)
+    vectorized_s = time.perf_counter() - start
+
+    print(f"🧮 {args.samples} rows")
+    print(f"   loop:       {loop_s * 1e3:9.1f} ms ({args.samples / loop_s:12,.0f} rows/s)")
+    print(f"   vectorized: {vectorized_s * 1e3:9.1f} ms ({args.samples / vectorized_s:12,.0f} rows/s)")
+    print(f"   speedup:    {loop_s / vectorized_s:9.0f}x")
+    if args.large:
+        start = time.perf_counter()
+        df = quiet(train_model.generate_realistic_parking_data, args.large, seed=3)
+        large_s = time.perf_counter() - start
+        print(f"🧮 {args.large} rows vectorized: {large_s:.1f} s ({args.large / large_s:,.0f} rows/s), "
+              f"{df.memory_usage(deep=True).sum() / 2**20:,.0f} MiB")
+    print(f"✅ Same summary statistics over {args.check_samples} rows")
+
+
+if __name__ == '__main__':
+    main()
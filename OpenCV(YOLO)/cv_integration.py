@@ -10,12 +10,14 @@ import aiohttp
 class CVParkingIntegration:
     """Integration service to connect Computer Vision system with Parking Prediction"""
     
-    def __init__(self, backend_url: str = "http://localhost:3000", cv_endpoint: str = "http://localhost:8080"):
+    def __init__(self, backend_url: str = "http://localhost:3000", cv_endpoint: str = "http://localhost:8000"):
         self.backend_url = backend_url
         self.cv_endpoint = cv_endpoint
         self.is_running = False
         
-        # PICT parking areas with camera configurations
+        # PICT parking areas with camera configurations. These are camera
+        # zones of the PICT campus; prediction.py sums them into its
+        # pict_campus area (CV_ZONE_AREAS)
         self.parking_areas = {
             "main_gate": {
                 "camera_id": "cam_001",
@@ -191,6 +193,7 @@ class CVParkingIntegration:
                 "area_id": area_id,
                 "current_occupancy": occupancy_data["occupancy_rate"],
                 "free_slots": occupancy_data["free_slots"],
+                "total_slots": occupancy_data["total_slots"],
                 "timestamp": occupancy_data["timestamp"],
                 "confidence": occupancy_data.get("confidence", 0.9)
             }
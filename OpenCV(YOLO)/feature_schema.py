@@ -0,0 +1,123 @@
+"""
+Precompiled model input layout for the prediction service
+
+The per-request dict route (ParkingPredictionService._prepare_prediction_features,
+then _feature_matrix) builds 21 keys per row, encodes every categorical label
+and reorders the values by feature name. Most of those columns never change
+for a given parking area (city, lot name, prices, slot count), and the rest
+are a handful of numbers per request.
+
+FeatureSchema resolves the feature order once per loaded model: static
+columns are encoded into one float32 template row per area, categorical
+lookups that depend on the request (weekday, weather, vehicle type) are
+reduced to a code per request, and fill() writes only the dynamic columns
+into a reused buffer. The values are the ones _prepare_prediction_features
+produces, so predictions do not change.
+"""
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Columns that are the same for every request to an area (besides
+# parking_lot_name, area and total_slots, which come from the area itself)
+STATIC_FEATURES = {
+    "city": "Pune",
+    "is_holiday": 0,
+    "base_price": 50.0,
+    "dynamic_multiplier": 1.0,
+    "final_price": 50.0,
+    "event_nearby": 0,
+}
+
+
+class FeatureSchema:
+    """Feature order, encoders and per-area template rows, compiled for one model"""
+
+    def __init__(self, feature_order: List[str], encoders: Optional[Dict], areas: Dict[str, Dict]):
+        """
+        Args:
+            feature_order: Model input columns, in order
+            encoders: CompiledEncoder per categorical column (None: no encoding)
+            areas: PARKING_AREAS; each needs "area" and "total_slots"
+        """
+        self.feature_order = list(feature_order)
+        self.encoders = encoders or {}
+        self.column = {name: i for i, name in enumerate(self.feature_order)}
+        self.area_ids = list(areas)
+        self.area_row = {area_id: i for i, area_id in enumerate(self.area_ids)}
+        self.total_slots = np.array([areas[area_id]["total_slots"] for area_id in self.area_ids], dtype=np.float64)
+
+        self.templates = np.zeros((len(self.area_ids), len(self.feature_order)), dtype=np.float32)
+        for row, area_id in enumerate(self.area_ids):
+            values = dict(STATIC_FEATURES, parking_lot_name=area_id, area=areas[area_id]["area"],
+                          total_slots=areas[area_id]["total_slots"])
+            for name, value in values.items():
+                if name in self.column:
+                    self.templates[row, self.column[name]] = self._encode(name, value)
+
+        self.weekday_codes = np.array([self._encode("day_of_week", day) for day in WEEKDAYS], dtype=np.float32)
+        self._local = threading.local()
+
+    def fill(self, area_ids: Sequence[str], arrival_times: Sequence[datetime], current_occupancy: Sequence[float],
+             traffic_density: Sequence[float], distance_km: Sequence[float], weather_data: Dict,
+             vehicle_type: str) -> np.ndarray:
+        """
+        Model input rows, one per (area, arrival time, ...) entry of the sequences
+
+        Returns a view of a per-thread buffer: use it (e.g. predict) before
+        the next fill() on the same thread.
+        """
+        n = len(area_ids)
+        X = self._buffer(n)
+        np.take(self.templates, [self.area_row[area_id] for area_id in area_ids], axis=0, out=X)
+
+        weekday = np.array([arrival.weekday() for arrival in arrival_times])
+        hour = np.array([arrival.hour + arrival.minute / 60 for arrival in arrival_times])
+        total = self.total_slots[[self.area_row[area_id] for area_id in area_ids]]
+        occupancy = np.asarray(current_occupancy, dtype=np.float64)
+        occupied = np.trunc(occupancy * total)
+
+        self._set(X, "day_of_week", self.weekday_codes[weekday])
+        self._set(X, "time_of_day", hour)
+        self._set(X, "is_weekend", weekday >= 5)
+        self._set(X, "weather_condition", self._encode("weather_condition", weather_data["weather_condition"]))
+        self._set(X, "temperature_c", weather_data["temperature_c"])
+        self._set(X, "traffic_density", traffic_density)
+        self._set(X, "distance_from_user_km", distance_km)
+        self._set(X, "vehicle_type", self._encode("vehicle_type", vehicle_type))
+        self._set(X, "occupied_slots", occupied)
+        self._set(X, "free_slots", total - occupied)
+        self._set(X, "slots_free_in_15min", np.maximum(0, np.trunc(total * (1 - occupancy + 0.1))))
+        self._set(X, "future_bookings_15min", np.maximum(0, np.trunc(occupancy * 10)))
+        return X
+
+    def decode(self, X: np.ndarray) -> Iterator[Dict]:
+        """Rows of X as raw feature dicts (categoricals as labels), e.g. for a shadow model with another layout"""
+        for row in X:
+            values = {}
+            for name, i in self.column.items():
+                value = row[i].item()
+                table = self.encoders.get(name)
+                if table is not None:
+                    value = table.decode(value)
+                values[name] = value
+            yield values
+
+    def _encode(self, name: str, value):
+        table = self.encoders.get(name)
+        return table.encode_one(value) if table is not None else value
+
+    def _set(self, X: np.ndarray, name: str, values):
+        i = self.column.get(name)
+        if i is not None:
+            X[:, i] = values
+
+    def _buffer(self, n: int) -> np.ndarray:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None or len(buffer) < n:
+            buffer = self._local.buffer = np.empty((max(n, 64), len(self.feature_order)), dtype=np.float32)
+        return buffer[:n]
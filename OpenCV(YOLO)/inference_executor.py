@@ -0,0 +1,94 @@
+"""
+Dedicated thread pool for model inference
+
+Encoding features and calling the model is CPU-bound; run inside a
+coroutine it stalls every other request on the event loop. InferenceExecutor
+runs that work on its own small thread pool (XGBoost and the compiled
+backends release the GIL while predicting) and bounds how much of it may be
+waiting: once max_pending jobs are queued or running, submit() raises
+Saturated at once instead of letting latency grow without limit.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, TypeVar
+
+from parking_common.metrics import Histogram, LATENCY_BUCKETS_MS
+
+T = TypeVar("T")
+
+
+class Saturated(Exception):
+    """The inference queue is full; the caller should retry later (HTTP 429)"""
+
+
+class InferenceExecutor:
+    """Bounded thread pool with queue-wait and run-time histograms, plus named per-stage timings"""
+
+    def __init__(self, workers: int = 2, max_pending: int = 64):
+        """
+        Args:
+            workers: Threads running inference jobs
+            max_pending: Jobs allowed to be queued or running at once; more are rejected
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.queue_wait_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.run_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.stages: Dict[str, Histogram] = {}
+
+    async def submit(self, fn: Callable[..., T], *args) -> T:
+        """Run fn(*args) on the pool and await its result; raises Saturated when the queue is full"""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise Saturated(f"{self.pending} inference jobs pending")
+            self.pending += 1
+            self.submitted += 1
+        queued_at = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            self.queue_wait_ms.observe((started - queued_at) * 1e3)
+            try:
+                return fn(*args)
+            finally:
+                self.run_ms.observe((time.perf_counter() - started) * 1e3)
+
+        # Counted down when the job finishes or is cancelled before it starts,
+        # not when the caller stops waiting, so abandoned jobs still count
+        future = self._pool.submit(job)
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future)
+
+    def _done(self, _future):
+        with self._lock:
+            self.pending -= 1
+
+    def record(self, stage: str, ms: float):
+        """Time spent in one stage of a job (e.g. "features", "predict")"""
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages.setdefault(stage, Histogram(LATENCY_BUCKETS_MS))
+        histogram.observe(ms)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+            "run_ms": self.run_ms.snapshot(),
+            "stages_ms": {stage: histogram.snapshot() for stage, histogram in list(self.stages.items())},
+        }
@@ -0,0 +1,150 @@
+"""
+Stage latencies and event counters for the prediction service, in Prometheus text format
+
+Builds on the shared Histogram (parking_common/metrics.py).
+"""
+import threading
+import time
+from typing import Dict, Sequence
+
+from parking_common.metrics import Histogram, LATENCY_BUCKETS_MS
+
+
+class _StageTimer:
+    """Times one `with` block into a histogram"""
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe((time.perf_counter() - self.start) * 1e3)
+        return False
+
+
+class Metrics:
+    """
+    Stage latency histograms and event counters, rendered in Prometheus text format
+
+    Disabled, stage() returns a shared no-op context manager and count()
+    returns at once, so instrumented code costs one attribute check.
+    """
+
+    def __init__(self, prefix: str, enabled: bool = True):
+        self.prefix = prefix
+        self.enabled = enabled
+        self._stages: Dict[tuple, Histogram] = {}
+        self._counters: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, operation: str, stage: str):
+        """Context manager timing one stage of an operation (e.g. "predict_availability", "live_slots")"""
+        if not self.enabled:
+            return _NOOP
+        key = (operation, stage)
+        histogram = self._stages.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._stages.setdefault(key, Histogram(LATENCY_BUCKETS_MS))
+        return _StageTimer(histogram)
+
+    def count(self, event: str, value: str, amount: int = 1):
+        """Count one occurrence of event=value (e.g. "data_source", "real-time")"""
+        if not self.enabled:
+            return
+        key = (event, value)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            stages, counters = dict(self._stages), dict(self._counters)
+        return {
+            'enabled': self.enabled,
+            'stages_ms': {f'{operation}.{stage}': h.snapshot() for (operation, stage), h in stages.items()},
+            'counters': {f'{event}.{value}': count for (event, value), count in counters.items()},
+        }
+
+    def render(self, histograms: Sequence[tuple] = (), gauges: Sequence[tuple] = (),
+               counters: Sequence[tuple] = ()) -> str:
+        """
+        Prometheus text exposition of the stages and counters, plus extra series
+
+        Args:
+            histograms: (name, labels dict, Histogram) for histograms kept elsewhere
+            gauges: (name, labels dict, value) for current values kept elsewhere
+            counters: (name, labels dict, value) for monotonic totals kept
+                elsewhere; exported as {name}_total
+        """
+        with self._lock:
+            stages, events = dict(self._stages), dict(self._counters)
+        lines = []
+        stage_name = f'{self.prefix}_stage_latency_ms'
+        lines.append(f'# TYPE {stage_name} histogram')
+        for (operation, stage), histogram in sorted(stages.items()):
+            lines.extend(_histogram_lines(stage_name, {'operation': operation, 'stage': stage}, histogram))
+        by_event: Dict[str, list] = {}
+        for (event, value), count in sorted(events.items()):
+            by_event.setdefault(event, []).append((value, count))
+        for event, values in by_event.items():
+            name = f'{self.prefix}_{event}_total'
+            lines.append(f'# TYPE {name} counter')
+            lines.extend(f'{name}{_labels({event: value})} {count}' for value, count in values)
+
+        typed = set()
+        for name, labels, histogram in histograms:
+            name = f'{self.prefix}_{name}'
+            if name not in typed:
+                typed.add(name)
+                lines.append(f'# TYPE {name} histogram')
+            lines.extend(_histogram_lines(name, labels, histogram))
+        for name, labels, value in counters:
+            name = f'{self.prefix}_{name}_total'
+            if name not in typed:
+                typed.add(name)
+                lines.append(f'# TYPE {name} counter')
+            lines.append(f'{name}{_labels(labels)} {int(value)}')
+        for name, labels, value in gauges:
+            name = f'{self.prefix}_{name}'
+            if name not in typed:
+                typed.add(name)
+                lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name}{_labels(labels)} {float(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+def _labels(labels: Dict) -> str:
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in labels.values())
+    return '{' + ','.join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + '}'
+
+
+def _histogram_lines(name: str, labels: Dict, histogram: Histogram) -> list:
+    with histogram._lock:
+        counts, total, value_sum = list(histogram.counts), histogram.count, histogram.sum
+    lines = []
+    cumulative = 0
+    for upper, count in zip(histogram.buckets + ('+Inf',), counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{_labels(dict(labels, le=upper))} {cumulative}')
+    lines.append(f'{name}_sum{_labels(labels)} {value_sum}')
+    lines.append(f'{name}_count{_labels(labels)} {total}')
+    return lines
@@ -0,0 +1,145 @@
+"""
+Occupancy updates pushed by the CV system, kept per parking area
+
+cv_integration.py posts an update for each area every couple of minutes
+(/update-realtime-data, /update-cv-data). OccupancyBuffer keeps the most
+recent ones per area in a fixed-size ring, so predictions can read the
+latest count from memory instead of asking the backend, and the recent
+history stays available for inspection.
+
+Ages are measured from when an update was received, not from the
+timestamp the sender put in it, so clock skew between the camera host and
+this process does not matter.
+"""
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+
+class OccupancySample(NamedTuple):
+    free_slots: int
+    total_slots: int
+    confidence: float
+    source: str
+    timestamp: Optional[str]  # as sent by the CV system
+    received_at: float  # time.monotonic()
+
+
+class TooManyAreas(Exception):
+    """An update named a new area after max_areas areas were already tracked"""
+
+
+class OccupancyBuffer:
+    """Ring buffer of pushed occupancy samples per area id"""
+
+    def __init__(self, history: int = 120, max_areas: int = 1000):
+        """
+        Args:
+            history: Samples kept per area; older ones are dropped
+            max_areas: Distinct area ids accepted (updates are not authenticated,
+                so this bounds the memory they can take)
+        """
+        self.history = history
+        self.max_areas = max_areas
+        self._samples: Dict[str, Deque[OccupancySample]] = {}
+        self._lock = threading.Lock()
+        self.updates = 0
+        self.rejected = 0
+
+    def push(self, area_id: str, free_slots: int, total_slots: int, confidence: float = 1.0,
+             source: str = 'cv_push', timestamp: Optional[str] = None) -> OccupancySample:
+        return self.push_many([dict(area_id=area_id, free_slots=free_slots, total_slots=total_slots,
+                                    confidence=confidence, source=source, timestamp=timestamp)])[0]
+
+    def push_many(self, updates: List[Dict]) -> List[OccupancySample]:
+        """
+        Store several updates (push() keyword arguments each), all or none
+
+        Raises:
+            TooManyAreas: If the new area ids among them do not fit in max_areas;
+                nothing is stored then
+        """
+        received_at = time.monotonic()
+        pushed = []
+        for update in updates:
+            total_slots = max(1, int(update['total_slots']))
+            free_slots = max(0, min(int(update['free_slots']), total_slots))
+            pushed.append((update['area_id'], OccupancySample(
+                free_slots, total_slots, float(update.get('confidence', 1.0)), update.get('source', 'cv_push'),
+                update.get('timestamp'), received_at
+            )))
+        with self._lock:
+            new_areas = {area_id for area_id, _ in pushed if area_id not in self._samples}
+            if len(self._samples) + len(new_areas) > self.max_areas:
+                self.rejected += len(pushed)
+                raise TooManyAreas(f"Already tracking {len(self._samples)} of {self.max_areas} areas")
+            for area_id, sample in pushed:
+                samples = self._samples.get(area_id)
+                if samples is None:
+                    samples = self._samples[area_id] = deque(maxlen=self.history)
+                samples.append(sample)
+            self.updates += len(pushed)
+        return [sample for _, sample in pushed]
+
+    def latest(self, area_id: str) -> Optional[OccupancySample]:
+        samples = self._samples.get(area_id)
+        try:
+            return samples[-1] if samples else None
+        except IndexError:
+            return None
+
+    def latest_record(self, area_id: str, max_age: float) -> Optional[Dict]:
+        """
+        Latest sample for area_id as a live slot record, None if there is none
+        younger than max_age seconds
+
+        The record has the same keys as the ones built from the backend's
+        nearby spots, plus age_seconds and confidence.
+        """
+        sample = self.latest(area_id)
+        if sample is None:
+            return None
+        age = time.monotonic() - sample.received_at
+        if age > max_age:
+            return None
+        return {
+            'available_spots': sample.free_slots,
+            'total_spots': sample.total_slots,
+            'occupancy_rate': (sample.total_slots - sample.free_slots) / sample.total_slots,
+            'realtime_slots': [],
+            'last_updated': sample.timestamp,
+            'source': sample.source,
+            'confidence': sample.confidence,
+            'age_seconds': round(age, 1),
+        }
+
+    def series(self, area_id: str) -> List[Dict]:
+        """Buffered samples for area_id, oldest first"""
+        with self._lock:
+            samples = list(self._samples.get(area_id, ()))
+        now = time.monotonic()
+        return [
+            {
+                'free_slots': s.free_slots,
+                'total_slots': s.total_slots,
+                'occupancy_rate': round((s.total_slots - s.free_slots) / s.total_slots, 4),
+                'confidence': s.confidence,
+                'source': s.source,
+                'timestamp': s.timestamp,
+                'age_seconds': round(now - s.received_at, 1),
+            }
+            for s in samples
+        ]
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        with self._lock:
+            latest_age = {area: round(now - samples[-1].received_at, 1) for area, samples in self._samples.items()}
+        return {
+            'history': self.history,
+            'areas': len(latest_age),
+            'updates': self.updates,
+            'rejected': self.rejected,
+            'latest_age_seconds': latest_age,
+        }
@@ -1,33 +1,133 @@
 # prediction.py - Enhanced PICT Parking Prediction System
+import hmac
 import json
 import pickle
-import pandas as pd
 import numpy as np
-import xgboost as xgb
-import googlemaps
-import aiohttp
 import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-from fastapi import FastAPI, HTTPException
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 import os
+from parking_common.encoding import compile_encoders, encoder_table_current, load_encoder_table
+from parking_common.inference_backends import load_backend
+from parking_common.shadow import ShadowScorer
+from backend_client import BackendClient
+from metrics import Metrics
+from snapshot_cache import SnapshotCache
+from occupancy_buffer import OccupancyBuffer, TooManyAreas
+from spatial_index import AreaIndex
+from geodesic import geohash, haversine_km, travel_time_matrix
+from inference_executor import InferenceExecutor, Saturated
+from feature_schema import FeatureSchema
+from single_flight import SingleFlight
 
 # Load environment variables
 load_dotenv()
 
 # Constants
-BACKEND_API_BASE = "http://localhost:3000/api"
+BACKEND_API_BASE = os.getenv("BACKEND_API_BASE", "http://localhost:3000/api")
 
-app = FastAPI(title="PICT Parking Prediction System", version="1.0.0")
+# Stage timers and outcome counters, served at /metrics (PREDICTION_METRICS=0
+# turns them into no-ops)
+metrics = Metrics("prediction", enabled=os.getenv("PREDICTION_METRICS", "1") != "0")
 
-# Google Maps client
-try:
-    gmaps = googlemaps.Client(key=os.getenv('GOOGLE_MAPS_API_KEY'))
-except:
-    gmaps = None
-    print("Warning: Google Maps API key not found")
+# One keep-alive connection pool to the backend for the whole app, opened and
+# closed by the lifespan below
+backend_client = BackendClient(
+    BACKEND_API_BASE,
+    total_timeout=float(os.getenv("BACKEND_TIMEOUT_SECONDS", 10)),
+    connect_timeout=float(os.getenv("BACKEND_CONNECT_TIMEOUT_SECONDS", 2)),
+    retries=int(os.getenv("BACKEND_RETRIES", 2)),
+    backoff=float(os.getenv("BACKEND_RETRY_BACKOFF_SECONDS", 0.1)),
+    pool_size=int(os.getenv("BACKEND_POOL_SIZE", 100)),
+    pool_per_host=int(os.getenv("BACKEND_POOL_PER_HOST", 20)),
+)
+
+# Live slot data per area, re-fetched from the backend only once it is
+# older than the TTL; for up to MAX_STALE seconds more the old snapshot is
+# served while a background fetch refreshes it (TTL 0: fetch every time,
+# whatever MAX_STALE is)
+live_slot_cache = SnapshotCache(
+    ttl=float(os.getenv("PREDICTION_LIVE_SLOTS_TTL_SECONDS", 15)),
+    max_stale=float(os.getenv("PREDICTION_LIVE_SLOTS_MAX_STALE_SECONDS", 60)),
+)
+
+# Occupancy updates pushed by the CV system (/update-realtime-data,
+# /update-cv-data); predictions use an area's latest update while it is
+# younger than PUSH_MAX_AGE_SECONDS and only ask the backend otherwise.
+# Updates name a PARKING_AREAS id or a camera zone of CV_ZONE_AREAS
+occupancy_buffer = OccupancyBuffer(
+    history=int(os.getenv("PREDICTION_PUSH_HISTORY", 120)),
+    max_areas=int(os.getenv("PREDICTION_PUSH_MAX_AREAS", 1000)),
+)
+PUSH_MAX_AGE_SECONDS = float(os.getenv("PREDICTION_PUSH_MAX_AGE_SECONDS", 300))
+
+# Feature encoding and model calls run on their own thread pool, off the
+# event loop; with MAX_PENDING jobs queued or running, requests that need
+# the model get 429 until the queue drains
+inference_executor = InferenceExecutor(
+    workers=int(os.getenv("PREDICTION_INFERENCE_WORKERS", 2)),
+    max_pending=int(os.getenv("PREDICTION_INFERENCE_MAX_PENDING", 64)),
+)
+
+# Concurrent /predict-availability requests for the same area and vehicle
+# type, arriving in the same COALESCE_ARRIVAL_MINUTES window from the same
+# geohash cell (COALESCE_GEOHASH_PRECISION characters), share one
+# computation and its result (PREDICTION_COALESCE=0: never)
+COALESCE_ENABLED = os.getenv("PREDICTION_COALESCE", "1") != "0"
+COALESCE_ARRIVAL_MINUTES = int(os.getenv("PREDICTION_COALESCE_ARRIVAL_MINUTES", 5))
+COALESCE_GEOHASH_PRECISION = int(os.getenv("PREDICTION_COALESCE_GEOHASH_PRECISION", 6))
+prediction_flights = SingleFlight()
+
+# Most arrival_offsets_minutes one /recommend-parking request may ask for
+RECOMMEND_MAX_OFFSETS = int(os.getenv("PREDICTION_RECOMMEND_MAX_OFFSETS", 24))
+# Most arrival times one /forecast-availability request may ask for (24 h at 5 min)
+FORECAST_MAX_POINTS = int(os.getenv("PREDICTION_FORECAST_MAX_POINTS", 288))
+
+# 'background': start serving right away and load the model in a thread
+# (/ready reports when it is done); 'eager': load it while importing
+WARMUP_MODE = os.getenv("PREDICTION_WARMUP", "background")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if WARMUP_MODE != "eager":
+        threading.Thread(target=load_model_components, name="model-warmup", daemon=True).start()
+    watcher = asyncio.create_task(watch_model_files()) if RELOAD_POLL_SECONDS > 0 else None
+    await backend_client.start()
+    yield
+    if watcher:
+        watcher.cancel()
+    await backend_client.close()
+    inference_executor.shutdown()
+
+app = FastAPI(title="PICT Parking Prediction System", version="1.0.0", lifespan=lifespan)
+
+@app.exception_handler(Saturated)
+async def inference_saturated(request, exc: Saturated):
+    return JSONResponse({"detail": f"Inference queue full, retry shortly ({exc})"}, status_code=429,
+                        headers={"Retry-After": "1"})
+
+# Google Maps client, created on first use (importing googlemaps is not free)
+_gmaps = None
+_gmaps_checked = False
+
+def get_gmaps_client():
+    global _gmaps, _gmaps_checked
+    if not _gmaps_checked:
+        _gmaps_checked = True
+        try:
+            import googlemaps
+            _gmaps = googlemaps.Client(key=os.getenv('GOOGLE_MAPS_API_KEY'))
+        except:
+            _gmaps = None
+            print("Warning: Google Maps API key not found")
+    return _gmaps
 
 # PICT College coordinates and parking areas
 PICT_LOCATION = {
@@ -80,6 +180,23 @@ PARKING_AREAS = {
     }
 }
 
+# Radius and nearest-k lookups over PARKING_AREAS without a full scan
+AREA_INDEX = AreaIndex(PARKING_AREAS)
+
+# Camera zones that cv_integration.py reports, by the PARKING_AREAS id they
+# are part of. A zone's update is stored under the zone id, and its area gets
+# an update summing the free and total slots of the area's zones (see
+# _store_pushed). Override with PREDICTION_CV_ZONE_AREAS='{"zone": "area", ...}'
+CV_ZONE_AREAS = json.loads(os.getenv("PREDICTION_CV_ZONE_AREAS", "null")) or {
+    "main_gate": "pict_campus",
+    "sports_complex": "pict_campus",
+    "auditorium": "pict_campus",
+    "hostel_area": "pict_campus",
+    "library": "pict_campus",
+}
+if set(CV_ZONE_AREAS.values()) - set(PARKING_AREAS) or set(CV_ZONE_AREAS) & set(PARKING_AREAS):
+    raise ValueError("CV_ZONE_AREAS must map zone ids that are not areas to PARKING_AREAS ids")
+
 # -------------------------------
 # Paths to saved model and features
 # -------------------------------
@@ -87,42 +204,238 @@ MODEL_PATH = "xgb_parking_dynamic.json"      # trained regressor
 FEATURE_PATH = "dynamic_features.json"
 ENCODER_PATH = "categorical_encoders.pkl"
 
-# -------------------------------
-# Load trained model safely
-# -------------------------------
-try:
-    xgb_model = xgb.XGBRegressor()               # REGRESSOR, not Classifier
-    if os.path.exists(MODEL_PATH):
-        xgb_model.load_model(MODEL_PATH)
+# Startup-optimized artifacts (binary booster, flat encoder table) written by
+# train_model.py; preferred when present and not older than the files above
+FAST_MODEL_PATH = "xgb_parking_dynamic.ubj"
+ENCODER_TABLE_PATH = "categorical_encoders.json"
+
+# Inference backend: xgboost (default), treelite or onnx (see parking_common/inference_backends.py)
+INFERENCE_BACKEND = os.getenv("PREDICTION_INFERENCE_BACKEND", "xgboost")
+COMPILED_MODEL_DIR = os.getenv("PREDICTION_COMPILED_MODEL_DIR", ".")
+BACKEND_MAX_ROWS = int(os.getenv("PREDICTION_BACKEND_MAX_ROWS", 100))
+
+# Value ranges (slightly wider than the training data) for the parity check sample
+PARITY_FEATURE_RANGES = {
+    "time_of_day": (0, 24), "is_weekend": (0, 1), "is_holiday": (0, 1),
+    "temperature_c": (10, 45), "traffic_density": (0, 1), "distance_from_user_km": (0, 30),
+    "base_price": (40, 60), "dynamic_multiplier": (0.5, 2.5), "final_price": (30, 130),
+    "event_nearby": (0, 1), "total_slots": (300, 850), "occupied_slots": (0, 850),
+    "free_slots": (0, 850), "slots_free_in_15min": (0, 850), "future_bookings_15min": (0, 400)
+}
+
+def _parity_sample(feature_order: List[str], encoders, rows: int = 1000, seed: int = 0) -> np.ndarray:
+    """Random feature rows (every encoder code, numerics across their ranges) in feature_order"""
+    rng = np.random.default_rng(seed)
+    X = np.zeros((rows, len(feature_order)))
+    for i, col in enumerate(feature_order):
+        if encoders and col in encoders:
+            X[:, i] = rng.integers(0, max(1, len(encoders[col].classes)), rows)
+        else:
+            low, high = PARITY_FEATURE_RANGES.get(col, (0, 1000))
+            X[:, i] = rng.uniform(low, high, rows)
+    return X
+
+def _fresh(fast_path: str, source_path: str) -> bool:
+    """True if fast_path exists and is at least as new as source_path"""
+    if not os.path.exists(fast_path):
+        return False
+    return not os.path.exists(source_path) or os.path.getmtime(fast_path) >= os.path.getmtime(source_path)
+
+# Hot reload: check the model files every PREDICTION_RELOAD_POLL_SECONDS and swap
+# in the new model when they change (0 = off; POST /admin/reload works either way,
+# but only when PREDICTION_ADMIN_TOKEN is set)
+RELOAD_POLL_SECONDS = float(os.getenv("PREDICTION_RELOAD_POLL_SECONDS", 0))
+ADMIN_TOKEN = os.getenv("PREDICTION_ADMIN_TOKEN")
+
+# Optional shadow model: a directory with the same file names, scored in the
+# background on a sample of predictions and compared with the served model
+SHADOW_MODEL_DIR = os.getenv("PREDICTION_SHADOW_MODEL_DIR")
+SHADOW_SAMPLE_RATE = float(os.getenv("PREDICTION_SHADOW_SAMPLE_RATE", 0.1))
+
+DEFAULT_FEATURE_ORDER = [
+    "city", "area", "parking_lot_name", "day_of_week", "time_of_day", 
+    "is_weekend", "is_holiday", "weather_condition", "temperature_c", 
+    "traffic_density", "distance_from_user_km", "vehicle_type", 
+    "base_price", "dynamic_multiplier", "final_price", "event_nearby", 
+    "total_slots", "occupied_slots", "free_slots", "slots_free_in_15min", 
+    "future_bookings_15min"
+]
+
+class ModelBundle(NamedTuple):
+    """Everything one prediction needs, loaded together and swapped as one object"""
+    model: Optional[object]
+    encoders: Optional[Dict]
+    feature_order: List[str]
+    backend: Optional[object]
+    model_path: Optional[str] = None
+    version: Optional[tuple] = None
+    shadow: Optional[ShadowScorer] = None
+    # Feature order and encoders compiled with PARKING_AREAS (see feature_schema.py)
+    schema: Optional[FeatureSchema] = None
+
+EMPTY_MODEL = ModelBundle(None, None, [], None)
+
+def _model_paths(model_dir: str = "") -> List[str]:
+    return [os.path.join(model_dir, path) for path in
+            (MODEL_PATH, FAST_MODEL_PATH, FEATURE_PATH, ENCODER_PATH, ENCODER_TABLE_PATH)]
+
+def _watched_version() -> tuple:
+    """Signature of every file a reload would read (primary and shadow model)"""
+    paths = _model_paths() + (_model_paths(SHADOW_MODEL_DIR) if SHADOW_MODEL_DIR else [])
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+def _load_model_bundle(model_dir: str = "", backend_name: str = INFERENCE_BACKEND) -> ModelBundle:
+    """Load model, feature order, encoders and inference backend from model_dir"""
+    version = _watched_version()  # before reading, so files changed mid-load trigger another reload
+    model_file, fast_model_file, feature_file, encoder_file, encoder_table_file = _model_paths(model_dir)
+
+    model_path = fast_model_file if _fresh(fast_model_file, model_file) else model_file
+    if os.path.exists(model_path):
+        import xgboost as xgb
+        model = xgb.XGBRegressor()               # REGRESSOR, not Classifier
+        model.load_model(model_path)
     else:
-        xgb_model = None
+        model = None
         print("Warning: XGBoost model not found, using fallback predictions")
     
     # Load feature order
-    if os.path.exists(FEATURE_PATH):
-        with open(FEATURE_PATH, "r") as f:
-            feature_order = json.load(f)
+    if os.path.exists(feature_file):
+        with open(feature_file, "r") as f:
+            order = json.load(f)
     else:
-        feature_order = [
-            "city", "area", "parking_lot_name", "day_of_week", "time_of_day", 
-            "is_weekend", "is_holiday", "weather_condition", "temperature_c", 
-            "traffic_density", "distance_from_user_km", "vehicle_type", 
-            "base_price", "dynamic_multiplier", "final_price", "event_nearby", 
-            "total_slots", "occupied_slots", "free_slots", "slots_free_in_15min", 
-            "future_bookings_15min"
-        ]
+        order = list(DEFAULT_FEATURE_ORDER)
     
-    # Load categorical encoders
-    if os.path.exists(ENCODER_PATH):
-        with open(ENCODER_PATH, "rb") as f:
-            encoders = pickle.load(f)
+    # Load categorical encoders as lookup tables
+    if _fresh(encoder_table_file, encoder_file) and encoder_table_current(encoder_table_file):
+        tables, _ = load_encoder_table(encoder_table_file)
+    elif os.path.exists(encoder_file):
+        with open(encoder_file, "rb") as f:
+            tables = compile_encoders(pickle.load(f))
     else:
-        encoders = None
+        tables = None
         print("Warning: Categorical encoders not found")
 
-except Exception as e:
-    print(f"Error loading model components: {e}")
-    xgb_model, encoders, feature_order = None, None, []
+    # Scoring backend, verified against xgboost before use
+    backend = None
+    if model is not None:
+        backend = load_backend(
+            backend_name, model, _parity_sample(order, tables),
+            cache_dir=COMPILED_MODEL_DIR, max_rows=BACKEND_MAX_ROWS or None
+        )
+        backend.predict(np.zeros((1, len(order))))  # first call allocates the predictor
+
+    return ModelBundle(model, tables, order, backend, model_path if model is not None else None, version,
+                       schema=FeatureSchema(order, tables, PARKING_AREAS))
+
+def _with_shadow(bundle: ModelBundle) -> ModelBundle:
+    """Attach a ShadowScorer for SHADOW_MODEL_DIR; a broken candidate is logged and skipped"""
+    if not SHADOW_MODEL_DIR or bundle.model is None:
+        return bundle
+    try:
+        shadow = _load_model_bundle(SHADOW_MODEL_DIR, backend_name="xgboost")
+        if shadow.model is None:
+            raise FileNotFoundError(f"no model in {SHADOW_MODEL_DIR}")
+    except Exception as e:
+        print(f"Warning: shadow model not loaded: {e}")
+        return bundle
+    scorer = ShadowScorer(
+        lambda rows: shadow.backend.predict(_feature_matrix(shadow, rows)),
+        sample_rate=SHADOW_SAMPLE_RATE, name=shadow.model_path
+    )
+    print(f"Shadow model enabled: {shadow.model_path} ({SHADOW_SAMPLE_RATE:.0%} of predictions)")
+    return bundle._replace(shadow=scorer)
+
+def _feature_matrix(bundle: ModelBundle, rows: List[Dict]) -> np.ndarray:
+    """Encode rows of raw features (categoricals as labels) into a matrix in the bundle's feature order"""
+    X = np.zeros((len(rows), len(bundle.feature_order)))
+    for i, row in enumerate(rows):
+        encoded = dict(row)
+        for col, table in (bundle.encoders or {}).items():
+            if col in encoded:
+                encoded[col] = table.encode_one(encoded[col])
+        X[i] = [encoded.get(f, 0) for f in bundle.feature_order]
+    return X
+
+# -------------------------------
+# Load trained model safely
+# -------------------------------
+current_model = EMPTY_MODEL
+model_state = {"phase": "starting", "process_started_at": time.time(), "load_seconds": None, "error": None}
+model_ready = threading.Event()
+reload_state = {"count": 0, "failures": 0, "last_trigger": None, "last_reload_at": None, "last_seconds": None, "last_error": None}
+reload_lock = threading.Lock()
+
+def load_model_components():
+    """Load the model at start-up; on failure the service runs on fallback predictions"""
+    global current_model
+    model_state["phase"] = "loading"
+    start = time.perf_counter()
+    try:
+        current_model = _with_shadow(_load_model_bundle())
+        model_state["model_path"] = current_model.model_path
+    except Exception as e:
+        print(f"Error loading model components: {e}")
+        current_model = EMPTY_MODEL
+        model_state["error"] = str(e)
+
+    model_state.update(phase="ready", load_seconds=round(time.perf_counter() - start, 3))
+    model_ready.set()
+
+def reload_model_components(trigger: str) -> Dict:
+    """
+    Load the model files again and swap them in as one ModelBundle
+
+    Predictions keep using the current bundle while the new one loads; each
+    prediction reads current_model once, so it never mixes the encoders or
+    feature order of one model with the booster of another. If the new files
+    cannot be loaded, the current model stays and the error is raised.
+    """
+    global current_model
+    with reload_lock:
+        start = time.perf_counter()
+        reload_state["last_trigger"] = trigger
+        try:
+            bundle = _load_model_bundle()
+            if bundle.model is None:
+                raise FileNotFoundError(f"{MODEL_PATH} not found")
+            bundle = _with_shadow(bundle)
+        except Exception as e:
+            reload_state["failures"] += 1
+            reload_state["last_error"] = str(e)
+            print(f"Model reload failed, keeping the current model: {e}")
+            raise
+        previous, current_model = current_model, bundle
+        model_state.update(model_path=bundle.model_path, error=None)
+        reload_state.update(count=reload_state["count"] + 1, last_reload_at=time.time(),
+                            last_seconds=round(time.perf_counter() - start, 3), last_error=None)
+    print(f"Model reloaded ({trigger}) in {reload_state['last_seconds']}s")
+    if previous.shadow:
+        threading.Thread(target=previous.shadow.stop, name="shadow-retire", daemon=True).start()
+    return dict(reload_state)
+
+async def watch_model_files():
+    """Reload the model when its files change and then stay unchanged for one poll interval"""
+    previous = failed = None
+    while True:
+        await asyncio.sleep(RELOAD_POLL_SECONDS)
+        version = _watched_version()
+        if model_ready.is_set() and version != current_model.version and version == previous and version != failed:
+            try:
+                await asyncio.to_thread(reload_model_components, "file change")
+                failed = None
+            except Exception:
+                failed = version  # retried when the files change again
+        previous = version
+
+if WARMUP_MODE == "eager":
+    load_model_components()
 
 # -------------------------------
 # Google Maps Service Class
@@ -131,41 +444,17 @@ class GoogleMapsService:
     """Service for Google Maps API integration"""
     
     @staticmethod
-    async def get_travel_time(origin: Dict, destination: Dict) -> Dict:
+    async def get_travel_time(origin: Dict, destination: Dict, now: Optional[datetime] = None) -> Dict:
         """Calculate travel time and distance (using fallback for now due to Google Maps API limitations)"""
         try:
-            # Calculate simple distance using Haversine formula
-            from math import radians, cos, sin, asin, sqrt
-            
-            lat1, lon1 = radians(origin["lat"]), radians(origin["lng"])
-            lat2, lon2 = radians(destination["lat"]), radians(destination["lng"])
-            
-            dlon = lon2 - lon1
-            dlat = lat2 - lat1
-            a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-            c = 2 * asin(sqrt(a))
-            distance_km = 6371 * c  # Radius of earth in kilometers
-            
-            # Estimate travel time based on distance (assuming 30 km/h average in city)
-            duration_minutes = (distance_km / 30) * 60
-            
-            # Add traffic factor based on time of day
-            current_hour = datetime.now().hour
-            if 8 <= current_hour <= 10 or 17 <= current_hour <= 19:
-                traffic_factor = 1.5  # Peak hours
-            elif 11 <= current_hour <= 16:
-                traffic_factor = 1.2  # Normal hours
-            else:
-                traffic_factor = 1.0  # Off hours
-            
-            duration_in_traffic = duration_minutes * traffic_factor
-            
-            return {
-                "distance_km": float(distance_km),
-                "duration_minutes": float(duration_minutes),
-                "duration_in_traffic_minutes": float(duration_in_traffic),
-                "traffic_factor": float(traffic_factor)
-            }
+            # Haversine distance at 30 km/h city average, scaled by the traffic
+            # factor for the hour (see geodesic.py for whole matrices at once)
+            matrix = travel_time_matrix(
+                [(origin["lat"], origin["lng"])],
+                [(destination["lat"], destination["lng"])],
+                (now or datetime.now()).hour
+            )
+            return matrix.info(0, 0)
                 
         except Exception as e:
             print(f"Error calculating travel time: {e}")
@@ -177,10 +466,10 @@ class GoogleMapsService:
             }
     
     @staticmethod
-    async def get_weather_data(lat: float, lng: float) -> Dict:
+    async def get_weather_data(lat: float, lng: float, now: Optional[datetime] = None) -> Dict:
         """Get weather data simulation for Pune"""
         try:
-            current_time = datetime.now()
+            current_time = now or datetime.now()
             
             # Simulate realistic weather based on time of year and hour for Pune
             # November in Pune - pleasant weather, around 24-28°C
@@ -232,6 +521,34 @@ class ParkingRecommendationInput(BaseModel):
     planned_arrival_time: str  # ISO format
     vehicle_type: str = "car"
     max_walking_distance: float = 500  # meters
+    arrival_offsets_minutes: List[int] = []  # extra arrival times to forecast, e.g. [15, 30, 60]
+
+class AvailabilityForecastInput(BaseModel):
+    user_location: Dict[str, float]  # {"lat": 18.5204, "lng": 73.8567}
+    parking_area: str
+    vehicle_type: str = "car"
+    start_time: Optional[str] = None  # ISO departure time, or None for "now"
+    horizon_minutes: int = 180  # forecast arrivals up to this long after the earliest one
+    step_minutes: int = 5
+
+class RealtimeDataUpdate(BaseModel):
+    """One area's occupancy as posted by cv_integration.py"""
+    area_id: str  # a PARKING_AREAS id or a CV_ZONE_AREAS camera zone
+    free_slots: int
+    current_occupancy: Optional[float] = None  # occupancy rate, 0-1; derives total_slots for a new zone
+    timestamp: Optional[str] = None  # ISO format
+    confidence: float = 0.9
+    total_slots: Optional[int] = None  # last pushed, configured or derived count when missing
+
+class AreaStatus(BaseModel):
+    area_id: str
+    total_slots: int
+    occupied_slots: Optional[int] = None
+    free_slots: Optional[int] = None
+    last_updated: Optional[str] = None
+
+class CVDataUpdate(BaseModel):
+    areas_status: List[AreaStatus]
 
 class BookingInput(BaseModel):
     city: str
@@ -256,6 +573,104 @@ class BookingInput(BaseModel):
     slots_free_in_15min: int
     future_bookings_15min: int
 
+# Backend search centre for each area (the backend does not know the ML area ids)
+AREA_SEARCH_COORDS = {
+    'pict_campus': (18.5204, 73.8567),
+    'amanora_mall': (18.5018, 73.9344),
+    'seasons_mall': (18.5362, 73.8982),
+    'kharadi_it_park': (18.5570, 73.9090),
+    'eon_it_park': (18.5600, 73.9120)
+}
+
+# Lower-case part of the backend spot name that identifies each area's spot
+AREA_NAME_KEYWORDS = {
+    'pict_campus': 'pict',
+    'amanora_mall': 'amanora',
+    'seasons_mall': 'seasons',
+    'kharadi_it_park': 'kharadi',
+    'eon_it_park': 'eon'
+}
+
+# An area's spot must lie within this distance of its search centre
+NEARBY_RADIUS_KM = 5
+
+def _index_nearby_spots(spots: List[Dict], areas: List[str]) -> Dict[str, Dict]:
+    """
+    Live slot record per area id from one nearby result, in a single pass
+    
+    An area's spot is the one nearest to its search centre, within
+    NEARBY_RADIUS_KM, whose name contains the area keyword.
+    """
+    keywords = [(area, AREA_NAME_KEYWORDS[area]) for area in areas]
+    nearest: Dict[str, Tuple[float, Dict]] = {}
+    for spot in spots:
+        spot_name = spot.get('name', '').lower()
+        for area, keyword in keywords:
+            if keyword not in spot_name:
+                continue
+            if 'latitude' in spot and 'longitude' in spot:
+                distance = float(haversine_km(*AREA_SEARCH_COORDS[area], spot['latitude'], spot['longitude']))
+            else:
+                distance = 0.0  # no coordinates: trust the backend's radius filter
+            if distance <= NEARBY_RADIUS_KM and (area not in nearest or distance < nearest[area][0]):
+                nearest[area] = (distance, spot)
+    
+    live_slots = {}
+    for area, (_, spot) in nearest.items():
+        # Calculate live occupancy rate
+        available = spot.get('availableSpots', 0)
+        total = spot.get('totalSpots', 1)
+        occupancy_rate = max(0, min(1, (total - available) / total))
+        
+        live_slots[area] = {
+            'available_spots': available,
+            'total_spots': total,
+            'occupancy_rate': occupancy_rate,
+            'realtime_slots': spot.get('realTimeSlots', []),
+            'last_updated': spot.get('lastUpdated'),
+            'source': 'cv_realtime',
+            'spot_name': spot.get('name')
+        }
+    return live_slots
+
+def _live_source(real_time_data: Optional[Dict]) -> str:
+    """
+    Where live slot data came from, for the data_source counter: a pushed
+    update (cv_push, cv_status, cv_zones), the backend via live_slot_cache
+    (cv_realtime_cached/_stale/_fetched), the client, or none (simulated)
+    """
+    if not real_time_data:
+        return "simulated"
+    source = real_time_data.get("source") or real_time_data.get("data_source", "unknown")
+    served = real_time_data.get("served")
+    return f"{source}_{served}" if served else source
+
+def _data_source(real_time_data: Optional[Dict]) -> str:
+    """
+    data_source of an answer: "simulated" without live data, "cached" or
+    "stale" for a live_slot_cache snapshot served from the cache (the age is
+    in data_source_age_seconds), otherwise "real-time"
+    """
+    if not real_time_data:
+        return "simulated"
+    served = real_time_data.get("served")
+    return served if served in ("cached", "stale") else "real-time"
+
+class RequestContext(NamedTuple):
+    """Time and weather for one API request, computed once and shared by every area it evaluates"""
+    now: datetime
+    weather_data: Dict
+    # Live slot data by area id, fetched in bulk for the whole request (None: fetch per area)
+    live_slots: Optional[Dict[str, Dict]] = None
+    # Travel info from the request location by area id, computed as one matrix (None: per area)
+    travel: Optional[Dict[str, Dict]] = None
+
+    @classmethod
+    async def create(cls, gmaps_service: "GoogleMapsService", location: Dict[str, float]) -> "RequestContext":
+        now = datetime.now()
+        weather_data = await gmaps_service.get_weather_data(location["lat"], location["lng"], now=now)
+        return cls(now, weather_data)
+
 # -------------------------------
 # Enhanced Prediction Service
 # -------------------------------
@@ -263,14 +678,22 @@ class ParkingPredictionService:
     """Core prediction service with XGBoost model and real-world integration"""
     
     def __init__(self):
-        self.model = xgb_model
-        self.encoders = encoders
-        self.feature_order = feature_order
         self.gmaps_service = GoogleMapsService()
     
-    async def predict_availability_for_spot(self, input_data: ParkingPredictionInput) -> Dict:
-        """Predict availability for specific parking spot when user arrives"""
+    async def predict_availability_for_spot(self, input_data: ParkingPredictionInput,
+                                            context: Optional["RequestContext"] = None) -> Dict:
+        """
+        Predict availability for specific parking spot when user arrives
+        
+        context carries the current time and weather when the caller evaluates
+        several areas for one request; otherwise they are computed here.
+        """
         try:
+            if context is None:
+                with metrics.stage("predict_availability", "context"):
+                    context = await RequestContext.create(self.gmaps_service, input_data.user_location)
+            now = context.now
+            
             # Get parking area details
             if input_data.parking_area not in PARKING_AREAS:
                 raise HTTPException(status_code=400, detail="Invalid parking area")
@@ -285,52 +708,48 @@ class ParkingPredictionService:
                     "available_spots": input_data.current_slot_data["available_spots"],
                     "total_slots": input_data.current_slot_data["total_spots"],
                     "occupied_slots": input_data.current_slot_data["total_spots"] - input_data.current_slot_data["available_spots"],
-                    "last_updated": datetime.now().isoformat(),
+                    "last_updated": now.isoformat(),
                     "data_source": "client_provided"
                 }
+            elif context.live_slots is not None:
+                # Already fetched for every area of this request (see recommend_best_parking)
+                real_time_data = context.live_slots.get(input_data.parking_area)
             else:
                 # Try to fetch real-time data from backend CV system
-                real_time_data = await self._get_real_time_slot_data(input_data.parking_area)
+                with metrics.stage("predict_availability", "live_slots"):
+                    real_time_data = await self._get_real_time_slot_data(input_data.parking_area)
             
             # Calculate travel time
-            travel_data = await self.gmaps_service.get_travel_time(
-                input_data.user_location,
-                {"lat": parking_spot["lat"], "lng": parking_spot["lng"]}
-            )
+            if context.travel is not None and input_data.parking_area in context.travel:
+                travel_data = context.travel[input_data.parking_area]
+            else:
+                with metrics.stage("predict_availability", "travel_time"):
+                    travel_data = await self.gmaps_service.get_travel_time(
+                        input_data.user_location,
+                        {"lat": parking_spot["lat"], "lng": parking_spot["lng"]},
+                        now=now
+                    )
             
             # Determine arrival time
             if input_data.planned_arrival_time:
                 arrival_time = datetime.fromisoformat(input_data.planned_arrival_time.replace('Z', '+00:00'))
             else:
-                arrival_time = datetime.now() + timedelta(minutes=travel_data["duration_in_traffic_minutes"])
+                arrival_time = now + timedelta(minutes=travel_data["duration_in_traffic_minutes"])
             
-            # Get weather for arrival time
-            weather_data = await self.gmaps_service.get_weather_data(
-                parking_spot["lat"], parking_spot["lng"]
-            )
+            # Weather for arrival time (simulated per city, so shared by all areas of a request)
+            weather_data = context.weather_data
             
             # Calculate traffic density
             traffic_density = self.gmaps_service.calculate_traffic_density(travel_data["traffic_factor"])
             
-            # Use real-time occupancy if available, otherwise simulate
-            if real_time_data:
-                current_occupancy = real_time_data.get("occupied_slots", 0) / real_time_data.get("total_slots", 55)
-                current_available = real_time_data.get("available_spots", 0)
-                total_slots = real_time_data.get("total_spots", 55)
-                
-                # Calculate prediction based on real data + future trends
-                availability_percent = await self._predict_with_real_data(
-                    real_time_data, arrival_time, weather_data, traffic_density, travel_data
-                )
-            else:
-                # Fallback to simulation
-                current_hour = datetime.now().hour
-                current_occupancy = self._simulate_current_occupancy(input_data.parking_area, current_hour)
-                
-                # Simple rule-based prediction for fallback
-                availability_percent = await self._simple_rule_based_prediction(
-                    input_data.parking_area, arrival_time, weather_data, traffic_density, current_occupancy
-                )
+            metrics.count("data_source", _live_source(real_time_data))
+            
+            # Real-time occupancy with future trends if available, otherwise
+            # simulated occupancy with simple rules (no model, see _rule_based_availability)
+            availability_percent = await self._rule_based_availability(
+                input_data.parking_area, real_time_data, context, arrival_time, traffic_density, travel_data
+            )
+            metrics.count("scoring", "rules")
             
             return {
                 "success": True,
@@ -348,71 +767,78 @@ class ParkingPredictionService:
                     "traffic_density": float(round(traffic_density, 2))
                 },
                 "confidence": "High" if real_time_data else "Medium",
-                "data_source": "real-time" if real_time_data else "simulated"
+                "data_source": _data_source(real_time_data),
+                # Seconds since the live slot data was fetched (None when simulated)
+                "data_source_age_seconds": real_time_data.get("age_seconds", 0.0) if real_time_data else None
             }
             
         except Exception as e:
+            metrics.count("errors", "predict_availability")
             print(f"Prediction error: {e}")
             raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
     
     async def _get_real_time_slot_data(self, parking_area: str) -> Optional[Dict]:
         """Fetch real-time slot data from the backend API with CV updates"""
+        return (await self._get_real_time_slot_data_bulk([parking_area])).get(parking_area)
+    
+    async def _get_real_time_slot_data_bulk(self, parking_areas: List[str]) -> Dict[str, Dict]:
+        """
+        Live slot data for several areas, keyed by area id
+        
+        Recent updates pushed by the CV system come first (occupancy_buffer).
+        Other areas are served from live_slot_cache, and the ones it has no
+        usable snapshot for are fetched together with one
+        /parking-spot/nearby call. Each record carries age_seconds, the time
+        since it was received or fetched.
+        """
+        live_slots = {}
+        for area in parking_areas:
+            record = occupancy_buffer.latest_record(area, PUSH_MAX_AGE_SECONDS)
+            if record:
+                live_slots[area] = record
+        areas = [area for area in parking_areas if area in AREA_SEARCH_COORDS and area not in live_slots]
+        if not areas:
+            return live_slots
+        
         try:
-            # Map ML area IDs to backend API calls
-            area_coords = {
-                'pict_campus': (18.5204, 73.8567),
-                'amanora_mall': (18.5018, 73.9344),
-                'seasons_mall': (18.5362, 73.8982),
-                'kharadi_it_park': (18.5570, 73.9090),
-                'eon_it_park': (18.5600, 73.9120)
-            }
-            
-            if parking_area not in area_coords:
-                return None
-                
-            lat, lng = area_coords[parking_area]
-            url = f"{BACKEND_API_BASE}/parking-spot/nearby"
-            params = {
-                'latitude': lat,
-                'longitude': lng, 
-                'radius': 5
-            }
-            
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get('success') and data.get('data'):
-                            # Find the relevant parking spot in results
-                            for spot in data['data']:
-                                spot_name = spot.get('name', '').lower()
-                                if (parking_area == 'pict_campus' and 'pict' in spot_name) or \
-                                   (parking_area == 'amanora_mall' and 'amanora' in spot_name) or \
-                                   (parking_area == 'seasons_mall' and 'seasons' in spot_name) or \
-                                   (parking_area == 'kharadi_it_park' and 'kharadi' in spot_name) or \
-                                   (parking_area == 'eon_it_park' and 'eon' in spot_name):
-                                    
-                                    # Calculate live occupancy rate
-                                    available = spot.get('availableSpots', 0)
-                                    total = spot.get('totalSpots', 1)
-                                    occupancy_rate = max(0, min(1, (total - available) / total))
-                                    
-                                    return {
-                                        'available_spots': available,
-                                        'total_spots': total,
-                                        'occupancy_rate': occupancy_rate,
-                                        'realtime_slots': spot.get('realTimeSlots', []),
-                                        'last_updated': spot.get('lastUpdated'),
-                                        'source': 'cv_realtime',
-                                        'spot_name': spot.get('name')
-                                    }
+            snapshots = await live_slot_cache.get_many(areas, self._fetch_live_slots)
         except Exception as e:
-            print(f"Error fetching real-time data for {parking_area}: {e}")
+            metrics.count("fallback", "backend_error")
+            print(f"Error fetching real-time data for {', '.join(areas)}: {e}")
+            return live_slots
+        for area, (record, age, served) in snapshots.items():
+            if record is not None:
+                live_slots[area] = dict(record, age_seconds=round(age, 1), served=served)
+        return live_slots
+    
+    async def _fetch_live_slots(self, areas: List[str]) -> Dict[str, Dict]:
+        """
+        Live slot records for the given areas from one /parking-spot/nearby call
         
-        return None
+        The search circle is centred between the areas and reaches
+        NEARBY_RADIUS_KM beyond the farthest one, so it contains every spot
+        a separate per-area search would have returned. For a single area
+        it is exactly the per-area search. Raises BackendError when the
+        backend cannot be reached.
+        """
+        lat = sum(AREA_SEARCH_COORDS[area][0] for area in areas) / len(areas)
+        lng = sum(AREA_SEARCH_COORDS[area][1] for area in areas) / len(areas)
+        area_lats, area_lngs = zip(*(AREA_SEARCH_COORDS[area] for area in areas))
+        radius = NEARBY_RADIUS_KM + float(haversine_km(lat, lng, np.array(area_lats), np.array(area_lngs)).max())
+        params = {
+            'latitude': lat,
+            'longitude': lng,
+            'radius': radius
+        }
+        
+        data = await backend_client.get_json("/parking-spot/nearby", params=params)
+        if not (data.get('success') and data.get('data')):
+            return {}
+        return _index_nearby_spots(data['data'], areas)
     
-    async def _predict_with_real_data(self, real_data: Dict, arrival_time: datetime, weather_data: Dict, traffic_density: float, travel_data: Dict) -> float:
+    async def _predict_with_real_data(self, real_data: Dict, arrival_time: datetime, weather_data: Dict, traffic_density: float, travel_data: Dict, now: Optional[datetime] = None) -> float:
         """Make prediction incorporating real-time slot data"""
+        now = now or datetime.now()
         # Handle both CV backend format and client-provided format
         if "available_spots" in real_data:
             available_spots = real_data["available_spots"] 
@@ -424,14 +850,14 @@ class ParkingPredictionService:
         current_availability = (available_spots / max(1, total_slots)) * 100
         
         # Calculate time until arrival
-        minutes_to_arrival = (arrival_time - datetime.now()).total_seconds() / 60
+        minutes_to_arrival = (arrival_time - now).total_seconds() / 60
         
         # Base prediction on current availability
         predicted_availability = current_availability
         
         # Adjust based on time trends (arrival time vs current time)
         arrival_hour = arrival_time.hour
-        current_hour = datetime.now().hour
+        current_hour = now.hour
         
         # Peak hours adjustment
         if 8 <= arrival_hour <= 10 or 17 <= arrival_hour <= 19:
@@ -463,6 +889,20 @@ class ParkingPredictionService:
         
         return predicted_availability
     
+    async def _rule_based_availability(self, parking_area: str, real_time_data: Optional[Dict],
+                                       context: "RequestContext", arrival_time: datetime,
+                                       traffic_density: float, travel_data: Dict) -> float:
+        """Rule-based availability (percent) for one area, for when there is no model score"""
+        if real_time_data:
+            # Current availability from real data + future trends
+            return await self._predict_with_real_data(
+                real_time_data, arrival_time, context.weather_data, traffic_density, travel_data, now=context.now
+            )
+        current_occupancy = self._simulate_current_occupancy(parking_area, context.now.hour)
+        return await self._simple_rule_based_prediction(
+            parking_area, arrival_time, context.weather_data, traffic_density, current_occupancy
+        )
+    
     async def _simple_rule_based_prediction(self, parking_area: str, arrival_time: datetime, weather_data: Dict, traffic_density: float, current_occupancy: float) -> float:
         """Simple rule-based prediction for fallback"""
         # Base availability from current occupancy
@@ -492,47 +932,97 @@ class ParkingPredictionService:
         return max(10, min(90, base_availability))
     
     async def recommend_best_parking(self, input_data: ParkingRecommendationInput) -> Dict:
-        """Recommend top 3 parking spots for given destination and time"""
+        """
+        Recommend top 3 parking spots for given destination and time
+        
+        Areas within walking distance share one RequestContext. With a model
+        loaded, availability for every candidate (and every requested arrival
+        offset) comes from one batched model call, the same scoring as
+        /predict-availability; without one, each candidate gets the
+        rule-based estimate. Candidates are ranked from PARKING_AREAS order,
+        so ties always break the same way.
+        """
         try:
             arrival_time = datetime.fromisoformat(input_data.planned_arrival_time.replace('Z', '+00:00'))
-            recommendations = []
+            if len(input_data.arrival_offsets_minutes) > RECOMMEND_MAX_OFFSETS:
+                raise HTTPException(status_code=400, detail=f"At most {RECOMMEND_MAX_OFFSETS} arrival offsets")
+            with metrics.stage("recommend", "context"):
+                context = await RequestContext.create(self.gmaps_service, input_data.destination_location)
             
-            # Evaluate all parking areas
-            for area_id, area_info in PARKING_AREAS.items():
-                # Calculate distance from destination to parking area
-                distance_to_parking = await self._calculate_walking_distance(
-                    input_data.destination_location,
-                    {"lat": area_info["lat"], "lng": area_info["lng"]}
-                )
-                
-                # Skip if too far from destination
-                if distance_to_parking > input_data.max_walking_distance:
-                    continue
-                
-                # Create prediction input
-                prediction_input = ParkingPredictionInput(
-                    user_location=input_data.destination_location,  # Use destination as origin
-                    parking_area=area_id,
-                    vehicle_type=input_data.vehicle_type,
-                    planned_arrival_time=input_data.planned_arrival_time
+            # Areas close enough to the destination, in PARKING_AREAS order
+            destination = input_data.destination_location
+            with metrics.stage("recommend", "candidates"):
+                candidates = [
+                    (area_id, PARKING_AREAS[area_id], distance_to_parking)
+                    for area_id, distance_to_parking in AREA_INDEX.within(
+                        destination["lat"], destination["lng"], input_data.max_walking_distance
+                    )
+                ]
+            
+            # Live slot data for all candidates with one backend call, and
+            # travel info to all of them as one distance/duration matrix
+            with metrics.stage("recommend", "travel_time"):
+                travel = travel_time_matrix(
+                    [(destination["lat"], destination["lng"])],
+                    [(area_info["lat"], area_info["lng"]) for _, area_info, _ in candidates],
+                    context.now.hour
                 )
-                
-                # Get availability prediction
-                prediction_result = await self.predict_availability_for_spot(prediction_input)
-                
-                recommendations.append({
+            with metrics.stage("recommend", "live_slots"):
+                live_slots = await self._get_real_time_slot_data_bulk([area_id for area_id, _, _ in candidates])
+            context = context._replace(
+                live_slots=live_slots,
+                travel={area_id: travel.info(0, j) for j, (area_id, _, _) in enumerate(candidates)}
+            )
+            
+            # Every candidate at every arrival time is scored in one model call
+            offsets = [0] + [offset for offset in input_data.arrival_offsets_minutes if offset != 0]
+            with metrics.stage("recommend", "model_scoring"):
+                scores = await self._score_candidates(candidates, context, arrival_time, input_data.vehicle_type, offsets)
+            metrics.count("scoring", "model" if scores is not None else "rules")
+            
+            recommendations = []
+            for j, (area_id, area_info, distance_to_parking) in enumerate(candidates):
+                live = live_slots.get(area_id)
+                metrics.count("data_source", _live_source(live))
+                travel_data = context.travel[area_id]
+                traffic_density = self.gmaps_service.calculate_traffic_density(travel_data["traffic_factor"])
+                if scores is not None:
+                    availability_percent = scores[0, j]
+                else:
+                    availability_percent = await self._rule_based_availability(
+                        area_id, live, context, arrival_time, traffic_density, travel_data
+                    )
+                recommendation = {
                     "parking_area": area_info["name"],
                     "parking_id": area_id,
-                    "availability_percentage": float(prediction_result["availability_percentage"]),
+                    "availability_percentage": float(round(availability_percent, 1)),
                     "walking_distance_meters": float(round(distance_to_parking, 0)),
                     "walking_time_minutes": float(round(distance_to_parking / 80, 1)),  # Average walking speed 80m/min
                     "total_slots": int(area_info["total_slots"]),
                     "coordinates": {"lat": float(area_info["lat"]), "lng": float(area_info["lng"])},
-                    "travel_info": prediction_result["travel_info"],
-                    "conditions": prediction_result["conditions"]
-                })
+                    "travel_info": {
+                        "distance_km": float(round(travel_data["distance_km"], 2)),
+                        "travel_time_minutes": float(round(travel_data["duration_in_traffic_minutes"], 1)),
+                        "traffic_factor": float(round(travel_data["traffic_factor"], 2))
+                    },
+                    "conditions": {
+                        "weather": context.weather_data["weather_condition"],
+                        "temperature": float(round(context.weather_data["temperature_c"], 1)),
+                        "traffic_density": float(round(traffic_density, 2))
+                    }
+                }
+                if scores is not None and input_data.arrival_offsets_minutes:
+                    recommendation["availability_forecast"] = [
+                        {
+                            "offset_minutes": offset,
+                            "arrival_time": (arrival_time + timedelta(minutes=offset)).isoformat(),
+                            "availability_percentage": float(round(scores[i, j], 1))
+                        }
+                        for i, offset in enumerate(offsets)
+                    ]
+                recommendations.append(recommendation)
             
-            # Sort by availability percentage and walking distance
+            # Sort by availability percentage and walking distance (stable, so ties keep area order)
             recommendations.sort(key=lambda x: (x["availability_percentage"], -x["walking_distance_meters"]), reverse=True)
             
             return {
@@ -540,13 +1030,206 @@ class ParkingPredictionService:
                 "destination": input_data.destination_location,
                 "arrival_time": arrival_time.isoformat(),
                 "top_recommendations": recommendations[:3],
-                "total_options": len(recommendations)
+                "total_options": len(recommendations),
+                "scoring": "model" if scores is not None else "rules"
             }
             
+        except (HTTPException, Saturated):
+            raise
         except Exception as e:
+            metrics.count("errors", "recommend")
             print(f"Recommendation error: {e}")
             raise HTTPException(status_code=500, detail=f"Recommendation failed: {str(e)}")
     
+    async def forecast_availability(self, input_data: "AvailabilityForecastInput") -> Dict:
+        """
+        Predicted availability for one area over a grid of arrival times
+        
+        Every arrival time is scored in one batched model call (with
+        _rule_based_availability per time without a model). The answer is columnar: one array per
+        field, one entry per arrival time.
+        """
+        if input_data.parking_area not in PARKING_AREAS:
+            raise HTTPException(status_code=400, detail="Invalid parking area")
+        if input_data.step_minutes <= 0 or input_data.horizon_minutes < 0:
+            raise HTTPException(status_code=400, detail="step_minutes must be positive and horizon_minutes not negative")
+        points = input_data.horizon_minutes // input_data.step_minutes + 1
+        if points > FORECAST_MAX_POINTS:
+            raise HTTPException(status_code=400, detail=f"At most {FORECAST_MAX_POINTS} arrival times per forecast")
+        
+        try:
+            with metrics.stage("forecast", "context"):
+                context = await RequestContext.create(self.gmaps_service, input_data.user_location)
+            area_info = PARKING_AREAS[input_data.parking_area]
+            start = (datetime.fromisoformat(input_data.start_time.replace('Z', '+00:00'))
+                     if input_data.start_time else context.now)
+            
+            # Earliest possible arrival, then every step_minutes from there
+            travel = travel_time_matrix(
+                [(input_data.user_location["lat"], input_data.user_location["lng"])],
+                [(area_info["lat"], area_info["lng"])],
+                start.hour
+            ).info(0, 0)
+            first_arrival = start + timedelta(minutes=travel["duration_in_traffic_minutes"])
+            offsets = list(range(0, points * input_data.step_minutes, input_data.step_minutes))
+            
+            with metrics.stage("forecast", "live_slots"):
+                live_slots = await self._get_real_time_slot_data_bulk([input_data.parking_area])
+            metrics.count("data_source", _live_source(live_slots.get(input_data.parking_area)))
+            context = context._replace(live_slots=live_slots, travel={input_data.parking_area: travel})
+            candidates = [(input_data.parking_area, area_info, 0.0)]
+            
+            features = self._candidate_features(candidates, context, first_arrival, input_data.vehicle_type, offsets)
+            bundle = current_model
+            scores, scoring = None, "model"
+            if bundle.backend is not None:
+                try:
+                    with metrics.stage("forecast", "model_scoring"):
+                        scores = await self._infer_features(bundle, features)
+                except Saturated:
+                    raise
+                except Exception as e:
+                    metrics.count("fallback", "model_error")
+                    print(f"Model prediction error: {e}")
+            arrivals = [first_arrival + timedelta(minutes=offset) for offset in offsets]
+            live = live_slots.get(input_data.parking_area)
+            if scores is None:
+                # Same rules as /predict-availability; live slot data only
+                # describes the earliest arrival, later ones use the simulation
+                traffic_density = self.gmaps_service.calculate_traffic_density(travel["traffic_factor"])
+                scores, scoring = [
+                    await self._rule_based_availability(
+                        input_data.parking_area, live if offset == 0 else None,
+                        context, arrival, traffic_density, travel
+                    )
+                    for offset, arrival in zip(offsets, arrivals)
+                ], "rules"
+            metrics.count("scoring", scoring)
+            
+            return {
+                "success": True,
+                "parking_area": area_info["name"],
+                "travel_time_minutes": float(round(travel["duration_in_traffic_minutes"], 1)),
+                "offsets_minutes": offsets,
+                "arrival_times": [arrival.isoformat() for arrival in arrivals],
+                "departure_times": [(arrival - timedelta(minutes=travel["duration_in_traffic_minutes"])).isoformat()
+                                    for arrival in arrivals],
+                "availability_percentage": [float(round(score, 1)) for score in scores],
+                "scoring": scoring,
+                "data_source": _data_source(live),
+                "data_source_age_seconds": live.get("age_seconds", 0.0) if live else None
+            }
+        except Saturated:
+            raise
+        except Exception as e:
+            metrics.count("errors", "forecast")
+            print(f"Forecast error: {e}")
+            raise HTTPException(status_code=500, detail=f"Forecast failed: {str(e)}")
+    
+    async def _score_candidates(self, candidates: List[Tuple[str, Dict, float]], context: "RequestContext",
+                                arrival_time: datetime, vehicle_type: str, offsets: List[int]) -> Optional[np.ndarray]:
+        """
+        Model availability (percent) for every candidate at every arrival offset, with one model call
+        
+        Returns an array of shape (len(offsets), len(candidates)), or None
+        when no model is loaded or scoring fails (callers keep their
+        rule-based estimates).
+        """
+        bundle = current_model
+        if bundle.backend is None or not candidates:
+            return None
+        
+        features = self._candidate_features(candidates, context, arrival_time, vehicle_type, offsets)
+        try:
+            return (await self._infer_features(bundle, features)).reshape(len(offsets), len(candidates))
+        except Saturated:
+            raise
+        except Exception as e:
+            metrics.count("fallback", "model_error")
+            print(f"Model prediction error: {e}")
+            return None
+    
+    def _candidate_features(self, candidates: List[Tuple[str, Dict, float]], context: "RequestContext",
+                            arrival_time: datetime, vehicle_type: str, offsets: List[int]) -> Dict:
+        """
+        Per-row inputs for FeatureSchema.fill, offset-major: every candidate
+        at the first offset, then at the next, ...
+        """
+        features = {"area_ids": [], "arrival_times": [], "current_occupancy": [], "traffic_density": [], "distance_km": []}
+        per_area = []
+        for area_id, _, _ in candidates:
+            live = (context.live_slots or {}).get(area_id)
+            if live:
+                current_occupancy = live["occupancy_rate"]
+            else:
+                current_occupancy = self._simulate_current_occupancy(area_id, context.now.hour)
+            travel_data = context.travel[area_id]
+            traffic_density = self.gmaps_service.calculate_traffic_density(travel_data["traffic_factor"])
+            per_area.append((area_id, current_occupancy, traffic_density, travel_data["distance_km"]))
+        for offset in offsets:
+            arrival = arrival_time + timedelta(minutes=offset)
+            for area_id, current_occupancy, traffic_density, distance_km in per_area:
+                features["area_ids"].append(area_id)
+                features["arrival_times"].append(arrival)
+                features["current_occupancy"].append(current_occupancy)
+                features["traffic_density"].append(traffic_density)
+                features["distance_km"].append(distance_km)
+        features["weather_data"] = context.weather_data
+        features["vehicle_type"] = vehicle_type
+        return features
+    
+    async def _candidate_rows(self, features: Dict) -> List[Dict]:
+        """The rows of _candidate_features as raw feature dicts (the per-row reference route for bench_feature_schema)"""
+        return [
+            await self._prepare_prediction_features(
+                arrival_time=arrival,
+                weather_data=features["weather_data"],
+                travel_data={"distance_km": distance_km},
+                parking_area=area_id,
+                vehicle_type=features["vehicle_type"],
+                traffic_density=traffic_density,
+                current_occupancy=current_occupancy
+            )
+            for area_id, arrival, current_occupancy, traffic_density, distance_km in zip(
+                features["area_ids"], features["arrival_times"], features["current_occupancy"],
+                features["traffic_density"], features["distance_km"]
+            )
+        ]
+    
+    async def _infer(self, bundle: ModelBundle, rows: List[Dict]) -> np.ndarray:
+        """_score_rows on the inference pool; raises Saturated when its queue is full"""
+        return await inference_executor.submit(self._score_rows, bundle, rows)
+    
+    async def _infer_features(self, bundle: ModelBundle, features: Dict) -> np.ndarray:
+        """_score_features on the inference pool; raises Saturated when its queue is full"""
+        return await inference_executor.submit(self._score_features, bundle, features)
+    
+    @staticmethod
+    def _score_rows(bundle: ModelBundle, rows: List[Dict]) -> np.ndarray:
+        """Availability percentages (0-100) for feature rows, scored in one model call (CPU-bound)"""
+        start = time.perf_counter()
+        X = _feature_matrix(bundle, rows)
+        return ParkingPredictionService._score_matrix(bundle, X, rows, start)
+    
+    @staticmethod
+    def _score_features(bundle: ModelBundle, features: Dict) -> np.ndarray:
+        """Like _score_rows, for _candidate_features inputs written straight into the compiled schema"""
+        start = time.perf_counter()
+        X = bundle.schema.fill(**features)
+        # Rows are decoded for the shadow only if it samples this call
+        return ParkingPredictionService._score_matrix(bundle, X, bundle.schema.decode(X), start)
+    
+    @staticmethod
+    def _score_matrix(bundle: ModelBundle, X: np.ndarray, rows, start: float) -> np.ndarray:
+        encoded = time.perf_counter()
+        predictions = bundle.backend.predict(X)
+        predicted = time.perf_counter()
+        inference_executor.record("features", (encoded - start) * 1e3)
+        inference_executor.record("predict", (predicted - encoded) * 1e3)
+        if bundle.shadow:
+            bundle.shadow.submit(rows, predictions, (predicted - encoded) * 1e3)
+        return np.clip(np.asarray(predictions, dtype=np.float64) * 100, 0, 100)
+    
     def _simulate_current_occupancy(self, parking_area: str, hour: int) -> float:
         """Simulate current parking occupancy based on area and time"""
         base_occupancy = {
@@ -575,7 +1258,7 @@ class ParkingPredictionService:
         
         return {
             "city": "Pune",
-            "area": "PICT",
+            "area": PARKING_AREAS[kwargs["parking_area"]]["area"],
             "parking_lot_name": kwargs["parking_area"],
             "day_of_week": arrival_time.strftime("%A"),
             "time_of_day": arrival_time.hour + arrival_time.minute / 60,
@@ -596,84 +1279,6 @@ class ParkingPredictionService:
             "slots_free_in_15min": max(0, int(PARKING_AREAS[kwargs["parking_area"]]["total_slots"] * (1 - kwargs["current_occupancy"] + 0.1))),
             "future_bookings_15min": max(0, int(kwargs["current_occupancy"] * 10))
         }
-    
-    async def _model_prediction(self, prediction_data: Dict) -> float:
-        """Use trained XGBoost model for prediction"""
-        try:
-            # Encode categorical features
-            encoded_data = prediction_data.copy()
-            
-            for col in ["city", "area", "parking_lot_name", "day_of_week", "weather_condition", "vehicle_type"]:
-                if col in self.encoders and col in encoded_data:
-                    try:
-                        encoded_data[col] = self.encoders[col].transform([encoded_data[col]])[0]
-                    except:
-                        encoded_data[col] = 0  # Unknown category
-            
-            # Build input vector
-            input_vector = [encoded_data.get(f, 0) for f in self.feature_order]
-            X = np.array(input_vector).reshape(1, -1)
-            
-            # Predict
-            prediction = self.model.predict(X)[0]
-            availability_percent = max(0, min(100, prediction * 100))
-            
-            # Convert numpy types to Python float
-            return float(availability_percent)
-            
-        except Exception as e:
-            print(f"Model prediction error: {e}")
-            return await self._rule_based_prediction(prediction_data)
-    
-    async def _rule_based_prediction(self, prediction_data: Dict) -> float:
-        """Fallback rule-based prediction when model is not available"""
-        base_availability = 70
-        
-        # Time-based adjustments
-        hour = prediction_data["time_of_day"]
-        if 8 <= hour <= 10 or 17 <= hour <= 19:  # Peak hours
-            base_availability -= 25
-        elif 11 <= hour <= 16:  # Normal hours
-            base_availability -= 15
-        
-        # Weekend adjustment
-        if prediction_data["is_weekend"]:
-            base_availability += 20
-        
-        # Weather adjustment
-        if prediction_data["weather_condition"] == "Rainy":
-            base_availability -= 10
-        
-        # Traffic adjustment
-        base_availability -= (prediction_data["traffic_density"] * 15)
-        
-        # Distance adjustment (closer = less availability due to popularity)
-        if prediction_data["distance_from_user_km"] < 1:
-            base_availability -= 10
-        
-        # Current occupancy
-        current_occupancy = prediction_data["occupied_slots"] / prediction_data["total_slots"]
-        base_availability = base_availability * (1 - current_occupancy)
-        
-        # Ensure we return Python float
-        availability = max(5, min(95, base_availability))
-        return float(availability)
-    
-    async def _calculate_walking_distance(self, origin: Dict, destination: Dict) -> float:
-        """Calculate walking distance between two points in meters"""
-        # Simple haversine distance calculation
-        from math import radians, cos, sin, asin, sqrt
-        
-        lat1, lon1 = radians(origin["lat"]), radians(origin["lng"])
-        lat2, lon2 = radians(destination["lat"]), radians(destination["lng"])
-        
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
-        r = 6371000  # Radius of earth in meters
-        
-        return c * r
 
 # Initialize prediction service
 prediction_service = ParkingPredictionService()
@@ -681,46 +1286,200 @@ prediction_service = ParkingPredictionService()
 # -------------------------------
 # Enhanced API Routes
 # -------------------------------
+def _coalesce_key(data: ParkingPredictionInput) -> Optional[Tuple]:
+    """Single-flight key for a /predict-availability request, None if it must run on its own"""
+    if not COALESCE_ENABLED or data.current_slot_data is not None:
+        return None
+    try:
+        location = geohash(data.user_location["lat"], data.user_location["lng"], COALESCE_GEOHASH_PRECISION)
+        arrival = None  # "now": arrival follows from the travel time, i.e. the location
+        if data.planned_arrival_time:
+            planned = datetime.fromisoformat(data.planned_arrival_time.replace('Z', '+00:00'))
+            arrival = int(planned.timestamp() // (max(1, COALESCE_ARRIVAL_MINUTES) * 60))
+    except (KeyError, TypeError, ValueError):
+        return None  # let the pipeline report the bad input
+    return (data.parking_area, data.vehicle_type, arrival, location)
+
 @app.post("/predict-availability")
 async def predict_parking_availability(data: ParkingPredictionInput):
     """Predict availability for specific parking spot when user arrives"""
-    return await prediction_service.predict_availability_for_spot(data)
+    with metrics.stage("predict_availability", "total"):
+        key = _coalesce_key(data)
+        if key is None:
+            return await prediction_service.predict_availability_for_spot(data)
+        return await prediction_flights.do(key, prediction_service.predict_availability_for_spot, data)
 
 @app.post("/recommend-parking")
 async def recommend_parking_spots(data: ParkingRecommendationInput):
     """Get top 3 parking recommendations for destination and time"""
-    return await prediction_service.recommend_best_parking(data)
+    with metrics.stage("recommend", "total"):
+        return await prediction_service.recommend_best_parking(data)
+
+@app.post("/forecast-availability")
+async def forecast_parking_availability(data: AvailabilityForecastInput):
+    """Availability for one area over a grid of arrival times, as columnar arrays"""
+    with metrics.stage("forecast", "total"):
+        return await prediction_service.forecast_availability(data)
 
 # Legacy endpoint for backward compatibility
 @app.post("/predict")
-def predict_parking_availability_legacy(data: BookingInput):
+async def predict_parking_availability_legacy(data: BookingInput):
     """Legacy prediction endpoint"""
-    if not xgb_model or not encoders:
+    if not model_ready.is_set():
+        raise HTTPException(status_code=503, detail="Model is still loading", headers={"Retry-After": "1"})
+    bundle = current_model
+    if not bundle.model or not bundle.encoders:
         return {"message": "Model not available", "availability_percent": 50.0}
     
     booking_dict = data.dict()
     
-    # Encode categorical features
-    for col, le in encoders.items():
-        if col in booking_dict:
-            try:
-                booking_dict[col] = le.transform([booking_dict[col]])[0]
-            except:
-                booking_dict[col] = 0
-    
-    # Build input vector
-    input_vector = [booking_dict.get(f, 0) for f in feature_order]
-    X = np.array(input_vector).reshape(1, -1)
-    
-    # Predict
-    y_pred = xgb_model.predict(X)[0]
-    availability_pct = max(0, min(100, y_pred * 100))
+    # Encode categorical features (unknown labels go to the encoder's unknown
+    # bucket, see parking_common/encoding.py), build the input vector and
+    # predict, on the inference pool
+    with metrics.stage("predict", "total"):
+        availability_pct = (await prediction_service._infer(bundle, [booking_dict]))[0]
+    metrics.count("scoring", "model")
     
     return {
         "message": "Prediction successful",
         "availability_percent": float(round(availability_pct, 2))
     }
 
+def _check_pushed_area(area_id: str):
+    """422 unless area_id is one of PARKING_AREAS or a camera zone of CV_ZONE_AREAS"""
+    if area_id not in PARKING_AREAS and area_id not in CV_ZONE_AREAS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown area_id {area_id!r}; expected one of {sorted(PARKING_AREAS) + sorted(CV_ZONE_AREAS)}"
+        )
+
+def _pushed_total_slots(area_id: str, free_slots: int, occupancy: Optional[float]) -> Optional[int]:
+    """Slot count for an update that has none: last known, configured, or derived from free/occupancy"""
+    latest = occupancy_buffer.latest(area_id)
+    if latest:
+        return latest.total_slots
+    if area_id in PARKING_AREAS:
+        return PARKING_AREAS[area_id]["total_slots"]
+    if occupancy is not None and 0 <= occupancy < 1:
+        return round(free_slots / (1 - occupancy))
+    return None
+
+def _store_pushed(updates: List[Dict]) -> List:
+    """
+    occupancy_buffer.push_many(updates), plus one update per area whose zones they include
+
+    An area's update sums the free and total slots of its zones, taking each
+    zone from this batch or else from its latest update younger than
+    PUSH_MAX_AGE_SECONDS. Everything is stored with one push_many, so all or
+    nothing is. Returns the samples of updates.
+    """
+    zone_updates = {update["area_id"]: update for update in updates if update["area_id"] in CV_ZONE_AREAS}
+    area_updates = []
+    for area_id in dict.fromkeys(CV_ZONE_AREAS[zone] for zone in zone_updates):
+        free_slots = total_slots = 0
+        confidence = 1.0
+        for zone, zone_area in CV_ZONE_AREAS.items():
+            if zone_area != area_id:
+                continue
+            if zone in zone_updates:
+                update = zone_updates[zone]
+                zone_total = max(1, int(update["total_slots"]))
+                zone_free = max(0, min(int(update["free_slots"]), zone_total))
+                zone_confidence = update.get("confidence", 1.0)
+            else:
+                record = occupancy_buffer.latest_record(zone, PUSH_MAX_AGE_SECONDS)
+                if record is None:
+                    continue
+                zone_total, zone_free, zone_confidence = record["total_spots"], record["available_spots"], record["confidence"]
+            free_slots += zone_free
+            total_slots += zone_total
+            confidence = min(confidence, zone_confidence)
+        latest = list(zone_updates.values())[-1]
+        area_updates.append(dict(area_id=area_id, free_slots=free_slots, total_slots=total_slots,
+                                 confidence=confidence, source="cv_zones", timestamp=latest.get("timestamp")))
+    try:
+        return occupancy_buffer.push_many(list(updates) + area_updates)[:len(updates)]
+    except TooManyAreas as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/update-realtime-data")
+async def update_realtime_data(data: RealtimeDataUpdate):
+    """Store one area's (or camera zone's) occupancy pushed by the CV system; predictions use it instead of asking the backend"""
+    _check_pushed_area(data.area_id)
+    total_slots = data.total_slots or _pushed_total_slots(data.area_id, data.free_slots, data.current_occupancy)
+    if total_slots is None:
+        raise HTTPException(status_code=422, detail=f"{data.area_id}: total_slots or current_occupancy required")
+    sample, = _store_pushed([dict(area_id=data.area_id, free_slots=data.free_slots, total_slots=total_slots,
+                                  confidence=data.confidence, timestamp=data.timestamp)])
+    return {"success": True, "area_id": data.area_id, "free_slots": sample.free_slots,
+            "total_slots": sample.total_slots}
+
+@app.post("/update-cv-data")
+async def update_cv_data(data: CVDataUpdate):
+    """
+    Store the status of several areas (or camera zones) pushed by the CV system
+
+    Every entry is checked before any is stored, so a rejected request
+    (422 for an unknown area or a status without slot counts) changes nothing.
+    """
+    updates = []
+    for status in data.areas_status:
+        _check_pushed_area(status.area_id)
+        if status.free_slots is not None:
+            free_slots = status.free_slots
+        elif status.occupied_slots is not None:
+            free_slots = status.total_slots - status.occupied_slots
+        else:
+            raise HTTPException(status_code=422, detail=f"{status.area_id}: free_slots or occupied_slots required")
+        updates.append((status, free_slots))
+
+    _store_pushed([
+        dict(area_id=status.area_id, free_slots=free_slots, total_slots=status.total_slots,
+             source="cv_status", timestamp=status.last_updated)
+        for status, free_slots in updates
+    ])
+    return {"success": True, "areas_updated": [status.area_id for status, _ in updates]}
+
+@app.get("/realtime-data/{area_id}")
+def get_realtime_data(area_id: str):
+    """Buffered occupancy updates for one area, oldest first"""
+    return {"area_id": area_id, "samples": occupancy_buffer.series(area_id)}
+
+@app.get("/nearest-parking")
+def nearest_parking(lat: float, lng: float, k: int = 3, max_distance_m: Optional[float] = None):
+    """The k parking areas nearest to a point, nearest first"""
+    if k < 1:
+        raise HTTPException(status_code=400, detail="k must be at least 1")
+    nearest = AREA_INDEX.nearest(lat, lng, k, max_distance_m if max_distance_m is not None else float("inf"))
+    return {
+        "location": {"lat": lat, "lng": lng},
+        "parking_areas": [
+            {
+                "parking_id": area_id,
+                "parking_area": PARKING_AREAS[area_id]["name"],
+                "distance_meters": float(round(distance, 0)),
+                "total_slots": int(PARKING_AREAS[area_id]["total_slots"]),
+                "coordinates": {"lat": float(PARKING_AREAS[area_id]["lat"]), "lng": float(PARKING_AREAS[area_id]["lng"])}
+            }
+            for area_id, distance in nearest
+        ]
+    }
+
+@app.post("/admin/reload")
+def reload_model(x_admin_token: Optional[str] = Header(None)):
+    """Reload the model files and swap them in without a restart (500 keeps the current model; 404 without PREDICTION_ADMIN_TOKEN)"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled; set PREDICTION_ADMIN_TOKEN")
+    if not hmac.compare_digest((x_admin_token or "").encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    if not model_ready.is_set():
+        raise HTTPException(status_code=503, detail="Model is still loading", headers={"Retry-After": "1"})
+    try:
+        result = reload_model_components("admin endpoint")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Reload failed, current model kept: {e}")
+    return {"success": True, "model_path": current_model.model_path, "reloads": result}
+
 # -------------------------------
 # Health check
 # -------------------------------
@@ -739,16 +1498,78 @@ def root():
         "endpoints": {
             "/predict-availability": "Predict availability for specific parking spot",
             "/recommend-parking": "Get top 3 parking recommendations",
-            "/predict": "Legacy prediction endpoint"
+            "/forecast-availability": "Availability for one area over a range of arrival times",
+            "/predict": "Legacy prediction endpoint",
+            "/nearest-parking": "Nearest parking areas to a point",
+            "/update-realtime-data": "Push one area's occupancy from the CV system",
+            "/update-cv-data": "Push the status of several areas from the CV system",
+            "/realtime-data/{area_id}": "Occupancy updates buffered for an area",
+            "/metrics": "Stage latencies and counters in Prometheus text format",
+            "/admin/reload": "Reload the model files without a restart"
         }
     }
 
 @app.get("/health")
 def health_check():
+    bundle = current_model
     return {
         "status": "healthy",
-        "model_loaded": xgb_model is not None,
-        "encoders_loaded": encoders is not None,
-        "gmaps_available": gmaps is not None,
+        "model_loaded": bundle.model is not None,
+        "encoders_loaded": bundle.encoders is not None,
+        "model_path": bundle.model_path,
+        "inference_backend": bundle.backend.info if bundle.backend else None,
+        "encoder_stats": {col: table.stats() for col, table in bundle.encoders.items()} if bundle.encoders else {},
+        "reloads": reload_state,
+        "shadow": bundle.shadow.stats() if bundle.shadow else None,
+        "backend_api": backend_client.stats(),
+        "live_slot_cache": live_slot_cache.stats(),
+        "inference": inference_executor.stats(),
+        "coalescing": prediction_flights.stats(),
+        "pushed_occupancy": occupancy_buffer.stats(),
+        "metrics": metrics.snapshot(),
+        "gmaps_available": get_gmaps_client() is not None,
         "parking_areas": len(PARKING_AREAS)
-    }
\ No newline at end of file
+    }
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Per-stage latency histograms and counters for Prometheus (404 with PREDICTION_METRICS=0)"""
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    cache, pushed, flights = live_slot_cache.stats(), occupancy_buffer.stats(), prediction_flights.stats()
+    histograms = [
+        ("backend_api_latency_ms", {}, backend_client.latency_ms),
+        ("inference_queue_wait_ms", {}, inference_executor.queue_wait_ms),
+        ("inference_run_ms", {}, inference_executor.run_ms),
+    ]
+    histograms += [("inference_stage_ms", {"stage": stage}, histogram)
+                   for stage, histogram in sorted(inference_executor.stages.items())]
+    # Totals since start-up (exported with a _total suffix), then current values
+    counters = [
+        ("live_slot_cache_requests", {"result": "hit"}, cache["hits"]),
+        ("live_slot_cache_requests", {"result": "stale_hit"}, cache["stale_hits"]),
+        ("live_slot_cache_requests", {"result": "miss"}, cache["misses"]),
+        ("inference_rejected", {}, inference_executor.rejected),
+        ("coalesced_requests", {"result": "computed"}, flights["calls"]),
+        ("coalesced_requests", {"result": "shared"}, flights["shared"]),
+        ("pushed_occupancy_updates", {}, pushed["updates"]),
+    ]
+    gauges = [
+        ("live_slot_cache_entries", {}, cache["entries"]),
+        ("inference_pending", {}, inference_executor.pending),
+        ("coalescing_inflight", {}, flights["inflight"]),
+        ("pushed_occupancy_areas", {}, pushed["areas"]),
+        ("model_loaded", {}, current_model.model is not None),
+    ]
+    return PlainTextResponse(metrics.render(histograms, gauges, counters), media_type="text/plain; version=0.0.4")
+
+@app.get("/ready")
+def readiness_check():
+    """200 once model loading has finished (the process itself is up as soon as /health answers)"""
+    body = {
+        "ready": model_ready.is_set(),
+        "model_loaded": current_model.model is not None,
+        **model_state,
+        "uptime_seconds": round(time.time() - model_state["process_started_at"], 3)
+    }
+    return JSONResponse(body, status_code=200 if model_ready.is_set() else 503)
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+Single-flight execution of identical concurrent requests
+
+At peak, many users at the same place ask about the same parking area and
+arrival time within a few milliseconds of each other, and each request runs
+the whole prediction pipeline again. SingleFlight keeps one in-flight call
+per key: the first caller starts it, callers that arrive with the same key
+while it runs await the same call and get the same result (or exception).
+Nothing is kept once the call finishes; it is not a cache.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """One in-flight call per key, shared by concurrent callers, for one event loop"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[T]], *args) -> T:
+        """Await fn(*args), or the call already running for key"""
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn(*args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self.shared += 1
+        # shield: a caller that goes away must not cancel a call others wait for
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved, even if every caller went away
+
+    def stats(self):
+        return {
+            "inflight": len(self._inflight),
+            "calls": self.calls,
+            "shared": self.shared,
+        }
@@ -0,0 +1,143 @@
+"""
+Per-key snapshot cache for live occupancy data
+
+CV occupancy updates reach the backend every 30-120 s, so fetching them for
+every prediction mostly re-reads the same numbers. SnapshotCache keeps the
+last snapshot per parking area:
+
+- younger than ttl: served from memory
+- older, but within max_stale past the ttl: served as is while one
+  background fetch refreshes it (stale-while-revalidate)
+- missing or older than that: fetched, and concurrent requests for the
+  same key wait for the one fetch already in flight (single-flight)
+
+With ttl 0 nothing is served from memory, stale or not: every call fetches
+(still single-flight), whatever max_stale is.
+
+Every value comes back with its age in seconds and how it was served
+("cached", "stale" or "fetched"), so callers can report how old the data
+they used is and where it came from.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Tuple
+
+# fetch(keys) -> {key: value}; keys it leaves out are cached as None
+Fetcher = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+
+class SnapshotCache:
+    """TTL cache with stale-while-revalidate and single-flight fetches, for one event loop"""
+
+    def __init__(self, ttl: float = 30.0, max_stale: float = 120.0):
+        """
+        Args:
+            ttl: Seconds a snapshot is served without refreshing it (0: always fetch)
+            max_stale: Further seconds a snapshot may be served while it is
+                refreshed in the background; after that callers wait for a fetch
+        """
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}  # key -> (value, fetched_at)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.fetches = 0
+        self.errors = 0
+        self.last_error = None
+
+    async def get_many(self, keys: List[Hashable], fetch: Fetcher) -> Dict[Hashable, Tuple[Any, float, str]]:
+        """
+        {key: (value, age_seconds, served)} for each key, fetching what is missing
+
+        served is "cached" (younger than ttl), "stale" (served while it is
+        refreshed) or "fetched" (waited for a fetch, possibly another caller's).
+
+        Raises whatever fetch raised if a missing key could not be fetched;
+        a failed background refresh only counts an error and keeps the old value.
+        """
+        now = time.monotonic()
+        result = {}
+        stale, missing = [], []
+        for key in dict.fromkeys(keys):
+            entry = self._entries.get(key) if self.ttl > 0 else None
+            age = now - entry[1] if entry else None
+            if entry and age <= self.ttl:
+                self.hits += 1
+                result[key] = (entry[0], age, 'cached')
+            elif entry and age <= self.ttl + self.max_stale:
+                self.stale_hits += 1
+                result[key] = (entry[0], age, 'stale')
+                stale.append(key)
+            else:
+                self.misses += 1
+                missing.append(key)
+
+        refresh = [key for key in stale if key not in self._inflight]
+        if refresh:
+            self._start_fetch(refresh, fetch).add_done_callback(self._background_done)
+
+        if missing:
+            to_fetch = [key for key in missing if key not in self._inflight]
+            self.coalesced += len(missing) - len(to_fetch)
+            if to_fetch:
+                self._start_fetch(to_fetch, fetch)
+            # Shielded for the same reason as in SingleFlight.do (single_flight.py)
+            tasks = {key: self._inflight[key] for key in missing}
+            for task in set(tasks.values()):
+                await asyncio.shield(task)
+            for key in missing:
+                value, fetched_at = self._entries[key]
+                result[key] = (value, time.monotonic() - fetched_at, 'fetched')
+        return result
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        return {
+            'ttl_seconds': self.ttl,
+            'max_stale_seconds': self.max_stale,
+            'entries': len(self._entries),
+            'oldest_age_seconds': round(max((now - fetched_at for _, fetched_at in self._entries.values()), default=0.0), 1),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'fetches': self.fetches,
+            'inflight': len(self._inflight),
+            'errors': self.errors,
+            'last_error': self.last_error,
+        }
+
+    def _start_fetch(self, keys: List[Hashable], fetch: Fetcher) -> asyncio.Task:
+        task = asyncio.ensure_future(self._fetch(keys, fetch))
+        for key in keys:
+            self._inflight[key] = task
+        return task
+
+    async def _fetch(self, keys: List[Hashable], fetch: Fetcher):
+        self.fetches += 1
+        try:
+            values = await fetch(keys)
+            fetched_at = time.monotonic()
+            for key in keys:
+                self._entries[key] = (values.get(key), fetched_at)
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e)
+            raise
+        finally:
+            for key in keys:
+                if self._inflight.get(key) is asyncio.current_task():
+                    del self._inflight[key]
+
+    @staticmethod
+    def _background_done(task: asyncio.Task):
+        # Already counted in _fetch; retrieve it so asyncio does not log it as unhandled
+        if not task.cancelled():
+            task.exception()
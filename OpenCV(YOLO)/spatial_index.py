@@ -0,0 +1,103 @@
+"""
+Grid index over parking area coordinates for radius and nearest-k queries
+
+Areas are bucketed into cells of cell_deg x cell_deg degrees when the index
+is built. A query only computes distances to the areas in the cells its
+search circle overlaps, so the cost follows the number of nearby areas
+instead of the number of areas in the city. Distances are exact haversine
+distances in metres; the grid only decides which areas are looked at.
+"""
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from geodesic import EARTH_RADIUS_M, central_angle
+
+
+class AreaIndex:
+    """Immutable spatial index over {area_id: {"lat": .., "lng": .., ...}}"""
+
+    def __init__(self, areas: Dict[str, Dict], cell_deg: float = 0.01):
+        """
+        Args:
+            areas: Area records by id; only "lat" and "lng" are read
+            cell_deg: Grid cell size in degrees (0.01 is about 1.1 km north-south)
+        """
+        self.cell_deg = cell_deg
+        self.ids = list(areas)
+        lats = np.array([areas[area_id]["lat"] for area_id in self.ids], dtype=np.float64)
+        lngs = np.array([areas[area_id]["lng"] for area_id in self.ids], dtype=np.float64)
+        self._lats = np.radians(lats)
+        self._lngs = np.radians(lngs)
+        self._columns = int(math.ceil(360 / cell_deg))
+
+        rows, cols = self._cell(lats, lngs)
+        cells: Dict[Tuple[int, int], List[int]] = {}
+        for i, key in enumerate(zip(rows.tolist(), cols.tolist())):
+            cells.setdefault(key, []).append(i)
+        self._cells = {key: np.array(members, dtype=np.intp) for key, members in cells.items()}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def within(self, lat: float, lng: float, radius_m: float) -> List[Tuple[str, float]]:
+        """(area_id, metres) for every area within radius_m of the point, in the order the areas were given"""
+        indices, distances = self._within(lat, lng, radius_m)
+        order = np.argsort(indices, kind="stable")
+        return [(self.ids[i], float(d)) for i, d in zip(indices[order].tolist(), distances[order].tolist())]
+
+    def nearest(self, lat: float, lng: float, k: int, max_distance_m: float = math.inf) -> List[Tuple[str, float]]:
+        """(area_id, metres) for the k areas nearest to the point, nearest first"""
+        k = min(k, len(self.ids))
+        if k <= 0:
+            return []
+        # Grow the search circle until it holds k areas: every area outside it is
+        # farther than every area inside, so the k nearest are among those found
+        radius = min(self.cell_deg * 111_000, max_distance_m)
+        while True:
+            indices, distances = self._within(lat, lng, radius)
+            if len(indices) >= k or radius >= min(max_distance_m, math.pi * EARTH_RADIUS_M):
+                break
+            radius = min(radius * 2, max_distance_m)
+        order = np.lexsort((indices, distances))[:k]
+        return [(self.ids[i], float(d)) for i, d in zip(indices[order].tolist(), distances[order].tolist())]
+
+    def _cell(self, lats, lngs):
+        rows = np.floor((np.asarray(lats) + 90) / self.cell_deg).astype(np.int64)
+        cols = np.floor((np.asarray(lngs) + 180) / self.cell_deg).astype(np.int64) % self._columns
+        return rows, cols
+
+    def _candidates(self, lat: float, lng: float, radius_m: float) -> np.ndarray:
+        dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+        max_lat = min(90.0, abs(lat) + dlat)
+        cos_lat = math.cos(math.radians(max_lat))
+        if max_lat >= 89.9 or dlat >= 45:
+            return np.arange(len(self.ids))
+        dlng = min(180.0, dlat / cos_lat)
+
+        rows = range(int(math.floor((lat - dlat + 90) / self.cell_deg)),
+                     int(math.floor((lat + dlat + 90) / self.cell_deg)) + 1)
+        col_lo = int(math.floor((lng - dlng + 180) / self.cell_deg))
+        col_hi = int(math.floor((lng + dlng + 180) / self.cell_deg))
+        cols = [c % self._columns for c in range(col_lo, min(col_hi, col_lo + self._columns - 1) + 1)]
+
+        if len(rows) * len(cols) > len(self._cells):
+            # Circle spans more cells than are occupied: walk the occupied ones instead
+            col_set = set(cols)
+            members = [m for (r, c), m in self._cells.items() if r in rows and c in col_set]
+        else:
+            members = []
+            for r in rows:
+                for c in cols:
+                    cell = self._cells.get((r, c))
+                    if cell is not None:
+                        members.append(cell)
+        return np.concatenate(members) if members else np.empty(0, dtype=np.intp)
+
+    def _within(self, lat: float, lng: float, radius_m: float):
+        candidates = self._candidates(lat, lng, radius_m)
+        distances = EARTH_RADIUS_M * central_angle(math.radians(lat), math.radians(lng),
+                                                   self._lats[candidates], self._lngs[candidates])
+        keep = distances <= radius_m
+        return candidates[keep], distances[keep]
@@ -4,13 +4,14 @@ Test script for the CV number plate scanner integration
 This script tests the complete flow: detection → backend → database
 """
 
+import os
 import requests
 import json
 import time
 from datetime import datetime
 
 # Configuration
-BACKEND_URL = "http://localhost:3000"
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:3000")
 TEST_PARKING_SPOT_ID = "d38431ce-1925-4d7b-abb7-82478e1b9684"  # PICT Pune Smart Parking
 
 def test_backend_health():
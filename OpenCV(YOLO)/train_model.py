@@ -1,17 +1,17 @@
 import pandas as pd
 import numpy as np
-import random
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
 import pickle
+import sys
 from sklearn.preprocessing import LabelEncoder
 import xgboost as xgb
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, r2_score
+from parking_common.encoding import compile_encoders, save_encoder_table
 
 # Set random seeds for reproducibility
 np.random.seed(42)
-random.seed(42)
 
 # Major parking destinations in Pune area
 PARKING_AREAS = {
@@ -29,179 +29,157 @@ PUNE_WEATHER_PATTERNS = {
     "post_monsoon": {"months": [10, 11], "conditions": ["Clear", "Cloudy"], "temp_range": (20, 35)}
 }
 
-def generate_realistic_parking_data(num_samples=15000):
-    """Generate realistic parking data for major Pune destinations"""
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+VEHICLE_TYPES = ["car", "motorcycle", "scooter", "bicycle"]
+VEHICLE_WEIGHTS = [0.4, 0.3, 0.25, 0.05]
+
+def generate_realistic_parking_data(num_samples=15000, seed=42, chunk_size=1_000_000):
+    """
+    Generate realistic parking data for major Pune destinations
+    
+    Every column is drawn for a whole chunk of rows at once and the hour,
+    weekend, holiday, weather, event and distance effects are applied as
+    masked array operations, so tens of millions of rows take seconds.
+    The same seed and chunk_size give the same data.
+    """
+    rng = np.random.default_rng(seed)
+    chunks = []
+    for start in range(0, num_samples, chunk_size):
+        chunks.append(_generate_parking_chunk(rng, min(chunk_size, num_samples - start)))
+        print(f"Generated {start + len(chunks[-1])} samples...")
+    if not chunks:
+        return _generate_parking_chunk(rng, 0)
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+def _generate_parking_chunk(rng, n):
+    """n rows of generate_realistic_parking_data, as a DataFrame"""
+    area_names = list(PARKING_AREAS)
+    area_info = [PARKING_AREAS[name] for name in area_names]
+    seasons = list(PUNE_WEATHER_PATTERNS.values())
+    conditions = sorted({c for season in seasons for c in season["conditions"]})
     
-    data = []
+    # Season index and its weather for each calendar month (index 1-12)
+    month_season = np.zeros(13, dtype=np.int64)
+    for index, season in enumerate(seasons):
+        month_season[season["months"]] = index
+    season_conditions = np.array([[conditions.index(c) for c in season["conditions"]] for season in seasons])
+    temp_low = np.array([season["temp_range"][0] for season in seasons], dtype=np.float64)
+    temp_high = np.array([season["temp_range"][1] for season in seasons], dtype=np.float64)
+    
+    # Random date and time over past 2 years
     start_date = datetime(2023, 1, 1)
+    days = rng.integers(0, 731, n)
+    hour = rng.integers(6, 23, n)  # College hours 6 AM to 10 PM
+    minute = rng.integers(0, 60, n)
+    
+    # Time features
+    time_of_day = hour + minute / 60
+    weekday = (start_date.weekday() + days) % 7
+    month = (np.datetime64(start_date.date(), "D") + days).astype("datetime64[M]").astype(np.int64) % 12 + 1
+    is_weekend = weekday >= 5
+    is_holiday = rng.random(n) < 0.05  # 5% chance of holiday
+    
+    # Location features
+    area = rng.integers(0, len(area_names), n)
+    total_slots = np.array([info["total_slots"] for info in area_info])[area]
+    base_occupancy = np.array([info["base_occupancy"] for info in area_info])[area]
+    popularity = np.array([info["popularity"] for info in area_info])[area]
+    
+    # Weather based on month
+    season = month_season[month]
+    weather = season_conditions[season, rng.integers(0, season_conditions.shape[1], n)]
+    rainy = weather == conditions.index("Rainy")
+    temperature_c = rng.uniform(temp_low[season], temp_high[season])
+    
+    # Traffic patterns
+    morning_rush = (8 <= hour) & (hour <= 10)
+    evening_rush = (17 <= hour) & (hour <= 19)
+    traffic_base = np.select(
+        [morning_rush | evening_rush, (11 <= hour) & (hour <= 16), (hour < 7) | (hour > 20)],
+        [0.8, 0.6, 0.2],  # Peak, normal college hours, off hours
+        0.3
+    )
+    
+    # Add randomness and weather effect (more traffic in rain)
+    traffic_density = np.clip(traffic_base + rng.uniform(-0.2, 0.2, n) + 0.3 * rainy, 0.1, 1.0)
+    
+    # Distance simulation (PICT students/staff coming from different areas of Pune)
+    distance_from_user_km = rng.uniform(0.5, 25.0, n)  # 0.5km to 25km
+    
+    vehicle_type = rng.choice(len(VEHICLE_TYPES), size=n, p=VEHICLE_WEIGHTS)
+    event_nearby = rng.random(n) < 0.1  # 10% chance of event
     
-    for i in range(num_samples):
-        # Random date and time over past 2 years
-        random_date = start_date + timedelta(days=random.randint(0, 730))
-        hour = random.randint(6, 22)  # College hours 6 AM to 10 PM
-        minute = random.randint(0, 59)
-        
-        # Time features
-        time_of_day = hour + minute / 60
-        day_of_week = random_date.strftime("%A")
-        is_weekend = 1 if random_date.weekday() >= 5 else 0
-        is_holiday = 1 if random.random() < 0.05 else 0  # 5% chance of holiday
-        
-        # Location features
-        parking_area = random.choice(list(PARKING_AREAS.keys()))
-        area_info = PARKING_AREAS[parking_area]
-        
-        # Weather based on month
-        month = random_date.month
-        season = None
-        for season_name, season_info in PUNE_WEATHER_PATTERNS.items():
-            if month in season_info["months"]:
-                season = season_info
-                break
-        
-        weather_condition = random.choice(season["conditions"])
-        temperature_c = random.uniform(season["temp_range"][0], season["temp_range"][1])
-        
-        # Traffic patterns
-        traffic_base = 0.3
-        if 8 <= hour <= 10 or 17 <= hour <= 19:  # Peak hours
-            traffic_base = 0.8
-        elif 11 <= hour <= 16:  # Normal college hours
-            traffic_base = 0.6
-        elif hour < 7 or hour > 20:  # Off hours
-            traffic_base = 0.2
-        
-        # Add randomness and weather effect
-        traffic_density = traffic_base + random.uniform(-0.2, 0.2)
-        if weather_condition == "Rainy":
-            traffic_density += 0.3  # More traffic in rain
-        traffic_density = max(0.1, min(1.0, traffic_density))
-        
-        # Distance simulation (PICT students/staff coming from different areas of Pune)
-        distance_from_user_km = random.uniform(0.5, 25.0)  # 0.5km to 25km
-        
-        # Vehicle type
-        vehicle_type = random.choices(
-            ["car", "motorcycle", "scooter", "bicycle"],
-            weights=[0.4, 0.3, 0.25, 0.05]
-        )[0]
-        
-        # Event simulation
-        event_nearby = 1 if random.random() < 0.1 else 0  # 10% chance of event
-        
-        # Base occupancy patterns
-        base_occupancy = area_info["base_occupancy"]
-        
-        # Time-based occupancy adjustments
-        if 8 <= hour <= 10:  # Morning rush (students arriving)
-            occupancy_multiplier = 1.4
-        elif 10 <= hour <= 16:  # Peak college hours
-            occupancy_multiplier = 1.2
-        elif 17 <= hour <= 19:  # Evening rush (students leaving)
-            occupancy_multiplier = 0.8  # People leaving, so less occupancy
-        elif hour < 8 or hour > 19:  # Off hours
-            occupancy_multiplier = 0.3
-        else:
-            occupancy_multiplier = 1.0
-        
-        # Weekend adjustments
-        if is_weekend:
-            occupancy_multiplier *= 0.4  # Much less crowded on weekends
-        
-        # Holiday adjustments
-        if is_holiday:
-            occupancy_multiplier *= 0.2  # Very less crowded on holidays
-        
-        # Weather effects
-        if weather_condition == "Rainy":
-            occupancy_multiplier *= 1.2  # More people drive instead of walking
-        
-        # Event effects
-        if event_nearby:
-            occupancy_multiplier *= 1.5  # Events increase parking demand
-        
-        # Distance effect on area popularity
-        if distance_from_user_km < 2:  # Nearby users prefer convenient spots
-            occupancy_multiplier *= area_info["popularity"]
-        
-        # Calculate final occupancy
-        final_occupancy = min(0.98, max(0.05, base_occupancy * occupancy_multiplier + random.uniform(-0.1, 0.1)))
-        
-        # Slot calculations
-        total_slots = area_info["total_slots"]
-        occupied_slots = int(final_occupancy * total_slots)
-        free_slots = total_slots - occupied_slots
-        
-        # Future predictions (slots that will be free in 15 min)
-        turnover_rate = 0.1 + random.uniform(-0.05, 0.05)  # 10% turnover every 15 min
-        slots_free_in_15min = min(total_slots, free_slots + int(occupied_slots * turnover_rate))
-        future_bookings_15min = max(0, int(free_slots * 0.3 * random.uniform(0.5, 1.5)))
-        
-        # Pricing (simple dynamic pricing)
-        base_price = 50.0  # Base price in rupees
-        dynamic_multiplier = 1.0
-        
-        if final_occupancy > 0.8:  # High occupancy
-            dynamic_multiplier = 1.5
-        elif final_occupancy > 0.6:
-            dynamic_multiplier = 1.2
-        elif final_occupancy < 0.3:  # Low occupancy
-            dynamic_multiplier = 0.8
-        
-        if weather_condition == "Rainy":
-            dynamic_multiplier *= 1.2
-        
-        if event_nearby:
-            dynamic_multiplier *= 1.3
-        
-        final_price = base_price * dynamic_multiplier
-        
-        # Target variable: availability when user reaches (0-1 scale)
-        # This is what we want to predict
-        travel_time_minutes = distance_from_user_km * 3 + random.uniform(-5, 5)  # Rough estimate
-        
-        # Predict availability after travel time
-        future_occupancy_change = random.uniform(-0.15, 0.15)  # Natural fluctuation
-        if 8 <= hour <= 10:  # Morning rush - occupancy increases
-            future_occupancy_change += 0.1
-        elif 17 <= hour <= 19:  # Evening - occupancy decreases
-            future_occupancy_change -= 0.1
-        
-        predicted_occupancy = max(0.02, min(0.98, final_occupancy + future_occupancy_change))
-        availability_score = 1 - predicted_occupancy  # Convert occupancy to availability
-        
-        # Create data point
-        data_point = {
-            "city": "Pune",
-            "area": area_info["area"],  # Use the actual area (Kharadi, Hadapsar, etc.)
-            "parking_lot_name": parking_area,
-            "day_of_week": day_of_week,
-            "time_of_day": round(time_of_day, 2),
-            "is_weekend": is_weekend,
-            "is_holiday": is_holiday,
-            "weather_condition": weather_condition,
-            "temperature_c": round(temperature_c, 1),
-            "traffic_density": round(traffic_density, 3),
-            "distance_from_user_km": round(distance_from_user_km, 2),
-            "vehicle_type": vehicle_type,
-            "base_price": base_price,
-            "dynamic_multiplier": round(dynamic_multiplier, 2),
-            "final_price": round(final_price, 2),
-            "event_nearby": event_nearby,
-            "total_slots": total_slots,
-            "occupied_slots": occupied_slots,
-            "free_slots": free_slots,
-            "slots_free_in_15min": slots_free_in_15min,
-            "future_bookings_15min": future_bookings_15min,
-            "availability_score": round(availability_score, 4)  # Target variable
-        }
-        
-        data.append(data_point)
-        
-        if i % 1000 == 0:
-            print(f"Generated {i} samples...")
-    
-    return pd.DataFrame(data)
+    # Time-based occupancy adjustments: morning rush (students arriving),
+    # peak college hours, evening rush (students leaving), off hours
+    occupancy_multiplier = np.select(
+        [morning_rush, (10 <= hour) & (hour <= 16), evening_rush, (hour < 8) | (hour > 19)],
+        [1.4, 1.2, 0.8, 0.3],
+        1.0
+    )
+    occupancy_multiplier *= np.where(is_weekend, 0.4, 1.0)  # Much less crowded on weekends
+    occupancy_multiplier *= np.where(is_holiday, 0.2, 1.0)  # Very less crowded on holidays
+    occupancy_multiplier *= np.where(rainy, 1.2, 1.0)  # More people drive instead of walking
+    occupancy_multiplier *= np.where(event_nearby, 1.5, 1.0)  # Events increase parking demand
+    # Nearby users prefer convenient spots
+    occupancy_multiplier *= np.where(distance_from_user_km < 2, popularity, 1.0)
+    
+    # Calculate final occupancy
+    final_occupancy = np.clip(base_occupancy * occupancy_multiplier + rng.uniform(-0.1, 0.1, n), 0.05, 0.98)
+    
+    # Slot calculations
+    occupied_slots = (final_occupancy * total_slots).astype(np.int64)
+    free_slots = total_slots - occupied_slots
+    
+    # Future predictions (slots that will be free in 15 min)
+    turnover_rate = 0.1 + rng.uniform(-0.05, 0.05, n)  # 10% turnover every 15 min
+    slots_free_in_15min = np.minimum(total_slots, free_slots + (occupied_slots * turnover_rate).astype(np.int64))
+    future_bookings_15min = np.maximum(0, (free_slots * 0.3 * rng.uniform(0.5, 1.5, n)).astype(np.int64))
+    
+    # Pricing (simple dynamic pricing): high, medium and low occupancy
+    base_price = 50.0  # Base price in rupees
+    dynamic_multiplier = np.select(
+        [final_occupancy > 0.8, final_occupancy > 0.6, final_occupancy < 0.3],
+        [1.5, 1.2, 0.8],
+        1.0
+    )
+    dynamic_multiplier *= np.where(rainy, 1.2, 1.0)
+    dynamic_multiplier *= np.where(event_nearby, 1.3, 1.0)
+    final_price = base_price * dynamic_multiplier
+    
+    # Target variable: availability when user reaches (0-1 scale), after
+    # natural fluctuation during the trip; rising in the morning rush and
+    # falling in the evening
+    future_occupancy_change = rng.uniform(-0.15, 0.15, n) + 0.1 * morning_rush - 0.1 * evening_rush
+    predicted_occupancy = np.clip(final_occupancy + future_occupancy_change, 0.02, 0.98)
+    availability_score = 1 - predicted_occupancy
+    
+    area_labels = sorted({info["area"] for info in area_info})
+    area_codes = np.array([area_labels.index(info["area"]) for info in area_info])[area]
+    
+    return pd.DataFrame({
+        "city": pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), ["Pune"]),
+        "area": pd.Categorical.from_codes(area_codes, area_labels),  # The actual area (Kharadi, Hadapsar, etc.)
+        "parking_lot_name": pd.Categorical.from_codes(area, area_names),
+        "day_of_week": pd.Categorical.from_codes(weekday, WEEKDAYS),
+        "time_of_day": np.round(time_of_day, 2),
+        "is_weekend": is_weekend.astype(np.int64),
+        "is_holiday": is_holiday.astype(np.int64),
+        "weather_condition": pd.Categorical.from_codes(weather, conditions),
+        "temperature_c": np.round(temperature_c, 1),
+        "traffic_density": np.round(traffic_density, 3),
+        "distance_from_user_km": np.round(distance_from_user_km, 2),
+        "vehicle_type": pd.Categorical.from_codes(vehicle_type, VEHICLE_TYPES),
+        "base_price": np.full(n, base_price),
+        "dynamic_multiplier": np.round(dynamic_multiplier, 2),
+        "final_price": np.round(final_price, 2),
+        "event_nearby": event_nearby.astype(np.int64),
+        "total_slots": total_slots.astype(np.int64),
+        "occupied_slots": occupied_slots,
+        "free_slots": free_slots,
+        "slots_free_in_15min": slots_free_in_15min,
+        "future_bookings_15min": future_bookings_15min,
+        "availability_score": np.round(availability_score, 4)  # Target variable
+    })
 
 def train_parking_prediction_model(df):
     """Train XGBoost model with generated data"""
@@ -274,6 +252,7 @@ def train_parking_prediction_model(df):
     
     # Save model
     model.save_model('xgb_parking_dynamic.json')
+    export_startup_artifacts(model, encoders)
     print("Model saved successfully!")
     
     # Feature importance
@@ -287,14 +266,28 @@ def train_parking_prediction_model(df):
     
     return model, encoders
 
-def main():
+def export_startup_artifacts(model, encoders):
+    """Write the binary booster and flat encoder table that prediction.py loads fastest"""
+    model.save_model('xgb_parking_dynamic.ubj')
+    save_encoder_table('categorical_encoders.json', compile_encoders(encoders))
+
+def export_existing_model():
+    """Create the startup artifacts for an already trained model"""
+    model = xgb.XGBRegressor()
+    model.load_model('xgb_parking_dynamic.json')
+    with open('categorical_encoders.pkl', 'rb') as f:
+        encoders = pickle.load(f)
+    export_startup_artifacts(model, encoders)
+    print("Exported xgb_parking_dynamic.ubj and categorical_encoders.json")
+
+def main(num_samples=15000):
     """Generate data and train model"""
     print("Starting PICT Parking Prediction Model Training...")
     print("=" * 50)
     
     # Generate training data
     print("Generating realistic parking data...")
-    df = generate_realistic_parking_data(15000)
+    df = generate_realistic_parking_data(num_samples)
     
     print(f"Generated dataset shape: {df.shape}")
     print("\nDataset info:")
@@ -315,6 +308,7 @@ def main():
     print("Training completed successfully!")
     print("Files created:")
     print("- xgb_parking_dynamic.json (trained model)")
+    print("- xgb_parking_dynamic.ubj, categorical_encoders.json (startup-optimized copies)")
     print("- categorical_encoders.pkl (label encoders)")
     print("- dynamic_features.json (feature order)")
     print("- pict_parking_training_data.csv (training data)")
@@ -322,4 +316,9 @@ def main():
     return model, encoders, df
 
 if __name__ == "__main__":
-    model, encoders, data = main()
\ No newline at end of file
+    if "--export-only" in sys.argv:
+        export_existing_model()
+    elif "--samples" in sys.argv:
+        model, encoders, data = main(int(sys.argv[sys.argv.index("--samples") + 1]))
+    else:
+        model, encoders, data = main()
\ No newline at end of file
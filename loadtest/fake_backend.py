@@ -0,0 +1,182 @@
+"""
+Local stand-in for the Node backend endpoints the Python services call
+
+Serves, in memory:
+    GET  /health
+    GET  /api/parking-spot/nearby?latitude=&longitude=&radius=   (radius in km)
+    POST /api/cv/alpr        ENTRY takes a slot at the spot, EXIT frees one
+    GET  /api/cv/logs?limit=
+    GET  /api/cv/activity?limit=
+
+with the response shapes of backend/src/modules (success/data envelopes,
+camelCase fields). ALPR events change availableSpots, so predictions that
+read live slot data see occupancy move while a load test runs. An optional
+delay simulates backend processing time.
+
+Standalone, for test_integration.py or the ALPR scripts:
+    python loadtest/fake_backend.py [--port 3000] [--delay-ms 0]
+"""
+import argparse
+import asyncio
+import math
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from aiohttp import web
+
+# One backend spot per prediction.py area, at the area's search centre
+SPOTS = [
+    {'id': 'd38431ce-1925-4d7b-abb7-82478e1b9684', 'name': 'PICT Pune Smart Parking',
+     'latitude': 18.5204, 'longitude': 73.8567, 'totalSpots': 500},
+    {'id': '5b0e7c1a-3f52-4a8e-9d7b-1c2f3e4a5b6c', 'name': 'Amanora Mall Parking',
+     'latitude': 18.5018, 'longitude': 73.9344, 'totalSpots': 800},
+    {'id': '8c1d2e3f-4a5b-4c6d-8e7f-9a0b1c2d3e4f', 'name': 'Seasons Mall Parking',
+     'latitude': 18.5362, 'longitude': 73.8982, 'totalSpots': 600},
+    {'id': '1a2b3c4d-5e6f-4a7b-8c9d-0e1f2a3b4c5d', 'name': 'Kharadi IT Park Parking',
+     'latitude': 18.5570, 'longitude': 73.9090, 'totalSpots': 400},
+    {'id': '9f8e7d6c-5b4a-4392-8170-6f5e4d3c2b1a', 'name': 'EON IT Park Parking',
+     'latitude': 18.5600, 'longitude': 73.9120, 'totalSpots': 350},
+]
+
+ALPR_FIELDS = ('vehicleNumber', 'eventType', 'confidence', 'cameraId', 'parkingSpotId')
+
+
+def _distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 6371 * 2 * math.asin(math.sqrt(a))
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+class FakeBackend:
+    """Spots, ALPR log and per-route request counters behind an aiohttp app"""
+
+    def __init__(self, delay_ms: float = 0.0, initial_occupancy: float = 0.6, log_size: int = 1000):
+        """
+        Args:
+            delay_ms: Added to every API response, to simulate backend processing time
+            initial_occupancy: Share of each spot's slots taken at start
+            log_size: ALPR events kept for /api/cv/logs
+        """
+        self.delay_ms = delay_ms
+        self.spots: Dict[str, Dict] = {}
+        for spot in SPOTS:
+            available = spot['totalSpots'] - int(spot['totalSpots'] * initial_occupancy)
+            self.spots[spot['id']] = dict(spot, availableSpots=available, lastUpdated=_now())
+        self.parked: Dict[str, str] = {}  # vehicle number -> spot id
+        self.logs: deque = deque(maxlen=log_size)
+        self.requests: Dict[str, int] = {}
+        self.peers = set()  # distinct client (host, port): TCP connections opened to the backend
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/health', self.health)
+        app.router.add_get('/api/parking-spot/nearby', self.nearby)
+        app.router.add_post('/api/cv/alpr', self.alpr)
+        app.router.add_get('/api/cv/logs', self.cv_logs)
+        app.router.add_get('/api/cv/activity', self.cv_activity)
+        return app
+
+    async def _enter(self, request: web.Request, route: str):
+        self.requests[route] = self.requests.get(route, 0) + 1
+        self.peers.add(request.transport.get_extra_info('peername'))
+        if self.delay_ms:
+            await asyncio.sleep(self.delay_ms / 1000)
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({'status': 'ok', 'fake': True})
+
+    async def nearby(self, request: web.Request) -> web.Response:
+        await self._enter(request, 'nearby')
+        try:
+            lat = float(request.query['latitude'])
+            lng = float(request.query['longitude'])
+            radius = float(request.query.get('radius', 10))
+        except (KeyError, ValueError):
+            return web.json_response({'success': False, 'message': 'Latitude and longitude are required'},
+                                     status=400)
+        spots = [spot for spot in self.spots.values()
+                 if _distance_km(lat, lng, spot['latitude'], spot['longitude']) <= radius]
+        return web.json_response({'success': True, 'data': spots})
+
+    async def alpr(self, request: web.Request) -> web.Response:
+        await self._enter(request, 'alpr')
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        missing = [field for field in ALPR_FIELDS if not isinstance(body, dict) or field not in body]
+        if missing or body['eventType'] not in ('ENTRY', 'EXIT'):
+            return web.json_response({'success': False, 'message': f'Invalid ALPR event: missing {missing}'},
+                                     status=400)
+        spot = self.spots.get(body['parkingSpotId'])
+        if spot is None:
+            return web.json_response({'success': False, 'message': 'Parking spot not found'}, status=404)
+
+        vehicle, event_type = body['vehicleNumber'], body['eventType']
+        if event_type == 'ENTRY' and vehicle not in self.parked and spot['availableSpots'] > 0:
+            spot['availableSpots'] -= 1
+            self.parked[vehicle] = spot['id']
+        elif event_type == 'EXIT' and self.parked.pop(vehicle, None) == spot['id']:
+            spot['availableSpots'] += 1
+        spot['lastUpdated'] = _now()
+
+        log = {'id': str(uuid.uuid4()), 'vehicleNumber': vehicle, 'eventType': event_type,
+               'confidence': body['confidence'], 'cameraId': body['cameraId'],
+               'parkingSpotId': spot['id'], 'processed': True, 'timestamp': spot['lastUpdated']}
+        self.logs.append(log)
+        return web.json_response({
+            'success': True,
+            'data': {
+                'success': True,
+                'cvLogId': log['id'],
+                'eventType': event_type,
+                'vehicleNumber': vehicle,
+                'message': f'{event_type} processed successfully for vehicle {vehicle}',
+            },
+        })
+
+    async def cv_logs(self, request: web.Request) -> web.Response:
+        await self._enter(request, 'logs')
+        logs = list(self.logs)[-int(request.query.get('limit', 50)):][::-1]
+        return web.json_response({'success': True, 'data': logs, 'count': len(logs)})
+
+    async def cv_activity(self, request: web.Request) -> web.Response:
+        await self._enter(request, 'activity')
+        logs = list(self.logs)[-int(request.query.get('limit', 20)):][::-1]
+        stats: Dict[str, int] = {}
+        for log in logs:
+            stats[log['eventType']] = stats.get(log['eventType'], 0) + 1
+        return web.json_response({'success': True, 'data': {'logs': logs, 'stats': stats, 'totalEvents': len(logs)}})
+
+    def occupancy(self) -> List[Dict]:
+        return [{'name': s['name'], 'availableSpots': s['availableSpots'], 'totalSpots': s['totalSpots']}
+                for s in self.spots.values()]
+
+
+async def start(port: int, delay_ms: float = 0.0, host: str = '127.0.0.1'):
+    """Run a FakeBackend on host:port; returns (runner, backend), call runner.cleanup() to stop"""
+    backend = FakeBackend(delay_ms)
+    runner = web.AppRunner(backend.app())
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner, backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--delay-ms', type=float, default=0.0, help='Simulated backend processing time')
+    args = parser.parse_args()
+    print(f"🧪 Fake backend on http://{args.host}:{args.port} (nearby, cv/alpr, cv/logs, cv/activity)")
+    web.run_app(FakeBackend(args.delay_ms).app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == '__main__':
+    main()
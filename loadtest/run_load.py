@@ -0,0 +1,333 @@
+"""
+Load test for the prediction APIs, offline, against a fake Node backend
+
+Starts fake_backend.py, prediction.py under uvicorn and ml_service/app.py
+(gunicorn or the Flask server) on free local ports, then runs each scenario
+with closed-loop keep-alive clients for a fixed time at every concurrency
+level and reports throughput, errors and p50/p95/p99 latency:
+
+    predict    prediction.py  POST /predict-availability   (single)
+    recommend  prediction.py  POST /recommend-parking      (recommendation)
+    forecast   prediction.py  POST /forecast-availability  (36 arrival times)
+    ml_single  ml_service     POST /predict                (single)
+    ml_batch   ml_service     POST /predict/batch          (--batch-size spots)
+
+Meanwhile simulated cameras post ALPR ENTRY/EXIT events to the fake backend
+at --alpr-rate per second, so the live slot data prediction.py fetches keeps
+changing. Request inputs come from a seeded RNG; runs are repeatable up to
+timing.
+
+--output writes the results as JSON. --baseline compares against such a
+file and exits 1 when a scenario's p95 rose, or its throughput fell, by
+more than --tolerance, or when any request failed.
+
+Usage:
+    python loadtest/run_load.py [--scenarios predict,recommend,ml_single,ml_batch]
+                                [--concurrency 1,16] [--duration 10] [--batch-size 50]
+                                [--backend-delay-ms 2] [--alpr-rate 20] [--ml-server gunicorn]
+                                [--output results.json] [--baseline results.json] [--tolerance 0.25]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_backend  # noqa: E402
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PREDICTION_DIR = os.path.join(REPO_DIR, 'OpenCV(YOLO)')
+ML_DIR = os.path.join(REPO_DIR, 'ml_service')
+
+AREAS = ['pict_campus', 'amanora_mall', 'seasons_mall', 'kharadi_it_park', 'eon_it_park']
+
+
+class Scenario(NamedTuple):
+    service: str  # 'prediction' or 'ml'
+    path: str
+    body: Callable[[random.Random, argparse.Namespace], Dict]
+
+
+def _pune_location(rng: random.Random) -> Dict:
+    return {'lat': rng.uniform(18.49, 18.57), 'lng': rng.uniform(73.84, 73.94)}
+
+
+def _arrival(rng: random.Random) -> str:
+    return (datetime.now() + timedelta(minutes=rng.randint(10, 180))).isoformat(timespec='seconds')
+
+
+def _ml_spot(rng: random.Random) -> Dict:
+    return {
+        'slot_type': rng.choice(['car', 'bike', 'large_vehicle', 'disabled']),
+        'hour': rng.randint(0, 23),
+        'weekday': rng.randint(0, 6),
+        'weather': rng.choice(['sunny', 'rainy', 'hot']),
+        'event_type': rng.choice(['none', 'public_holiday', 'stadium_event']),
+        'poi_office_count': rng.randint(0, 40),
+        'poi_restaurant_count': rng.randint(0, 30),
+        'poi_store_count': rng.randint(0, 30),
+    }
+
+
+SCENARIOS = {
+    'predict': Scenario('prediction', '/predict-availability', lambda rng, args: {
+        'user_location': _pune_location(rng),
+        'parking_area': rng.choice(AREAS),
+        'planned_arrival_time': _arrival(rng),
+        'vehicle_type': rng.choice(['car', 'bike']),
+    }),
+    'recommend': Scenario('prediction', '/recommend-parking', lambda rng, args: {
+        'destination_location': _pune_location(rng),
+        'planned_arrival_time': _arrival(rng),
+        'vehicle_type': rng.choice(['car', 'bike']),
+        'max_walking_distance': rng.choice([2000, 5000, 10000]),
+    }),
+    'forecast': Scenario('prediction', '/forecast-availability', lambda rng, args: {
+        'user_location': _pune_location(rng),
+        'parking_area': rng.choice(AREAS),
+        'horizon_minutes': 180,
+        'step_minutes': 5,
+    }),
+    'ml_single': Scenario('ml', '/predict', lambda rng, args: _ml_spot(rng)),
+    'ml_batch': Scenario('ml', '/predict/batch', lambda rng, args: {
+        'spots': [dict(_ml_spot(rng), spot_id=f'SPOT-{i:04d}') for i in range(args.batch_size)],
+    }),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def wait_until_ready(session: aiohttp.ClientSession, url: str, process: subprocess.Popen,
+                           timeout: float = 120.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{url} exited with code {process.returncode} before becoming ready')
+        try:
+            async with session.get(url + '/ready') as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f'{url} did not become ready')
+
+
+def start_services(args, backend_port: int) -> Dict[str, tuple]:
+    """Subprocess and base URL per service needed by the selected scenarios"""
+    needed = {SCENARIOS[name].service for name in args.scenarios}
+    services = {}
+    if 'prediction' in needed:
+        port = free_port()
+        env = dict(os.environ, BACKEND_API_BASE=f'http://127.0.0.1:{backend_port}/api', PREDICTION_WARMUP='eager')
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'prediction:app', '--port', str(port), '--log-level', 'warning'],
+            cwd=os.path.abspath(args.prediction_dir), env=env,
+            stdout=subprocess.DEVNULL, stderr=None if args.verbose else subprocess.DEVNULL
+        )
+        services['prediction'] = (process, f'http://127.0.0.1:{port}')
+    if 'ml' in needed:
+        port = free_port()
+        # Every request reaches the model unless the caller enables the cache
+        env = dict(os.environ, ML_SERVICE_PORT=str(port), ML_SERVICE_DEBUG='0', ML_WARMUP='eager')
+        env.setdefault('ML_CACHE_ENABLED', '0')
+        if args.ml_server == 'gunicorn':
+            command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app']
+        else:
+            command = [sys.executable, 'app.py']
+        process = subprocess.Popen(command, cwd=os.path.abspath(args.ml_dir), env=env,
+                                   stdout=subprocess.DEVNULL, stderr=None if args.verbose else subprocess.DEVNULL)
+        services['ml'] = (process, f'http://127.0.0.1:{port}')
+    return services
+
+
+async def alpr_traffic(session: aiohttp.ClientSession, url: str, rate: float, rng: random.Random):
+    """Cameras reporting vehicles entering and leaving the fake backend's spots, until cancelled"""
+    parked: List[tuple] = []
+    while True:
+        if parked and (len(parked) > 200 or rng.random() < 0.5):
+            vehicle, spot_id = parked.pop(rng.randrange(len(parked)))
+            event_type = 'EXIT'
+        else:
+            vehicle, spot_id = f'MH12LT{rng.randint(0, 9999):04d}', rng.choice(fake_backend.SPOTS)['id']
+            parked.append((vehicle, spot_id))
+            event_type = 'ENTRY'
+        event = {'vehicleNumber': vehicle, 'eventType': event_type, 'confidence': round(rng.uniform(0.7, 0.99), 2),
+                 'cameraId': f'loadtest_cam_{spot_id[:4]}', 'parkingSpotId': spot_id}
+        try:
+            async with session.post(url + '/api/cv/alpr', json=event) as response:
+                await response.read()
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(1 / rate)
+
+
+async def run_scenario(session: aiohttp.ClientSession, url: str, scenario: Scenario, args,
+                       concurrency: int, duration: float, seed: int) -> Dict:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    stop_at = time.monotonic() + duration
+
+    async def client(client_seed: int):
+        rng = random.Random(client_seed)
+        while time.monotonic() < stop_at:
+            body = scenario.body(rng, args)
+            start = time.perf_counter()
+            try:
+                async with session.post(url + scenario.path, json=body) as response:
+                    await response.read()
+                    status = response.status
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = type(e).__name__
+            if status == 200:
+                latencies.append((time.perf_counter() - start) * 1e3)
+            else:
+                errors[str(status)] = errors.get(str(status), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(seed * 1000 + i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors.values()),
+        'error_statuses': errors,
+        'req_s': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+    }
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """Regressions of results against a baseline run, as messages"""
+    previous = {(r['scenario'], r['concurrency']): r for r in baseline}
+    regressions = []
+    for r in results:
+        if r['errors']:
+            regressions.append(f"{r['scenario']} x{r['concurrency']}: {r['errors']} failed requests "
+                               f"{r['error_statuses']}")
+        before = previous.get((r['scenario'], r['concurrency']))
+        if before is None:
+            continue
+        if r['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{r['scenario']} x{r['concurrency']}: p95 {before['p95_ms']:.2f} -> "
+                               f"{r['p95_ms']:.2f} ms")
+        if r['req_s'] < before['req_s'] * (1 - tolerance):
+            regressions.append(f"{r['scenario']} x{r['concurrency']}: {before['req_s']:.0f} -> "
+                               f"{r['req_s']:.0f} req/s")
+    return regressions
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', default='predict,recommend,ml_single,ml_batch',
+                        help=f"Comma-separated, from: {', '.join(SCENARIOS)}")
+    parser.add_argument('--concurrency', default='1,16', help='Comma-separated client counts')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per scenario and concurrency')
+    parser.add_argument('--warmup', type=float, default=1.0, help='Unmeasured seconds before each scenario')
+    parser.add_argument('--batch-size', type=int, default=50, help='Spots per ml_batch request')
+    parser.add_argument('--backend-delay-ms', type=float, default=2.0, help='Simulated backend processing time')
+    parser.add_argument('--alpr-rate', type=float, default=20.0, help='ALPR events per second (0: none)')
+    parser.add_argument('--ml-server', choices=['gunicorn', 'flask'], default='gunicorn')
+    parser.add_argument('--prediction-dir', default=PREDICTION_DIR, help='Directory containing prediction.py')
+    parser.add_argument('--ml-dir', default=ML_DIR, help='Directory containing the ML service app.py')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--baseline', help='Results JSON of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative p95/throughput change')
+    parser.add_argument('--verbose', action='store_true', help="Show the services' stderr")
+    args = parser.parse_args()
+    args.scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+    concurrency_levels = [int(c) for c in args.concurrency.split(',')]
+
+    backend_port = free_port()
+    runner, backend = await fake_backend.start(backend_port, args.backend_delay_ms)
+    backend_url = f'http://127.0.0.1:{backend_port}'
+    services = start_services(args, backend_port)
+    results = []
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=30)
+    try:
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            for name, (process, url) in services.items():
+                await wait_until_ready(session, url, process)
+                print(f"✅ {name} ready at {url}")
+            cameras = None
+            if args.alpr_rate > 0:
+                cameras = asyncio.create_task(alpr_traffic(session, backend_url, args.alpr_rate,
+                                                           random.Random(args.seed)))
+
+            print(f"\n{'scenario':<10} {'clients':>7} {'requests':>9} {'errors':>7} {'req/s':>8} "
+                  f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+            for index, name in enumerate(args.scenarios):
+                scenario = SCENARIOS[name]
+                url = services[scenario.service][1]
+                await run_scenario(session, url, scenario, args, max(concurrency_levels), args.warmup, -1 - index)
+                for concurrency in concurrency_levels:
+                    r = await run_scenario(session, url, scenario, args, concurrency, args.duration,
+                                           args.seed + index)
+                    r.update(scenario=name, concurrency=concurrency)
+                    results.append(r)
+                    print(f"{name:<10} {concurrency:>7} {r['requests']:>9} {r['errors']:>7} {r['req_s']:>8.0f} "
+                          f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f}")
+
+            if cameras is not None:
+                cameras.cancel()
+                await asyncio.gather(cameras, return_exceptions=True)
+    finally:
+        for process, _ in services.values():
+            process.terminate()
+        for process, _ in services.values():
+            process.wait(timeout=30)
+        await runner.cleanup()
+
+    print(f"\n🧪 Fake backend: {backend.requests} requests over {len(backend.peers)} connections")
+    spots = ', '.join(f"{s['name']} {s['availableSpots']}/{s['totalSpots']}" for s in backend.occupancy())
+    print(f"   available now: {spots}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'args': {k: v for k, v in vars(args).items() if k not in ('output', 'baseline')},
+                       'results': results}, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    regressions = [f"{r['scenario']} x{r['concurrency']}: {r['errors']} failed requests {r['error_statuses']}"
+                   for r in results if r['errors']]
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)['results'], args.tolerance)
+    if regressions:
+        print("\n❌ Regressions:")
+        for message in regressions:
+            print(f"   {message}")
+        return 1
+    print("\n✅ No regressions" if args.baseline else "\n✅ All requests succeeded")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
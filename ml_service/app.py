@@ -2,41 +2,382 @@
 Flask API for ML Parking Prediction Service
 Provides REST endpoints for parking occupancy predictions
 """
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
+from functools import wraps
+import hmac
 import os
+import json
+import threading
+import time
 from ml_predictor import ParkingMLPredictor, get_current_context
+from prediction_cache import CachedPredictor, ModelVersionCheck, PredictionCache, file_signature
+from materialized import MaterializedPredictor, load_table
+from coalescer import RequestCoalescer
+from parking_common.encoding import encoder_table_current
+from parking_common.shadow import ShadowScorer
+from shadow import ShadowPredictor, prob_occupied
 
 app = Flask(__name__)
 CORS(app)
 
 # Initialize ML model
-MODEL_DIR = os.path.join(os.path.dirname(__file__), '..')
+MODEL_DIR = os.environ.get('ML_MODEL_DIR', os.path.join(os.path.dirname(__file__), '..'))
 MODEL_FILE = os.path.join(MODEL_DIR, 'parking_model_v2.json')
 MODEL_DATA_FILE = os.path.join(MODEL_DIR, 'parking_model_data_v2.joblib')
 
+# Startup-optimized artifacts written by export_artifacts.py: binary booster and
+# flat encoder table. Used instead of the files above when present and not older.
+FAST_MODEL_FILE = os.path.join(MODEL_DIR, 'parking_model_v2.ubj')
+FAST_DATA_FILE = os.path.join(MODEL_DIR, 'parking_model_v2_encoders.json')
+
+# 'background': the app serves /health immediately and loads the model in a
+# thread, /ready turns 200 once it is warm. 'eager': load it during import.
+WARMUP_MODE = os.environ.get('ML_WARMUP', 'background')
+
 print("🚀 Initializing ML Parking Prediction Service...")
 print(f"📂 Model directory: {MODEL_DIR}")
-print(f"🤖 Model file: {MODEL_FILE}")
-print(f"📊 Model data file: {MODEL_DATA_FILE}")
 
-try:
-    predictor = ParkingMLPredictor(MODEL_FILE, MODEL_DATA_FILE)
-    print("✅ ML Service initialized successfully!")
-except Exception as e:
-    print(f"❌ Failed to initialize ML Service: {str(e)}")
-    raise
+# Prediction cache settings
+CACHE_ENABLED = os.environ.get('ML_CACHE_ENABLED', '1') != '0'
+CACHE_MAX_ENTRIES = int(os.environ.get('ML_CACHE_MAX_ENTRIES', 50000))
+CACHE_TTL_SECONDS = float(os.environ.get('ML_CACHE_TTL_SECONDS', 300))
+
+# Materialized (precomputed grid) mode settings
+MATERIALIZED_ENABLED = os.environ.get('ML_MATERIALIZED', '0') == '1'
+MATERIALIZED_PATH = os.environ.get('ML_MATERIALIZED_PATH', os.path.join(MODEL_DIR, 'parking_occupancy_grid.npz'))
+MATERIALIZED_PROFILES_FILE = os.environ.get('ML_MATERIALIZED_PROFILES')
+
+# Micro-batching of concurrent single predictions (0 disables it)
+COALESCE_WINDOW_MS = float(os.environ.get('ML_COALESCE_WINDOW_MS', 0))
+COALESCE_MAX_BATCH = int(os.environ.get('ML_COALESCE_MAX_BATCH', 64))
+
+# Inference backend: xgboost (default), treelite or onnx (see parking_common/inference_backends.py)
+INFERENCE_BACKEND = os.environ.get('ML_INFERENCE_BACKEND', 'xgboost')
+COMPILED_MODEL_DIR = os.environ.get('ML_COMPILED_MODEL_DIR', MODEL_DIR)
+BACKEND_MAX_ROWS = int(os.environ.get('ML_BACKEND_MAX_ROWS', 100))
+
+# Spots scored per model call by /predict/stream
+STREAM_CHUNK_SIZE = int(os.environ.get('ML_STREAM_CHUNK_SIZE', 1000))
+
+# Optional shadow model (same file names, another directory): scored in the
+# background on a sample of requests and compared with the served model
+SHADOW_MODEL_DIR = os.environ.get('ML_SHADOW_MODEL_DIR')
+SHADOW_SAMPLE_RATE = float(os.environ.get('ML_SHADOW_SAMPLE_RATE', 0.1))
+
+# Hot reload: check the model files every ML_RELOAD_POLL_SECONDS and swap in the
+# new model when they change (0 = off; POST /admin/reload works either way,
+# but only when ML_ADMIN_TOKEN is set)
+RELOAD_POLL_SECONDS = float(os.environ.get('ML_RELOAD_POLL_SECONDS', 0))
+ADMIN_TOKEN = os.environ.get('ML_ADMIN_TOKEN')
+
+def artifact_paths(model_dir: str):
+    """Model, model data, fast model and fast data file paths in model_dir"""
+    return [os.path.join(model_dir, os.path.basename(path))
+            for path in (MODEL_FILE, MODEL_DATA_FILE, FAST_MODEL_FILE, FAST_DATA_FILE)]
+
+def model_files(model_dir: str = MODEL_DIR):
+    """(model, model data) to load: the startup artifacts unless they are missing or stale"""
+    model_file, model_data_file, fast_model_file, fast_data_file = artifact_paths(model_dir)
+    try:
+        fast_mtime = min(os.path.getmtime(fast_model_file), os.path.getmtime(fast_data_file))
+    except OSError:
+        return model_file, model_data_file
+    source_mtimes = [os.path.getmtime(path) for path in (model_file, model_data_file) if os.path.exists(path)]
+    if source_mtimes and fast_mtime < max(source_mtimes):
+        print("⚠️  Startup artifacts are older than the model files, ignoring them (re-run export_artifacts.py)")
+        return model_file, model_data_file
+    if not encoder_table_current(fast_data_file):
+        print("⚠️  Startup encoder table is in an old format, ignoring it (re-run export_artifacts.py)")
+        return model_file, model_data_file
+    return fast_model_file, fast_data_file
+
+def model_version():
+    return file_signature(MODEL_FILE, MODEL_DATA_FILE, FAST_MODEL_FILE, FAST_DATA_FILE)
+
+def watched_version():
+    """Signature of every file a reload would read (primary and shadow model)"""
+    paths = artifact_paths(MODEL_DIR) + (artifact_paths(SHADOW_MODEL_DIR) if SHADOW_MODEL_DIR else [])
+    return file_signature(*paths)
+
+class ServingModel:
+    """A loaded model and the predictor chain built on it, replaced as a whole on reload"""
+    
+    def __init__(self):
+        self.model_predictor = self.predictor = None
+        self.prediction_cache = self.materialized = self.coalescer = self.shadow = None
+        self.model_files = None
+        self.version = None
+        self.active = 0  # requests currently using this model
+        self._lock = threading.Lock()
+    
+    def enter(self):
+        with self._lock:
+            self.active += 1
+    
+    def exit(self):
+        with self._lock:
+            self.active -= 1
+    
+    def hold(self):
+        """
+        enter() for work that outlives its view, such as a streamed response
+        
+        Returns a release function that calls exit() on its first call only,
+        so it can be called both when the stream ends and when it is closed.
+        """
+        self.enter()
+        released = threading.Lock()
+        def release():
+            if released.acquire(blocking=False):
+                self.exit()
+        return release
+    
+    def retire(self, timeout: float = 30.0):
+        """Wait for the requests still using this model, then stop its background threads"""
+        deadline = time.monotonic() + timeout
+        while self.active and time.monotonic() < deadline:
+            time.sleep(0.05)
+        if self.coalescer:
+            self.coalescer.stop()
+        if self.shadow:
+            self.shadow.stop()
+
+def load_serving_model() -> ServingModel:
+    """Load the model files and build the predictor chain, ending with a warm prediction"""
+    state = ServingModel()
+    # Taken before reading anything, so files that change during the load trigger another reload
+    state.version = watched_version()
+    model_file, model_data_file = state.model_files = model_files()
+    print(f"🤖 Model file: {model_file}")
+    print(f"📊 Model data file: {model_data_file}")
+    model_predictor = state.model_predictor = ParkingMLPredictor(model_file, model_data_file)
+    if os.environ.get('ML_MODEL_THREADS'):
+        model_predictor.model.set_params(n_jobs=int(os.environ['ML_MODEL_THREADS']))
+    if INFERENCE_BACKEND != 'xgboost':
+        model_predictor.use_backend(
+            INFERENCE_BACKEND,
+            cache_dir=COMPILED_MODEL_DIR,
+            nthread=int(os.environ.get('ML_MODEL_THREADS', os.cpu_count())),
+            max_rows=BACKEND_MAX_ROWS or None
+        )
+    chain = model_predictor
+    
+    if COALESCE_WINDOW_MS > 0:
+        state.coalescer = RequestCoalescer(chain, COALESCE_WINDOW_MS, COALESCE_MAX_BATCH)
+        chain = state.coalescer
+        print(f"📦 Request coalescing enabled ({COALESCE_WINDOW_MS}ms window, up to {COALESCE_MAX_BATCH} rows)")
+    
+    if CACHE_ENABLED:
+        state.prediction_cache = PredictionCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+        chain = CachedPredictor(
+            chain,
+            state.prediction_cache,
+            model_version=model_version
+        )
+        print(f"🗃️  Prediction cache enabled ({CACHE_MAX_ENTRIES} entries, {CACHE_TTL_SECONDS:.0f}s TTL)")
+    
+    if MATERIALIZED_ENABLED:
+        version_check = ModelVersionCheck(model_version)
+        materialized = state.materialized = MaterializedPredictor(
+            chain, model_predictor, version_check,
+            table=load_table(MATERIALIZED_PATH, version_check.version)
+        )
+        if materialized.table is None and MATERIALIZED_PROFILES_FILE:
+            with open(MATERIALIZED_PROFILES_FILE) as f:
+                materialized.materialize(materialized.parse_profiles(json.load(f)), path=MATERIALIZED_PATH)
+        chain = materialized
+        print(f"🧮 Materialized mode enabled ({'table loaded' if materialized.table else 'no table yet'})")
+    
+    if SHADOW_MODEL_DIR:
+        # A broken candidate must not take the served model down with it
+        try:
+            shadow_files = model_files(SHADOW_MODEL_DIR)
+            shadow_model = ParkingMLPredictor(*shadow_files)
+            if os.environ.get('ML_MODEL_THREADS'):
+                shadow_model.model.set_params(n_jobs=int(os.environ['ML_MODEL_THREADS']))
+            state.shadow = ShadowScorer(
+                lambda spots: prob_occupied(shadow_model.batch_predict(spots)),
+                sample_rate=SHADOW_SAMPLE_RATE, threshold=0.5, name=shadow_files[0]
+            )
+            chain = ShadowPredictor(chain, state.shadow)
+            print(f"👥 Shadow model enabled ({shadow_files[0]}, {SHADOW_SAMPLE_RATE:.0%} of requests)")
+        except Exception as e:
+            print(f"⚠️  Shadow model not loaded: {e}")
+    
+    # The first call into the booster allocates its predictor; pay that here
+    # rather than on the first request (an all-default row touches no counters)
+    model_predictor.predict_occupied_probabilities([{}])
+    state.predictor = chain
+    return state
+
+# Set by warm_up() and swapped by reload_model(); endpoints that need it are
+# wrapped in requires_model and read it from flask.g
+serving = None
+model_ready = threading.Event()
+startup = {
+    'phase': 'starting',
+    'warmup_mode': WARMUP_MODE,
+    'process_started_at': time.time(),
+    'model_files': None,
+    'load_seconds': None,
+    'error': None,
+}
+reloads = {
+    'count': 0,
+    'failures': 0,
+    'last_trigger': None,
+    'last_reload_at': None,
+    'last_seconds': None,
+    'last_error': None,
+}
+reload_lock = threading.Lock()
+_watcher_pid = None
+_watcher_lock = threading.Lock()
+
+def warm_up():
+    """Load the model, build the predictor chain and run a first prediction"""
+    global serving
+    
+    startup['phase'] = 'loading'
+    start = time.perf_counter()
+    try:
+        serving = load_serving_model()
+    except Exception as e:
+        startup.update(phase='failed', error=str(e))
+        print(f"❌ Failed to initialize ML Service: {str(e)}")
+        raise
+    
+    startup.update(phase='ready', model_files=list(serving.model_files),
+                   load_seconds=round(time.perf_counter() - start, 3))
+    model_ready.set()
+    print(f"✅ ML Service initialized successfully in {startup['load_seconds']}s!")
+    start_reload_watcher()
+
+def reload_model(trigger: str) -> dict:
+    """
+    Load the model files again and swap the new predictor chain in
+    
+    Requests keep going to the current chain while the new one loads and
+    warms up. The swap is one assignment, so each request sees either the
+    old model or the new one, never a mix of their encoders and booster.
+    The old chain is retired once its in-flight requests finish. If loading
+    fails, the current model stays in service and the error is raised.
+    """
+    global serving
+    with reload_lock:
+        start = time.perf_counter()
+        reloads['last_trigger'] = trigger
+        try:
+            new_state = load_serving_model()
+        except Exception as e:
+            reloads['failures'] += 1
+            reloads['last_error'] = str(e)
+            print(f"❌ Model reload failed, keeping the current model: {str(e)}")
+            raise
+        old_state, serving = serving, new_state
+        reloads.update(count=reloads['count'] + 1, last_reload_at=time.time(),
+                       last_seconds=round(time.perf_counter() - start, 3), last_error=None)
+    print(f"🔄 Model reloaded ({trigger}) in {reloads['last_seconds']}s")
+    if old_state is not None:
+        threading.Thread(target=old_state.retire, name='ml-retire', daemon=True).start()
+    return dict(reloads)
+
+def start_reload_watcher():
+    """Start polling the model files in this process (each gunicorn worker polls for itself)"""
+    global _watcher_pid
+    if RELOAD_POLL_SECONDS <= 0 or _watcher_pid == os.getpid():
+        return
+    with _watcher_lock:
+        if _watcher_pid == os.getpid():
+            return
+        _watcher_pid = os.getpid()
+        threading.Thread(target=_watch_model_files, name='ml-reload-watcher', daemon=True).start()
+        print(f"👀 Watching model files for changes every {RELOAD_POLL_SECONDS}s")
+
+def _watch_model_files():
+    previous = failed = None
+    while True:
+        time.sleep(RELOAD_POLL_SECONDS)
+        version = watched_version()
+        # Only reload once the files have been unchanged for a whole interval,
+        # so a model that is still being written is not picked up half-done
+        if version != serving.version and version == previous and version != failed:
+            try:
+                reload_model('file change')
+                failed = None
+            except Exception:
+                failed = version  # retried when the files change again
+        previous = version
+
+def _background_warm_up():
+    try:
+        warm_up()
+    except Exception:
+        pass  # recorded in startup['error'] and reported by /health and /ready
+
+if WARMUP_MODE == 'eager':
+    warm_up()
+else:
+    threading.Thread(target=_background_warm_up, name='ml-warmup', daemon=True).start()
+
+def requires_model(view):
+    """
+    Answer 503 (with Retry-After) until the model is warm
+    
+    Otherwise the current ServingModel is put in g.serving for the whole
+    request, so a reload that completes mid-request does not affect it.
+    The model is released when the view returns; a view that streams its
+    response must hold it until the stream ends (see predict_stream).
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not model_ready.is_set():
+            response = jsonify({
+                'success': False,
+                'error': 'Model is not loaded yet' if startup['phase'] != 'failed' else f"Model failed to load: {startup['error']}",
+                'phase': startup['phase']
+            })
+            response.headers['Retry-After'] = '1'
+            return response, 503
+        # Workers forked from a preloading master start their own watcher here
+        start_reload_watcher()
+        state = g.serving = serving
+        state.enter()
+        try:
+            return view(*args, **kwargs)
+        finally:
+            state.exit()
+    return wrapper
+
+def shutdown():
+    """Flush queued work before the process exits"""
+    if serving:
+        serving.retire(timeout=0)
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
+    """Liveness: the process is up (the model may still be loading, see /ready)"""
+    failed = startup['phase'] == 'failed'
     return jsonify({
-        'status': 'healthy',
+        'status': 'unhealthy' if failed else 'healthy',
         'service': 'ML Parking Prediction Service',
-        'model_loaded': True
-    }), 200
+        'model_loaded': model_ready.is_set(),
+        'error': startup['error']
+    }), 503 if failed else 200
+
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness: 200 once the model is loaded and warm, 503 before that"""
+    return jsonify({
+        'ready': model_ready.is_set(),
+        **startup,
+        'reloads': reloads,
+        'uptime_seconds': round(time.time() - startup['process_started_at'], 3)
+    }), 200 if model_ready.is_set() else 503
 
 @app.route('/predict', methods=['POST'])
+@requires_model
 def predict_single():
     """
     Predict occupancy for a single parking spot
@@ -65,7 +406,7 @@ def predict_single():
             data['hour'] = data.get('hour', context['hour'])
             data['weekday'] = data.get('weekday', context['weekday'])
         
-        prediction = predictor.predict_occupancy(data)
+        prediction = g.serving.predictor.predict_occupancy(data)
         
         return jsonify({
             'success': True,
@@ -80,6 +421,7 @@ def predict_single():
         }), 500
 
 @app.route('/predict/batch', methods=['POST'])
+@requires_model
 def predict_batch():
     """
     Predict occupancy for multiple parking spots
@@ -122,7 +464,7 @@ def predict_batch():
             if 'weekday' not in spot:
                 spot['weekday'] = weekday
         
-        predictions = predictor.batch_predict(spots)
+        predictions = g.serving.predictor.batch_predict(spots)
         
         return jsonify({
             'success': True,
@@ -140,6 +482,181 @@ def predict_batch():
             'error': str(e)
         }), 500
 
+@app.route('/predict/stream', methods=['POST'])
+@requires_model
+def predict_stream():
+    """
+    Bulk predictions as newline-delimited JSON, for very large spot lists
+    
+    Request body (Content-Type: application/x-ndjson, may be sent chunked),
+    one spot per line:
+        {"spot_id": "HINJ-001", "slot_type": "car", "weather": "sunny", ...}
+        {"spot_id": "HINJ-002", "slot_type": "bike", "weather": "sunny", ...}
+    
+    Query parameters hour and weekday default to the current time, as in
+    /predict/batch. Lines are read and scored ML_STREAM_CHUNK_SIZE at a time
+    and each chunk's results are written out before the next is read, so
+    memory does not grow with the input. The response has one line per
+    input spot, in input order; blank lines are skipped and lines that are
+    not valid JSON get an 'UNKNOWN' result with an error message.
+    """
+    try:
+        context = get_current_context()
+        hour = int(request.args.get('hour', context['hour']))
+        weekday = int(request.args.get('weekday', context['weekday']))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'hour and weekday must be integers'}), 400
+    
+    chain = g.serving.predictor
+    # requires_model releases the model when this view returns, before the
+    # first chunk is scored; hold it until the stream is done so the stream
+    # counts as active and a reload does not retire the model under it
+    release = g.serving.hold()
+    
+    def generate():
+        try:
+            chunk = []
+            for line_number, line in enumerate(_iter_lines(request.stream), 1):
+                if not line.strip():
+                    continue
+                chunk.append(_parse_stream_line(line, line_number))
+                if len(chunk) >= STREAM_CHUNK_SIZE:
+                    yield _predict_stream_chunk(chain, chunk, hour, weekday)
+                    chunk = []
+            if chunk:
+                yield _predict_stream_chunk(chain, chunk, hour, weekday)
+        finally:
+            release()
+    
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    # Also released if the response is closed before the generator starts
+    response.call_on_close(release)
+    return response
+
+def _iter_lines(stream, block_size: int = 64 * 1024):
+    """
+    Lines of a request body, read in blocks
+    
+    Iterating request.stream directly reads it a byte at a time, which is
+    about ten times slower than scoring the spots.
+    """
+    pending = b''
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        lines = (pending + block).split(b'\n')
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+def _parse_stream_line(line: bytes, line_number: int):
+    """(spot, None) for a valid line, (None, error message) otherwise"""
+    try:
+        return json.loads(line), None
+    except ValueError as e:
+        return None, f"Line {line_number}: invalid JSON ({e})"
+
+def _predict_stream_chunk(chain, chunk, hour: int, weekday: int) -> str:
+    """Score one chunk with a single batch_predict call and render it as NDJSON"""
+    spots = [spot for spot, error in chunk if error is None]
+    for spot in spots:
+        if isinstance(spot, dict):
+            spot.setdefault('hour', hour)
+            spot.setdefault('weekday', weekday)
+    
+    try:
+        predictions = iter(chain.batch_predict(spots) if spots else [])
+    except Exception as e:
+        # Headers are already sent, so a failed chunk is reported in-band per spot
+        predictions = iter([
+            _stream_error(spot.get('spot_id', 'unknown') if isinstance(spot, dict) else 'unknown', str(e))
+            for spot in spots
+        ])
+    
+    lines = [
+        json.dumps(next(predictions) if error is None else _stream_error('unknown', error))
+        for _, error in chunk
+    ]
+    return '\n'.join(lines) + '\n'
+
+def _stream_error(spot_id, message: str) -> dict:
+    return {
+        'spot_id': spot_id,
+        'error': message,
+        'prob_free': 0.5,  # Default neutral probability, as in batch_predict
+        'prob_occupied': 0.5,
+        'prediction': 'UNKNOWN',
+        'confidence': 0.0
+    }
+
+@app.route('/materialize', methods=['POST'])
+@requires_model
+def materialize():
+    """
+    (Re)build the materialized occupancy table
+    
+    Request body (optional):
+    {
+        "profiles": [
+            {"poi_office_count": 30, "poi_restaurant_count": 5, "poi_store_count": 2},
+            ...
+        ]
+    }
+    Without profiles, the most frequently requested POI profiles are used.
+    """
+    materialized = g.serving.materialized
+    if materialized is None:
+        return jsonify({'success': False, 'error': 'Materialized mode is disabled (set ML_MATERIALIZED=1)'}), 400
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        profiles = materialized.parse_profiles(data['profiles']) if 'profiles' in data else None
+        table = materialized.materialize(profiles, path=MATERIALIZED_PATH)
+        return jsonify({'success': True, 'table': table.stats()}), 200
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@app.route('/stats', methods=['GET'])
+@requires_model
+def get_stats():
+    """Runtime counters (prediction cache, categorical encoding, reloads, shadow model)"""
+    state = g.serving
+    return jsonify({
+        'success': True,
+        'model_files': list(state.model_files),
+        'inference_backend': state.model_predictor.backend.info,
+        'cache': state.prediction_cache.stats() if state.prediction_cache else None,
+        'materialized': state.materialized.stats() if state.materialized else None,
+        'coalescer': state.coalescer.stats() if state.coalescer else None,
+        'reloads': reloads,
+        'shadow': state.shadow.stats() if state.shadow else None,
+        'encoders': state.predictor.encoding_stats()
+    }), 200
+
+@app.route('/admin/reload', methods=['POST'])
+@requires_model
+def admin_reload():
+    """
+    Reload the model files now and swap the new model in without a restart
+    
+    Requires ML_ADMIN_TOKEN in the X-Admin-Token header; answers 404 when
+    ML_ADMIN_TOKEN is not set. Answers 500 if the new files cannot be
+    loaded; the current model keeps serving.
+    Under gunicorn this reaches one worker only; use ML_RELOAD_POLL_SECONDS
+    to reload every worker.
+    """
+    if not ADMIN_TOKEN:
+        return jsonify({'success': False, 'error': 'Admin endpoints are disabled; set ML_ADMIN_TOKEN'}), 404
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode(), ADMIN_TOKEN.encode()):
+        return jsonify({'success': False, 'error': 'Invalid admin token'}), 403
+    try:
+        result = reload_model('admin endpoint')
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e), 'reloads': reloads}), 500
+    return jsonify({'success': True, 'model_files': list(serving.model_files), 'reloads': result}), 200
+
 @app.route('/context', methods=['GET'])
 def get_context():
     """Get current time context for predictions"""
@@ -156,5 +673,6 @@ if __name__ == '__main__':
     print(f"🏥 Health check: http://localhost:{port}/health")
     print(f"🔮 Prediction endpoint: http://localhost:{port}/predict")
     print(f"🔮 Batch prediction: http://localhost:{port}/predict/batch\n")
+    print("ℹ️  Development server - use `gunicorn -c gunicorn.conf.py app:app` in production\n")
     
-    app.run(host='0.0.0.0', port=port, debug=True)
+    app.run(host='0.0.0.0', port=port, debug=os.environ.get('ML_SERVICE_DEBUG', '1') == '1')
@@ -0,0 +1,57 @@
+"""
+Benchmark: inference backends (xgboost, treelite, onnx) on the occupancy model
+
+Each backend is loaded through ParkingMLPredictor.use_backend, so it has
+passed the parity check against xgboost before it is timed. Backends whose
+packages are not installed fall back to xgboost and are reported as such.
+
+Usage:
+    python benchmarks/bench_backends.py [--model PATH] [--model-data PATH]
+                                        [--compiled-dir DIR] [--threads 1]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_batch_predict import MODEL_DIR, time_call
+from parking_common.inference_backends import BACKENDS
+from ml_predictor import ParkingMLPredictor
+
+SIZES = [1, 10, 100, 1_000, 10_000]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=os.path.join(MODEL_DIR, 'parking_model_v2.json'))
+    parser.add_argument('--model-data', default=os.path.join(MODEL_DIR, 'parking_model_data_v2.joblib'))
+    parser.add_argument('--compiled-dir', default=tempfile.gettempdir(), help='Cache for compiled Treelite libraries')
+    parser.add_argument('--threads', type=int, default=1, help='Threads per prediction call')
+    args = parser.parse_args()
+
+    predictor = ParkingMLPredictor(args.model, args.model_data)
+    predictor.model.set_params(n_jobs=args.threads)
+    samples = {n: predictor.parity_sample(n, seed=1) for n in SIZES}
+
+    rows = []
+    for name in BACKENDS:
+        info = predictor.use_backend(name, cache_dir=args.compiled_dir, nthread=args.threads)
+        if info['backend'] != name:
+            rows.append((name, None, info['fallback_reason']))
+            continue
+        timings = [time_call(predictor.backend.predict, samples[n]) for n in SIZES]
+        rows.append((name, timings, f"max diff {info['parity_max_abs_diff']:.1e}"))
+
+    print(f"\nµs per call, {args.threads} thread(s)\n")
+    print(f"{'backend':<10}" + ''.join(f"{n:>10}" for n in SIZES) + "  parity")
+    for name, timings, note in rows:
+        if timings is None:
+            print(f"{name:<10}{'unavailable':>{10 * len(SIZES)}}  {note}")
+        else:
+            print(f"{name:<10}" + ''.join(f"{t * 1e6:>10.1f}" for t in timings) + f"  {note}")
+
+
+if __name__ == '__main__':
+    main()
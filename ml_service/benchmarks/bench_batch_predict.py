@@ -0,0 +1,78 @@
+"""
+Benchmark: per-spot predict_occupancy loop vs columnar batch_predict
+
+Usage:
+    python benchmarks/bench_batch_predict.py [--model PATH] [--model-data PATH]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ml_predictor import ParkingMLPredictor
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), '..', '..')
+SIZES = [1, 100, 10_000]
+
+
+def make_spots(n: int, seed: int = 42):
+    """Generate synthetic spot requests matching the /predict/batch schema"""
+    rng = random.Random(seed)
+    return [
+        {
+            'spot_id': f'BENCH-{i:05d}',
+            'slot_type': rng.choice(['car', 'bike', 'large_vehicle', 'disabled']),
+            'hour': rng.randint(0, 23),
+            'weekday': rng.randint(0, 6),
+            'weather': rng.choice(['sunny', 'rainy', 'hot']),
+            'event_type': rng.choice(['none', 'public_holiday', 'stadium_event']),
+            'poi_office_count': rng.randint(0, 40),
+            'poi_restaurant_count': rng.randint(0, 30),
+            'poi_store_count': rng.randint(0, 30),
+        }
+        for i in range(n)
+    ]
+
+
+def per_spot_loop(predictor, spots):
+    """The previous batch_predict strategy: one model call per spot"""
+    return [predictor.predict_occupancy(spot) for spot in spots]
+
+
+def time_call(func, *args, min_time: float = 0.5):
+    """Best-of wall time for func(*args), repeated for at least min_time seconds"""
+    best = float('inf')
+    elapsed_total = 0.0
+    runs = 0
+    while elapsed_total < min_time or runs < 3:
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        elapsed_total += elapsed
+        runs += 1
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=os.path.join(MODEL_DIR, 'parking_model_v2.json'))
+    parser.add_argument('--model-data', default=os.path.join(MODEL_DIR, 'parking_model_data_v2.joblib'))
+    args = parser.parse_args()
+
+    predictor = ParkingMLPredictor(args.model, args.model_data)
+
+    print(f"\n{'spots':>8} {'per-spot loop':>15} {'batch_predict':>15} {'speedup':>9} {'batch µs/spot':>14}")
+    for n in SIZES:
+        spots = make_spots(n)
+        loop_time = time_call(per_spot_loop, predictor, spots)
+        batch_time = time_call(predictor.batch_predict, spots)
+        print(f"{n:>8} {loop_time * 1e3:>13.2f}ms {batch_time * 1e3:>13.2f}ms "
+              f"{loop_time / batch_time:>8.1f}x {batch_time / n * 1e6:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Load benchmark: Flask development server vs gunicorn (preloaded, multi-worker)
+
+Starts each server as a subprocess, drives POST /predict from concurrent
+keep-alive clients for a fixed duration and reports throughput and latency
+percentiles. The prediction cache is disabled so every request reaches the
+model.
+
+Usage:
+    python benchmarks/bench_serving.py [--model-dir DIR] [--concurrency 16]
+                                       [--duration 10] [--workers 4] [--threads 4]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port: int, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/ready')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not become ready")
+
+
+def random_spot(rng: random.Random) -> dict:
+    return {
+        'slot_type': rng.choice(['car', 'bike', 'large_vehicle', 'disabled']),
+        'hour': rng.randint(0, 23),
+        'weekday': rng.randint(0, 6),
+        'weather': rng.choice(['sunny', 'rainy', 'hot']),
+        'event_type': rng.choice(['none', 'public_holiday', 'stadium_event']),
+        'poi_office_count': rng.randint(0, 40),
+        'poi_restaurant_count': rng.randint(0, 30),
+        'poi_store_count': rng.randint(0, 30),
+    }
+
+
+def client(port: int, stop_at: float, seed: int, latencies: list, errors: list):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    while time.monotonic() < stop_at:
+        body = json.dumps(random_spot(rng))
+        start = time.perf_counter()
+        try:
+            conn.request('POST', '/predict', body, {'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(str(e))
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_load(port: int, concurrency: int, duration: float) -> dict:
+    latencies, errors = [], []
+    stop_at = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=client, args=(port, stop_at, seed, latencies, errors))
+        for seed in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1e3,
+        'p95_ms': percentile(latencies, 95) * 1e3,
+        'p99_ms': percentile(latencies, 99) * 1e3,
+    }
+
+
+def benchmark(name: str, command: list, env: dict, args) -> dict:
+    port = free_port()
+    env = dict(os.environ, **env, ML_SERVICE_PORT=str(port), ML_CACHE_ENABLED='0', ML_SERVICE_DEBUG='0')
+    if args.model_dir:
+        env['ML_MODEL_DIR'] = args.model_dir
+    process = subprocess.Popen(command, cwd=SERVICE_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(port)
+        run_load(port, args.concurrency, 1.0)  # warm-up
+        result = run_load(port, args.concurrency, args.duration)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    result['server'] = name
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model-dir', help='Directory with parking_model_v2.json and parking_model_data_v2.joblib')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    runs = [
+        benchmark('flask dev server', [sys.executable, 'app.py'], {}, args),
+        benchmark(f'gunicorn {args.workers}w x {args.threads}t',
+                  [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+                  {'ML_WORKERS': str(args.workers), 'ML_THREADS': str(args.threads)}, args),
+    ]
+
+    print(f"\nPOST /predict, {args.concurrency} concurrent clients, {args.duration:.0f}s\n")
+    print(f"{'server':<24} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for r in runs:
+        print(f"{r['server']:<24} {r['rps']:>9.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+              f"{r['p99_ms']:>8.2f} {r['errors']:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: ML service cold start, by artifact format and warm-up mode
+
+Spawns `python app.py` repeatedly and measures the time from process start
+until GET /health answers (process up) and until GET /ready answers 200
+(model loaded and warm). Model directories are assembled in a temp dir so
+that each run sees only one artifact format:
+
+    json+joblib   parking_model_v2.json + parking_model_data_v2.joblib
+    ubj+table     parking_model_v2.ubj + parking_model_v2_encoders.json
+                  (written with export_artifacts.py if missing)
+
+Usage:
+    python benchmarks/bench_startup.py [--model-dir DIR] [--runs 5]
+"""
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_serving import SERVICE_DIR, free_port
+
+MODEL_DIR = os.path.join(SERVICE_DIR, '..')
+
+FORMATS = {
+    'json+joblib': ('parking_model_v2.json', 'parking_model_data_v2.joblib'),
+    'ubj+table': ('parking_model_v2.ubj', 'parking_model_v2_encoders.json'),
+}
+
+
+def status(port: int, path: str):
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+        conn.request('GET', path)
+        return conn.getresponse().status
+    except OSError:
+        return None
+
+
+def measure(model_dir: str, warmup: str, timeout: float = 60.0) -> dict:
+    """Seconds from spawn until /health and /ready first answer 200"""
+    port = free_port()
+    env = dict(os.environ, ML_MODEL_DIR=model_dir, ML_WARMUP=warmup, ML_SERVICE_PORT=str(port),
+               ML_SERVICE_DEBUG='0')
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, 'app.py'], cwd=SERVICE_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    result = {}
+    try:
+        while 'ready' not in result:
+            if time.perf_counter() - start > timeout or process.poll() is not None:
+                raise RuntimeError(f"Service did not become ready ({warmup}, {model_dir})")
+            if 'up' not in result and status(port, '/health') == 200:
+                result['up'] = time.perf_counter() - start
+            if 'up' in result and status(port, '/ready') == 200:
+                result['ready'] = time.perf_counter() - start
+            time.sleep(0.02)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model-dir', default=MODEL_DIR)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+    model_dir = os.path.abspath(args.model_dir)
+
+    if not all(os.path.exists(os.path.join(model_dir, name)) for name in FORMATS['ubj+table']):
+        subprocess.run([sys.executable, 'export_artifacts.py', '--model-dir', model_dir], cwd=SERVICE_DIR,
+                       check=True, stdout=subprocess.DEVNULL)
+
+    configs = [(fmt, warmup) for fmt in FORMATS for warmup in ('eager', 'background')]
+    results = {config: [] for config in configs}
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, files in FORMATS.items():
+            os.makedirs(os.path.join(tmp, fmt))
+            for name in files:
+                os.symlink(os.path.join(model_dir, name), os.path.join(tmp, fmt, name))
+        # Round-robin over the configurations so that machine noise hits all of them alike
+        for _ in range(args.runs):
+            for fmt, warmup in configs:
+                results[fmt, warmup].append(measure(os.path.join(tmp, fmt), warmup))
+
+    rows = [
+        (fmt, warmup, statistics.median(r['up'] for r in runs), statistics.median(r['ready'] for r in runs))
+        for (fmt, warmup), runs in results.items()
+    ]
+
+    print(f"\nMedian of {args.runs} cold starts of `python app.py`\n")
+    print(f"{'artifacts':<13} {'warm-up':<11} {'process up':>11} {'model warm':>11}")
+    for fmt, warmup, up, ready in rows:
+        print(f"{fmt:<13} {warmup:<11} {up * 1e3:>9.0f}ms {ready * 1e3:>9.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: /predict/batch (one JSON document) vs /predict/stream (NDJSON)
+
+For each size a fresh `python app.py` is started, one bulk request is sent
+and the server's peak resident memory (VmHWM) is read afterwards. The
+stream client uploads with chunked transfer encoding from a generator and
+reads the response line by line, so neither side holds the whole list.
+The prediction cache is disabled.
+
+Usage:
+    python benchmarks/bench_stream.py [--model-dir DIR] [--sizes 10000 100000]
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from bench_batch_predict import make_spots
+from bench_serving import SERVICE_DIR, free_port, wait_until_ready
+
+# Spots are generated in blocks of this size so the client stays small too
+BLOCK = 1000
+
+
+def spot_blocks(n: int):
+    for start in range(0, n, BLOCK):
+        yield make_spots(min(BLOCK, n - start), seed=start)
+
+
+def peak_rss_mb(pid: int) -> float:
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def run_batch(port: int, n: int) -> int:
+    spots = [spot for block in spot_blocks(n) for spot in block]
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=600)
+    conn.request('POST', '/predict/batch', json.dumps({'spots': spots, 'hour': 9, 'weekday': 1}),
+                 {'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    return len(json.loads(response.read())['predictions'])
+
+
+def run_stream(port: int, n: int) -> int:
+    # Results start coming back while the upload is still running, so the
+    # body is sent from a thread; otherwise both socket buffers fill up.
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=600)
+    conn.putrequest('POST', '/predict/stream?hour=9&weekday=1')
+    conn.putheader('Content-Type', 'application/x-ndjson')
+    conn.putheader('Transfer-Encoding', 'chunked')
+    conn.endheaders()
+
+    def send_body():
+        for block in spot_blocks(n):
+            data = ''.join(json.dumps(spot) + '\n' for spot in block).encode()
+            conn.send(f'{len(data):X}\r\n'.encode() + data + b'\r\n')
+        conn.send(b'0\r\n\r\n')
+
+    sender = threading.Thread(target=send_body, daemon=True)
+    sender.start()
+    response = http.client.HTTPResponse(conn.sock, method='POST')
+    response.begin()
+    count = 0
+    for line in response:
+        json.loads(line)
+        count += 1
+    sender.join()
+    return count
+
+
+def benchmark(endpoint: str, n: int, model_dir: str) -> dict:
+    port = free_port()
+    env = dict(os.environ, ML_SERVICE_PORT=str(port), ML_CACHE_ENABLED='0', ML_SERVICE_DEBUG='0')
+    if model_dir:
+        env['ML_MODEL_DIR'] = model_dir
+    process = subprocess.Popen([sys.executable, 'app.py'], cwd=SERVICE_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(port)
+        baseline = peak_rss_mb(process.pid)
+        start = time.perf_counter()
+        count = (run_stream if endpoint == 'stream' else run_batch)(port, n)
+        elapsed = time.perf_counter() - start
+        peak = peak_rss_mb(process.pid)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    if count != n:
+        raise RuntimeError(f"/predict/{endpoint} returned {count} results for {n} spots")
+    return {'elapsed': elapsed, 'baseline_mb': baseline, 'peak_mb': peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model-dir', help='Directory with the model artifacts')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"\n{'endpoint':<16} {'spots':>8} {'seconds':>9} {'spots/s':>9} {'server peak RSS':>16} {'growth':>9}")
+    for n in args.sizes:
+        for endpoint in ('batch', 'stream'):
+            r = benchmark(endpoint, n, args.model_dir)
+            print(f"/predict/{endpoint:<7} {n:>8} {r['elapsed']:>9.2f} {n / r['elapsed']:>9.0f} "
+                  f"{r['peak_mb']:>13.0f} MB {r['peak_mb'] - r['baseline_mb']:>6.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Export the startup-optimized model artifacts for the ML service
+
+Converts parking_model_v2.json + parking_model_data_v2.joblib into
+parking_model_v2.ubj (binary booster) and parking_model_v2_encoders.json
+(flat encoder table). app.py loads these when they exist, which skips JSON
+booster parsing and unpickling the scikit-learn LabelEncoders. Re-run it
+whenever the model is retrained.
+
+Usage:
+    python export_artifacts.py [--model-dir DIR]
+"""
+import argparse
+import os
+
+import numpy as np
+
+from ml_predictor import ParkingMLPredictor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model-dir', default=os.environ.get('ML_MODEL_DIR', os.path.join(os.path.dirname(__file__), '..')))
+    args = parser.parse_args()
+
+    model_file = os.path.join(args.model_dir, 'parking_model_v2.json')
+    model_data_file = os.path.join(args.model_dir, 'parking_model_data_v2.joblib')
+    fast_model_file = os.path.join(args.model_dir, 'parking_model_v2.ubj')
+    fast_data_file = os.path.join(args.model_dir, 'parking_model_v2_encoders.json')
+
+    source = ParkingMLPredictor(model_file, model_data_file)
+    source.save_artifacts(fast_model_file, fast_data_file)
+
+    # The exported pair must score exactly like the originals
+    exported = ParkingMLPredictor(fast_model_file, fast_data_file)
+    sample = source.parity_sample(1000)
+    max_diff = float(np.max(np.abs(source.backend.predict(sample) - exported.backend.predict(sample))))
+    same_encoders = all(
+        col in exported.encoders
+        and exported.encoders[col].classes.tolist() == encoder.classes.tolist()
+        and np.array_equal(exported.encoders[col].unknown_code, encoder.unknown_code, equal_nan=True)
+        for col, encoder in source.encoders.items()
+    )
+    if exported.model_columns != source.model_columns or not same_encoders or max_diff != 0.0:
+        for path in (fast_model_file, fast_data_file):
+            os.remove(path)
+        raise SystemExit(f"❌ Exported artifacts do not match the source model (max diff {max_diff:.2e}), removed them")
+
+    for path in (fast_model_file, fast_data_file):
+        print(f"💾 {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+    print("✅ Startup artifacts exported and verified")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Gunicorn settings for running the ML service in production
+
+    gunicorn -c gunicorn.conf.py app:app
+
+The app (and with it the XGBoost booster, encoders and any materialized
+table) is loaded once in the master process and the workers are forked from
+it, so they share those pages copy-on-write instead of each parsing the model.
+With ML_PRELOAD=0 every worker starts serving /health at once and loads the
+model in the background instead (faster readiness for autoscaled replicas,
+at the cost of one model copy per worker).
+"""
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('ML_SERVICE_PORT', 5001)}"
+workers = int(os.environ.get('ML_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.environ.get('ML_THREADS', 4))
+worker_class = 'gthread'
+preload_app = os.environ.get('ML_PRELOAD', '1') == '1'
+
+# A preloading master must finish loading before it forks; a background
+# thread started there would not exist in the workers
+if preload_app:
+    os.environ['ML_WARMUP'] = 'eager'
+
+# Graceful shutdown: on SIGTERM workers stop accepting and get this long to finish
+graceful_timeout = int(os.environ.get('ML_GRACEFUL_TIMEOUT', 30))
+timeout = int(os.environ.get('ML_WORKER_TIMEOUT', 60))
+keepalive = 5
+
+# Every worker already runs `threads` requests in parallel; letting XGBoost
+# start its own thread pool per call on top of that oversubscribes the CPUs.
+os.environ.setdefault('ML_MODEL_THREADS', '1')
+os.environ.setdefault('OMP_NUM_THREADS', os.environ['ML_MODEL_THREADS'])
+
+
+def when_ready(server):
+    # Move everything allocated while preloading into the permanent generation
+    # so the garbage collector does not touch (and un-share) those pages in workers
+    gc.freeze()
+    server.log.info(f"ML service ready: {workers} workers x {threads} threads")
+
+
+def worker_exit(server, worker):
+    # Let the request coalescer score anything still queued
+    import app
+    app.shutdown()
@@ -0,0 +1,286 @@
+"""
+Materialized occupancy table for the ML service
+
+Apart from the POI counts, every model input has a small finite domain:
+slot_type, weather and event_type come from the fitted encoders, hour is
+0-23 and weekday is 0-6. For a fixed set of POI profiles the whole grid can
+be scored once into a float32 array, so that /predict becomes an array index.
+Anything outside the grid (unknown label, fractional hour, new POI profile)
+falls through to the live model.
+"""
+import itertools
+import json
+import threading
+import time
+from collections import Counter
+from typing import Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+from ml_predictor import format_predictions
+
+TIME_AXES = {'hour': list(range(24)), 'weekday': list(range(7))}
+
+# Observed POI profiles kept for materializing "what traffic actually asks for"
+MAX_TRACKED_PROFILES = 1000
+
+
+class MaterializedTable:
+    """P(occupied) for every (profile, categoricals..., hour, weekday) cell"""
+
+    def __init__(self, categorical_axes: Dict[str, List[str]], profile_columns: List[str],
+                 profiles: List[tuple], values: np.ndarray, model_version: str):
+        """
+        Args:
+            categorical_axes: column -> labels, in grid axis order
+            profile_columns: numeric inputs that make up a POI profile
+            profiles: one tuple of ints per row of the first axis
+            values: float32 array of shape (profiles, *categoricals, 24, 7)
+            model_version: version of the model the values were computed with
+        """
+        self.categorical_axes = categorical_axes
+        self.profile_columns = profile_columns
+        self.profiles = [tuple(int(v) for v in profile) for profile in profiles]
+        self.values = values
+        self.model_version = model_version
+
+        self._profile_index = {profile: i for i, profile in enumerate(self.profiles)}
+        self._label_index = {
+            col: {label: i for i, label in enumerate(labels)}
+            for col, labels in categorical_axes.items()
+        }
+
+    @classmethod
+    def build(cls, predictor, profiles: Sequence[Sequence[int]], model_version: str,
+              chunk_size: int = 50_000) -> 'MaterializedTable':
+        """Score the full grid for the given POI profiles with the live model"""
+        categorical_axes = {
+            col: predictor.encoders[col].classes.tolist()
+            for col in predictor.categorical_inputs
+        }
+        profile_columns = [col for col in predictor.numeric_inputs if col not in TIME_AXES]
+        profiles = sorted({tuple(int(v) for v in profile) for profile in profiles})
+
+        axis_values = [range(len(profiles))] + list(categorical_axes.values()) + list(TIME_AXES.values())
+        axis_names = ['_profile'] + list(categorical_axes) + list(TIME_AXES)
+        shape = tuple(len(values) for values in axis_values)
+
+        flat = np.empty(int(np.prod(shape)), dtype=np.float32)
+        cells = itertools.product(*axis_values)
+        offset = 0
+        while offset < len(flat):
+            spots = []
+            for cell in itertools.islice(cells, chunk_size):
+                spot = dict(zip(axis_names[1:], cell[1:]))
+                spot.update(zip(profile_columns, profiles[cell[0]]))
+                spots.append(spot)
+            flat[offset:offset + len(spots)] = predictor.predict_occupied_probabilities(spots)
+            offset += len(spots)
+
+        return cls(categorical_axes, profile_columns, profiles, flat.reshape(shape), model_version)
+
+    def lookup(self, spot: Dict) -> Optional[float]:
+        """P(occupied) for a spot, or None if it is outside the grid"""
+        try:
+            index = [self._profile_index[tuple(_as_int(spot.get(col, 0)) for col in self.profile_columns)]]
+            for col, labels in self._label_index.items():
+                index.append(labels[spot[col]])
+            for col, values in TIME_AXES.items():
+                value = _as_int(spot[col])
+                if not 0 <= value < len(values):
+                    return None
+                index.append(value)
+        except (KeyError, TypeError, ValueError):
+            return None
+        return float(self.values[tuple(index)])
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path,
+            values=self.values,
+            profiles=np.array(self.profiles, dtype=np.int64).reshape(len(self.profiles), len(self.profile_columns)),
+            meta=np.array(json.dumps({
+                'categorical_axes': self.categorical_axes,
+                'profile_columns': self.profile_columns,
+                'model_version': self.model_version,
+            }))
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'MaterializedTable':
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            return cls(meta['categorical_axes'], meta['profile_columns'],
+                       [tuple(row) for row in data['profiles'].tolist()],
+                       data['values'], meta['model_version'])
+
+    def stats(self) -> Dict:
+        return {
+            'profiles': len(self.profiles),
+            'cells': int(self.values.size),
+            'bytes': int(self.values.nbytes),
+            'model_version': self.model_version,
+        }
+
+
+def _as_int(value) -> int:
+    """Integer value of an input; raises ValueError unless it is integral"""
+    if isinstance(value, bool) or value is None:
+        raise ValueError(value)
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(value)
+    return int(number)
+
+
+class MaterializedPredictor:
+    """
+    Answers predictions from a MaterializedTable, falling back to the live path
+
+    The table is dropped (everything falls back) as soon as the model version
+    no longer matches the one it was built with.
+    """
+
+    def __init__(self, predictor, model_predictor, version_check, table: Optional[MaterializedTable] = None):
+        """
+        Args:
+            predictor: Fallback for spots outside the grid (e.g. CachedPredictor)
+            model_predictor: ParkingMLPredictor used to build tables
+            version_check: ModelVersionCheck for the model files
+            table: Initial table, if one was loaded or built at startup
+        """
+        self.predictor = predictor
+        self.model_predictor = model_predictor
+        self.version_check = version_check
+        self.table = table
+        self.profile_columns = [col for col in model_predictor.numeric_inputs if col not in TIME_AXES]
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.fallbacks = 0
+        self.observed_profiles: Counter = Counter()
+
+    def predict_occupancy(self, parking_data: Dict) -> Dict:
+        table = self._current_table()
+        prob = table.lookup(parking_data) if table and isinstance(parking_data, dict) else None
+        if prob is not None:
+            self._count(hits=1)
+            return format_predictions(np.array([prob]))[0]
+
+        self._count(fallbacks=1, spots=[parking_data])
+        return self.predictor.predict_occupancy(parking_data)
+
+    def batch_predict(self, parking_spots: List[Dict]) -> List[Dict]:
+        table = self._current_table()
+        results: List[Optional[Dict]] = [None] * len(parking_spots)
+        hit_rows, hit_probs, misses = [], [], []
+        for i, spot in enumerate(parking_spots):
+            prob = table.lookup(spot) if table and isinstance(spot, dict) else None
+            if prob is None:
+                misses.append(i)
+            else:
+                hit_rows.append(i)
+                hit_probs.append(prob)
+
+        for i, prediction in zip(hit_rows, format_predictions(np.array(hit_probs, dtype=np.float64))):
+            prediction['spot_id'] = parking_spots[i].get('spot_id', 'unknown')
+            results[i] = prediction
+
+        if misses:
+            fallback = self.predictor.batch_predict([parking_spots[i] for i in misses])
+            for i, prediction in zip(misses, fallback):
+                results[i] = prediction
+
+        self._count(hits=len(hit_rows), fallbacks=len(misses), spots=[parking_spots[i] for i in misses])
+        return results
+
+    def encoding_stats(self) -> Dict:
+        return self.predictor.encoding_stats()
+
+    def materialize(self, profiles: Optional[Sequence[Sequence[int]]] = None,
+                    path: Optional[str] = None, top_observed: int = 50) -> MaterializedTable:
+        """
+        Build a new table and swap it in
+
+        Args:
+            profiles: POI profiles to include; defaults to the most frequently
+                observed profiles among fallback requests plus the current table's
+            path: If given, the table is also persisted there
+            top_observed: How many observed profiles to add when profiles is None
+        """
+        if profiles is None:
+            with self._lock:
+                profiles = [profile for profile, _ in self.observed_profiles.most_common(top_observed)]
+            if self.table is not None:
+                profiles += self.table.profiles
+        if not profiles:
+            raise ValueError("No POI profiles to materialize")
+
+        start = time.perf_counter()
+        table = MaterializedTable.build(self.model_predictor, profiles, _version_string(self.version_check.version))
+        if path:
+            table.save(path)
+        self.table = table
+        print(f"🧮 Materialized {table.values.size} cells for {len(table.profiles)} POI profiles "
+              f"in {time.perf_counter() - start:.2f}s")
+        return table
+
+    def parse_profiles(self, raw_profiles: Sequence) -> List[tuple]:
+        """Accept profiles as lists of ints or as dicts keyed by profile column"""
+        return [
+            tuple(profile.get(col, 0) for col in self.profile_columns) if isinstance(profile, dict) else tuple(profile)
+            for profile in raw_profiles
+        ]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.fallbacks
+            return {
+                'enabled': self.table is not None,
+                'table': self.table.stats() if self.table else None,
+                'hits': self.hits,
+                'fallbacks': self.fallbacks,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'observed_profiles': len(self.observed_profiles),
+            }
+
+    def _current_table(self) -> Optional[MaterializedTable]:
+        if self.version_check.changed() and self.table is not None:
+            self.table = None
+            print("♻️  Model changed on disk, materialized table dropped (serving live predictions)")
+        return self.table
+
+    def _count(self, hits: int = 0, fallbacks: int = 0, spots: Sequence = ()):
+        with self._lock:
+            self.hits += hits
+            self.fallbacks += fallbacks
+            for spot in spots:
+                profile = _profile_of(spot, self.profile_columns)
+                if profile is not None and (profile in self.observed_profiles
+                                            or len(self.observed_profiles) < MAX_TRACKED_PROFILES):
+                    self.observed_profiles[profile] += 1
+
+
+def _profile_of(spot, profile_columns: List[str]) -> Optional[tuple]:
+    if not isinstance(spot, dict):
+        return None
+    try:
+        return tuple(_as_int(spot.get(col, 0)) for col in profile_columns)
+    except (TypeError, ValueError):
+        return None
+
+
+def _version_string(version: Hashable) -> str:
+    return json.dumps(version, default=str)
+
+
+def load_table(path: str, version: Hashable) -> Optional[MaterializedTable]:
+    """Load a persisted table if it exists and matches the current model version"""
+    try:
+        table = MaterializedTable.load(path)
+    except (OSError, KeyError, ValueError):
+        return None
+    if table.model_version != _version_string(version):
+        print(f"⚠️  Materialized table at {path} was built for another model version, ignoring it")
+        return None
+    return table
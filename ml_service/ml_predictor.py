@@ -4,21 +4,57 @@ Serves the trained XGBoost model via Flask API
 """
 import os
 import numpy as np
-import pandas as pd
-import xgboost as xgb
-import joblib
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from parking_common.encoding import compile_encoders, load_encoder_table, save_encoder_table
+from parking_common.inference_backends import XGBoostBackend, load_backend
+
+# Columns that are filled with 0 when missing, as done at training time
+NUMERICAL_COLS = ['poi_office_count', 'poi_restaurant_count', 'poi_store_count']
+
+# Cyclical time features: model column -> (input column, period, function)
+CYCLICAL_SOURCES = {
+    'hour_sin': ('hour', 24.0, np.sin),
+    'hour_cos': ('hour', 24.0, np.cos),
+    'weekday_sin': ('weekday', 7.0, np.sin),
+    'weekday_cos': ('weekday', 7.0, np.cos),
+}
+
+# Marks an input key that was not provided at all (as opposed to None)
+_ABSENT = object()
 
 class ParkingMLPredictor:
     def __init__(self, model_path: str, model_data_path: str):
-        """Initialize the ML predictor with trained model and preprocessors"""
+        """
+        Initialize the ML predictor with trained model and preprocessors
+        
+        Args:
+            model_path: XGBoost model, as JSON or binary UBJ (.ubj)
+            model_data_path: Either the joblib file with the fitted LabelEncoders
+                or a flat encoder table (.json) written by save_artifacts
+        """
+        # Imported here so that importing this module stays cheap (xgboost
+        # pulls in scikit-learn and takes about a second)
+        import xgboost as xgb
+        
         self.model = xgb.XGBClassifier()
         self.model.load_model(model_path)
+        self.backend = XGBoostBackend(self.model)
+        
+        if model_data_path.endswith('.json'):
+            self.encoders, self.model_columns = load_encoder_table(model_data_path)
+        else:
+            import joblib
+            model_data = joblib.load(model_data_path)
+            self.encoders = compile_encoders(model_data['encoders'])
+            self.model_columns = model_data['model_columns']
         
-        model_data = joblib.load(model_data_path)
-        self.encoders = model_data['encoders']
-        self.model_columns = model_data['model_columns']
+        self.categorical_inputs = [col for col in self.model_columns if col in self.encoders]
+        self.numeric_inputs = []
+        for col in self.model_columns:
+            source = CYCLICAL_SOURCES[col][0] if col in CYCLICAL_SOURCES else col
+            if col not in self.encoders and source not in self.numeric_inputs:
+                self.numeric_inputs.append(source)
         
         print(f"✅ Model loaded successfully from {model_path}")
         print(f"✅ Model data loaded from {model_data_path}")
@@ -46,52 +82,11 @@ class ParkingMLPredictor:
                 - confidence: float (0-1)
         """
         try:
-            # Create DataFrame from input
-            df_sample = pd.DataFrame([parking_data])
-            
-            # Feature engineering - cyclical encoding
-            if 'hour' in df_sample.columns:
-                df_sample['hour_sin'] = np.sin(2 * np.pi * df_sample['hour'] / 24.0)
-                df_sample['hour_cos'] = np.cos(2 * np.pi * df_sample['hour'] / 24.0)
-            
-            if 'weekday' in df_sample.columns:
-                df_sample['weekday_sin'] = np.sin(2 * np.pi * df_sample['weekday'] / 7.0)
-                df_sample['weekday_cos'] = np.cos(2 * np.pi * df_sample['weekday'] / 7.0)
-            
-            # Encode categorical features
-            for col, le in self.encoders.items():
-                if col in df_sample.columns:
-                    df_sample[col] = df_sample[col].fillna('missing')
-                    # Handle unknown categories
-                    try:
-                        df_sample[col] = le.transform(df_sample[col])
-                    except ValueError as e:
-                        print(f"⚠️  Unknown category in {col}: {df_sample[col].values[0]}, using 'missing'")
-                        df_sample[col] = le.transform(['missing'])
-            
-            # Fill numerical columns
-            numerical_cols = ['poi_office_count', 'poi_restaurant_count', 'poi_store_count']
-            for col in numerical_cols:
-                if col in df_sample.columns:
-                    df_sample[col] = df_sample[col].fillna(0)
+            features, errors = self._build_feature_matrix([parking_data])
+            if errors:
+                raise ValueError(errors[0])
             
-            # Reindex to match model columns
-            df_pred = df_sample.reindex(columns=self.model_columns, fill_value=0)
-            
-            # Make prediction
-            probabilities = self.model.predict_proba(df_pred)
-            prob_free = float(probabilities[0][0])
-            prob_occupied = float(probabilities[0][1])
-            
-            prediction = 'OCCUPIED' if prob_occupied > 0.5 else 'FREE'
-            confidence = max(prob_free, prob_occupied)
-            
-            return {
-                'prob_free': prob_free,
-                'prob_occupied': prob_occupied,
-                'prediction': prediction,
-                'confidence': confidence
-            }
+            return format_predictions(self.backend.predict(features))[0]
         
         except Exception as e:
             print(f"❌ Prediction error: {str(e)}")
@@ -101,29 +96,184 @@ class ParkingMLPredictor:
         """
         Predict occupancy for multiple parking spots
         
+        All valid spots are encoded into a single feature matrix and scored
+        with one model call. Spots that cannot be encoded get an
+        'UNKNOWN' result with an error message instead of failing the batch.
+        
         Args:
             parking_spots: List of parking spot data dicts
         
         Returns:
-            List of prediction results
+            List of prediction results, in the same order as parking_spots
         """
+        features, errors = self._build_feature_matrix(parking_spots)
+        
+        valid_rows = [i for i in range(len(parking_spots)) if i not in errors]
+        predictions = []
+        if valid_rows:
+            if errors:
+                features = features[valid_rows]
+            predictions = format_predictions(self.backend.predict(features))
+        
         results = []
-        for spot in parking_spots:
-            try:
-                prediction = self.predict_occupancy(spot)
-                prediction['spot_id'] = spot.get('spot_id', 'unknown')
-                results.append(prediction)
-            except Exception as e:
+        scored = iter(predictions)
+        for i, spot in enumerate(parking_spots):
+            spot_id = spot.get('spot_id', 'unknown') if isinstance(spot, dict) else 'unknown'
+            if i in errors:
                 results.append({
-                    'spot_id': spot.get('spot_id', 'unknown'),
-                    'error': str(e),
+                    'spot_id': spot_id,
+                    'error': errors[i],
                     'prob_free': 0.5,  # Default neutral probability
                     'prob_occupied': 0.5,
                     'prediction': 'UNKNOWN',
                     'confidence': 0.0
                 })
+            else:
+                prediction = next(scored)
+                prediction['spot_id'] = spot_id
+                results.append(prediction)
         
         return results
+    
+    def predict_occupied_probabilities(self, parking_spots: List[Dict]) -> np.ndarray:
+        """
+        Raw P(occupied) for each spot, as a float32 array
+        
+        Raises ValueError if any spot cannot be encoded.
+        """
+        features, errors = self._build_feature_matrix(parking_spots)
+        if errors:
+            row, message = next(iter(errors.items()))
+            raise ValueError(f"Spot {row}: {message}")
+        return self.backend.predict(features)
+    
+    def _build_feature_matrix(self, parking_spots: List[Dict]) -> Tuple[np.ndarray, Dict[int, str]]:
+        """
+        Build the model feature matrix for a list of spots, column by column
+        
+        Mirrors the training preprocessing: cyclical hour/weekday encoding,
+        'missing' for empty categoricals, 0 for empty POI counts and 0 for any
+        model column the input does not provide. Unseen categories go to the
+        encoder's unknown bucket (see parking_common/encoding.py).
+        
+        Returns:
+            (features, errors) where errors maps row index -> error message.
+            Rows listed in errors are left as zeros in the matrix.
+        """
+        n_rows = len(parking_spots)
+        features = np.zeros((n_rows, len(self.model_columns)), dtype=np.float64)
+        errors: Dict[int, str] = {}
+        
+        for i, spot in enumerate(parking_spots):
+            if not isinstance(spot, dict):
+                errors[i] = f"Invalid spot data: expected an object, got {type(spot).__name__}"
+        rows = [spot if isinstance(spot, dict) else {} for spot in parking_spots]
+        
+        for col_idx, col in enumerate(self.model_columns):
+            if col in self.encoders:
+                features[:, col_idx] = self._encode_column(col, rows)
+            elif col in CYCLICAL_SOURCES:
+                source, period, func = CYCLICAL_SOURCES[col]
+                values, present = self._numeric_column(source, rows, errors)
+                features[:, col_idx] = np.where(present, func(2 * np.pi * values / period), 0.0)
+            else:
+                values, present = self._numeric_column(col, rows, errors)
+                if col in NUMERICAL_COLS:
+                    values = np.nan_to_num(values, nan=0.0)
+                features[:, col_idx] = np.where(present, values, 0.0)
+        
+        return features, errors
+    
+    def _numeric_column(self, col: str, rows: List[Dict], errors: Dict[int, str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Collect a numeric input column; None becomes NaN, absent keys are flagged"""
+        raw = [row.get(col, _ABSENT) for row in rows]
+        present = np.array([value is not _ABSENT for value in raw], dtype=bool)
+        cleaned = [None if value is _ABSENT else value for value in raw]
+        try:
+            return np.asarray(cleaned, dtype=np.float64), present
+        except (TypeError, ValueError):
+            pass
+        
+        # Slow path only when some row holds a non-numeric value
+        values = np.full(len(rows), np.nan, dtype=np.float64)
+        for i, value in enumerate(cleaned):
+            try:
+                values[i] = np.nan if value is None else float(value)
+            except (TypeError, ValueError):
+                errors.setdefault(i, f"Invalid value for {col}: {value!r}")
+        return values, present
+    
+    def _encode_column(self, col: str, rows: List[Dict]) -> np.ndarray:
+        """Encode a categorical column for all rows with one table gather"""
+        present_rows = []
+        labels = []
+        for i, row in enumerate(rows):
+            value = row.get(col, _ABSENT)
+            if value is not _ABSENT:
+                present_rows.append(i)
+                labels.append('missing' if value is None else str(value))
+        
+        # Columns the input does not provide stay 0, like reindex(fill_value=0)
+        codes = np.zeros(len(rows), dtype=np.float64)
+        if labels:
+            codes[present_rows] = self.encoders[col].encode(labels)
+        return codes
+    
+    def encoding_stats(self) -> Dict:
+        """Per-column encoder counters (rows encoded, unknown labels seen)"""
+        return {col: encoder.stats() for col, encoder in self.encoders.items()}
+    
+    def use_backend(self, name: str, cache_dir: Optional[str] = None, nthread: int = 1,
+                    max_rows: Optional[int] = None, sample_rows: int = 1000):
+        """
+        Switch model scoring to another inference backend (see parking_common/inference_backends.py)
+    
+        The backend is checked against xgboost on sample_rows random spots
+        first; if it is unavailable or does not match, xgboost stays in use.
+        Batches above max_rows keep going to xgboost.
+        """
+        self.backend = load_backend(name, self.model, self.parity_sample(sample_rows),
+                                    cache_dir=cache_dir, nthread=nthread, max_rows=max_rows)
+        return self.backend.info
+    
+    def save_artifacts(self, model_path: str, table_path: str):
+        """Write the startup-optimized artifacts: binary UBJ booster and flat encoder table"""
+        self.model.save_model(model_path)
+        save_encoder_table(table_path, self.encoders, self.model_columns)
+    
+    def parity_sample(self, rows: int, seed: int = 0) -> np.ndarray:
+        """
+        Random feature rows for backend parity checks
+    
+        Built directly from encoder codes (every class plus the unknown code)
+        and valid hour/weekday/POI values, so the encoder counters are untouched.
+        """
+        rng = np.random.default_rng(seed)
+        features = np.zeros((rows, len(self.model_columns)), dtype=np.float64)
+        for col_idx, col in enumerate(self.model_columns):
+            if col in self.encoders:
+                encoder = self.encoders[col]
+                codes = np.append(np.arange(len(encoder.classes), dtype=np.float64), encoder.unknown_code)
+                features[:, col_idx] = rng.choice(codes, rows)
+            elif col in CYCLICAL_SOURCES:
+                _, period, func = CYCLICAL_SOURCES[col]
+                features[:, col_idx] = func(2 * np.pi * rng.integers(0, int(period), rows) / period)
+            else:
+                features[:, col_idx] = rng.integers(0, 60, rows)
+        return features
+    
+def format_predictions(prob_occupied: np.ndarray) -> List[Dict]:
+    """Turn a vector of occupied probabilities into result dicts"""
+    results = []
+    for occupied in prob_occupied.astype(np.float64).tolist():
+        free = 1.0 - occupied
+        results.append({
+            'prob_free': free,
+            'prob_occupied': occupied,
+            'prediction': 'OCCUPIED' if occupied > 0.5 else 'FREE',
+            'confidence': max(free, occupied)
+        })
+    return results
 
 def get_current_context() -> Dict:
     """
@@ -0,0 +1,247 @@
+"""
+Prediction result cache for the ML service
+
+The model inputs are a handful of categoricals plus small integer counts
+(hour, weekday, POI counts), so identical feature tuples repeat constantly,
+especially from mobile polling. CachedPredictor answers those from a bounded
+LRU/TTL cache and only sends misses to the model.
+"""
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional
+
+# Placeholder for inputs that were not sent at all. It must stay distinct
+# from None, which the predictor encodes as 'missing' rather than 0.
+_ABSENT = object()
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with per-entry TTL and hit/miss/eviction counters"""
+
+    def __init__(self, max_entries: int = 50_000, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        """Return a copy of the cached value, or None on miss/expiry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def put(self, key: Hashable, value: Dict):
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry (used when the model changes)"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
+
+
+def file_signature(*paths: str) -> tuple:
+    """(mtime_ns, size) of each file; changes whenever a file is rewritten"""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+class ModelVersionCheck:
+    """Polls a model version function at most once per interval"""
+
+    def __init__(self, model_version: Callable[[], Hashable], check_interval: float = 1.0):
+        self.model_version = model_version
+        self.check_interval = check_interval
+        self.version = model_version()
+        self._next_check = time.monotonic() + check_interval
+        self._lock = threading.Lock()
+
+    def changed(self) -> bool:
+        """True once for every change of model_version()"""
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        with self._lock:
+            if now < self._next_check:
+                return False
+            self._next_check = now + self.check_interval
+            version = self.model_version()
+            if version == self.version:
+                return False
+            self.version = version
+            return True
+
+
+class CachedPredictor:
+    """
+    Serves predict_occupancy/batch_predict from a PredictionCache
+
+    Integral numeric inputs (hour, weekday, POI counts) are keyed as ints, so
+    14 and 14.0 share an entry. A spot with a non-integral value (hour 14.6)
+    bypasses the cache and is scored as sent, so a cached answer is always
+    exactly what the model returns for the request.
+    """
+
+    def __init__(self, predictor, cache: PredictionCache,
+                 model_version: Callable[[], Hashable], check_interval: float = 1.0):
+        """
+        Args:
+            predictor: ParkingMLPredictor (or anything with the same interface)
+            cache: Cache to read and fill
+            model_version: Returns a value that changes when the model changes;
+                the cache is cleared whenever it does
+            check_interval: Minimum seconds between model_version calls
+        """
+        self.predictor = predictor
+        self.cache = cache
+        self.version_check = ModelVersionCheck(model_version, check_interval)
+
+    def predict_occupancy(self, parking_data: Dict) -> Dict:
+        self._check_model_version()
+        key, normalized = self._cache_key(parking_data)
+        if key is None:
+            return self.predictor.predict_occupancy(parking_data)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        prediction = self.predictor.predict_occupancy(normalized)
+        self.cache.put(key, prediction)
+        return prediction
+
+    def batch_predict(self, parking_spots: List[Dict]) -> List[Dict]:
+        self._check_model_version()
+        results: List[Optional[Dict]] = [None] * len(parking_spots)
+
+        # Misses are grouped by key so repeated spots in one batch are scored once
+        pending: 'OrderedDict[Hashable, List[int]]' = OrderedDict()
+        pending_spots = []
+        uncacheable = []
+        for i, spot in enumerate(parking_spots):
+            key, normalized = self._cache_key(spot)
+            if key is None:
+                uncacheable.append(i)
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                cached['spot_id'] = spot.get('spot_id', 'unknown')
+                results[i] = cached
+            elif key in pending:
+                pending[key].append(i)
+            else:
+                pending[key] = [i]
+                pending_spots.append(normalized)
+
+        if pending_spots:
+            for (key, rows), prediction in zip(pending.items(), self.predictor.batch_predict(pending_spots)):
+                prediction.pop('spot_id', None)
+                if 'error' not in prediction:
+                    self.cache.put(key, prediction)
+                for i in rows:
+                    results[i] = dict(prediction, spot_id=parking_spots[i].get('spot_id', 'unknown'))
+
+        if uncacheable:
+            for i, prediction in zip(uncacheable, self.predictor.batch_predict([parking_spots[i] for i in uncacheable])):
+                results[i] = prediction
+
+        return results
+
+    def encoding_stats(self) -> Dict:
+        return self.predictor.encoding_stats()
+
+    def _check_model_version(self):
+        """Clear the cache if the model changed since the last check"""
+        if self.version_check.changed():
+            self.cache.clear()
+            print("♻️  Model changed on disk, prediction cache cleared")
+
+    def _cache_key(self, spot):
+        """
+        Build (key, normalized_spot) for a request
+
+        Returns (None, None) when the spot cannot be keyed (not a dict, or a
+        non-numeric or non-integral value in a numeric input); those go
+        straight to the model, unchanged, which scores them or reports the
+        error.
+        """
+        if not isinstance(spot, dict):
+            return None, None
+
+        normalized = {}
+        key = []
+        for col in self.predictor.categorical_inputs:
+            value = spot.get(col, _ABSENT)
+            if value is _ABSENT:
+                key.append(_ABSENT)
+            else:
+                value = None if value is None else str(value)
+                normalized[col] = value
+                key.append(value)
+
+        for col in self.predictor.numeric_inputs:
+            value = spot.get(col, _ABSENT)
+            if value is _ABSENT or value is None:
+                key.append(value)
+                if value is None:
+                    normalized[col] = None
+                continue
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                return None, None
+            if not math.isfinite(number) or not number.is_integer():
+                return None, None
+            value = int(number)
+            normalized[col] = value
+            key.append(value)
+
+        return tuple(key), normalized
@@ -0,0 +1,41 @@
+"""
+ML service wrappers around the shared ShadowScorer (parking_common/shadow.py)
+
+ShadowPredictor sits in the predictor chain, answers every call with the
+primary model and offers the inputs and P(occupied) results to the scorer.
+"""
+import time
+from typing import Dict
+
+from parking_common.shadow import ShadowScorer
+
+
+def prob_occupied(results) -> list:
+    """P(occupied) of each batch_predict result, NaN for results with an error"""
+    return [float('nan') if 'error' in result else result['prob_occupied'] for result in results]
+
+
+class ShadowPredictor:
+    """Passes predictions through unchanged and offers each call to a ShadowScorer"""
+
+    def __init__(self, predictor, scorer: ShadowScorer):
+        self.predictor = predictor
+        self.scorer = scorer
+
+    def __getattr__(self, name):
+        # Delegates like RequestCoalescer.__getattr__ (coalescer.py)
+        if name == 'predictor':
+            raise AttributeError(name)
+        return getattr(self.predictor, name)
+
+    def predict_occupancy(self, parking_data: Dict) -> Dict:
+        start = time.perf_counter()
+        result = self.predictor.predict_occupancy(parking_data)
+        self.scorer.submit([parking_data], [result['prob_occupied']], (time.perf_counter() - start) * 1e3)
+        return result
+
+    def batch_predict(self, parking_spots: list) -> list:
+        start = time.perf_counter()
+        results = self.predictor.batch_predict(parking_spots)
+        self.scorer.submit(parking_spots, prob_occupied(results), (time.perf_counter() - start) * 1e3)
+        return results
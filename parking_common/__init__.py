@@ -0,0 +1,7 @@
+"""
+Code shared by the ML service (ml_service/) and the prediction service (OpenCV(YOLO)/)
+
+Each service directory holds a relative symlink to this package, so both
+import it as `parking_common` from their own working directory and run
+the same source.
+"""
@@ -0,0 +1,200 @@
+"""
+Compiled categorical encoders for both services
+
+Fitted sklearn LabelEncoders are turned into plain lookup tables once, at
+model load time. Encoding a batch is then a single searchsorted/gather over
+NumPy arrays instead of a LabelEncoder.transform call per request, and
+unseen labels go to an explicit unknown bucket instead of raising.
+
+Codes are the ones the LabelEncoder produced at training time: a label's
+code is its position in classes_. The searchsorted lookup runs over a
+sorted copy of the labels and maps positions back through the sort
+permutation, so it also holds when str(label) sorts differently from the
+fitted classes (e.g. integers 2, 3, 10 against "10" < "2" < "3").
+"""
+import json
+import os
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Label that the training notebook substitutes for empty categoricals
+MISSING_LABEL = 'missing'
+
+# How many distinct unknown labels to remember per column for /stats
+MAX_TRACKED_UNKNOWN_LABELS = 20
+
+# Version of the JSON table written by save_encoder_table. Tables without it
+# (or with an older one) stored classes in str-sorted order, not classes_
+# order, and are not loaded.
+TABLE_FORMAT = 2
+
+
+class CompiledEncoder:
+    """Lookup-table version of a fitted LabelEncoder for one column"""
+
+    def __init__(self, column: str, classes: Iterable, unknown_code: float):
+        """
+        Args:
+            column: Feature name, used in stats
+            classes: Known labels in code order (LabelEncoder.classes_);
+                a label's code is its position here
+            unknown_code: Value emitted for labels not in classes
+        """
+        self.column = column
+        self.classes = np.array([str(label) for label in classes], dtype=np.str_)
+        self.table = {label: code for code, label in enumerate(self.classes.tolist())}
+        if len(self.table) != len(self.classes):
+            raise ValueError(f"Encoder for {column!r} has labels that are equal as strings")
+        self.unknown_code = float(unknown_code)
+
+        # Sorted labels for searchsorted, and the code of each sorted label
+        order = np.argsort(self.classes, kind='stable')
+        self._sorted_classes = self.classes[order]
+        self._sorted_codes = order.astype(np.float64)
+
+        self._lock = threading.Lock()
+        self.encoded_count = 0
+        self.unknown_count = 0
+        self.unknown_labels: Counter = Counter()
+
+    @classmethod
+    def from_label_encoder(cls, column: str, label_encoder) -> 'CompiledEncoder':
+        """
+        Compile a fitted LabelEncoder
+
+        Unknown labels reuse the 'missing' code when the encoder was fitted
+        with one. Otherwise they are encoded as NaN so the booster follows
+        its learned default (missing-value) branch.
+
+        Raises:
+            ValueError: If the compiled codes differ from label_encoder.transform
+        """
+        classes = [str(label) for label in label_encoder.classes_]
+        unknown_code = classes.index(MISSING_LABEL) if MISSING_LABEL in classes else np.nan
+        encoder = cls(column, classes, unknown_code)
+
+        expected = np.asarray(label_encoder.transform(label_encoder.classes_), dtype=np.float64)
+        batch, known = encoder._lookup(encoder.classes)
+        single = np.array([encoder.table[label] for label in classes], dtype=np.float64)
+        if not known.all() or not np.array_equal(batch, expected) or not np.array_equal(single, expected):
+            raise ValueError(f"Compiled encoder for {column!r} does not reproduce LabelEncoder.transform")
+        return encoder
+
+    def _lookup(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(codes, known mask) for an array of str labels, without touching the counters"""
+        if len(self.classes) == 0:
+            return np.full(len(values), self.unknown_code, dtype=np.float64), np.zeros(len(values), dtype=bool)
+        positions = np.minimum(np.searchsorted(self._sorted_classes, values), len(self.classes) - 1)
+        known = self._sorted_classes[positions] == values
+        return np.where(known, self._sorted_codes[positions], self.unknown_code), known
+
+    def encode(self, labels: List[str]) -> np.ndarray:
+        """Encode a batch of labels into a float64 array of codes"""
+        values = np.asarray(labels, dtype=np.str_)
+        codes, known = self._lookup(values)
+        self._record(len(values), values[~known])
+        return codes
+
+    def encode_one(self, label: str) -> float:
+        """Encode a single label with a dict lookup"""
+        label = str(label)
+        code = self.table.get(label)
+        if code is None:
+            self._record(1, [label])
+            return self.unknown_code
+        self._record(1)
+        return float(code)
+
+    def decode(self, code: float) -> Optional[str]:
+        """Label for a code, or None for the unknown bucket when it is not a class"""
+        if np.isnan(code) or not 0 <= code < len(self.classes):
+            return None
+        return str(self.classes[int(code)])
+
+    def _record(self, total: int, unknown_values=()):
+        """Update counters; called once per batch, never per row"""
+        with self._lock:
+            self.encoded_count += total
+            if len(unknown_values) == 0:
+                return
+            self.unknown_count += len(unknown_values)
+            labels, counts = np.unique(np.asarray(unknown_values, dtype=np.str_), return_counts=True)
+            for label, count in zip(labels.tolist(), counts.tolist()):
+                if label in self.unknown_labels or len(self.unknown_labels) < MAX_TRACKED_UNKNOWN_LABELS:
+                    self.unknown_labels[label] += count
+
+    def stats(self) -> Dict:
+        """Counters for monitoring"""
+        with self._lock:
+            return {
+                'classes': len(self.classes),
+                'encoded': self.encoded_count,
+                'unknown': self.unknown_count,
+                'unknown_code': None if np.isnan(self.unknown_code) else self.unknown_code,
+                'top_unknown_labels': dict(self.unknown_labels.most_common(5)),
+            }
+
+
+def compile_encoders(label_encoders: Dict) -> Dict[str, CompiledEncoder]:
+    """Compile every LabelEncoder from a model artifact"""
+    return {
+        column: CompiledEncoder.from_label_encoder(column, le)
+        for column, le in label_encoders.items()
+    }
+
+
+def save_encoder_table(path: str, encoders: Dict[str, CompiledEncoder], model_columns: Optional[List[str]] = None):
+    """
+    Write compiled encoders (and the feature order, if given) as a flat JSON table
+
+    Loading it needs neither pickle/joblib nor scikit-learn, unlike the
+    fitted LabelEncoders it was compiled from.
+    """
+    table = {
+        'format': TABLE_FORMAT,
+        'model_columns': None if model_columns is None else list(model_columns),
+        'encoders': {
+            column: {
+                'classes': encoder.classes.tolist(),
+                'unknown_code': None if np.isnan(encoder.unknown_code) else encoder.unknown_code,
+            }
+            for column, encoder in encoders.items()
+        },
+    }
+    with open(path, 'w') as f:
+        json.dump(table, f)
+
+
+def encoder_table_current(path: str) -> bool:
+    """True if path holds a table in the current format (False for older or unreadable files)"""
+    if not os.path.exists(path):
+        return False
+    try:
+        with open(path) as f:
+            return json.load(f).get('format') == TABLE_FORMAT
+    except (OSError, ValueError, AttributeError):
+        return False
+
+
+def load_encoder_table(path: str) -> Tuple[Dict[str, CompiledEncoder], Optional[List[str]]]:
+    """
+    Read a table written by save_encoder_table: (encoders, model_columns)
+
+    Raises:
+        ValueError: If the table was written in an older format
+    """
+    with open(path) as f:
+        table = json.load(f)
+    if not isinstance(table, dict) or table.get('format') != TABLE_FORMAT:
+        raise ValueError(f"{path} is not a format {TABLE_FORMAT} encoder table; re-export it")
+    encoders = {
+        column: CompiledEncoder(
+            column, spec['classes'],
+            np.nan if spec['unknown_code'] is None else spec['unknown_code']
+        )
+        for column, spec in table['encoders'].items()
+    }
+    return encoders, table['model_columns']
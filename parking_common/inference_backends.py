@@ -0,0 +1,217 @@
+"""
+Pluggable inference backends for the XGBoost models of both services
+
+The xgboost Python wrapper costs a few hundred microseconds per call no
+matter how few rows are scored, which dominates single-spot predictions.
+The same booster can instead be compiled to a native shared library with
+Treelite (tl2cgen) or exported to ONNX Runtime. A backend is only used
+after its predictions match xgboost on a sample of rows; otherwise the
+predictor stays on xgboost.
+
+Backends:
+    xgboost   predict_proba / predict on the loaded model (default)
+    treelite  compiled .so, cached on disk per booster (needs tl2cgen and a C compiler)
+    onnx      ONNX Runtime CPU session (needs onnxruntime and onnxmltools)
+"""
+import copy
+import hashlib
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+BACKENDS = ('xgboost', 'treelite', 'onnx')
+
+# Largest accepted |backend - xgboost| on the parity sample. Every backend
+# evaluates the trees in float32, so only summation order differs.
+PARITY_TOLERANCE = 1e-5
+
+
+class XGBoostBackend:
+    """Scores through the xgboost sklearn wrapper"""
+    name = 'xgboost'
+
+    def __init__(self, model):
+        self.model = model
+        self.is_classifier = _is_classifier(model)
+        self.info = _info('xgboost', 'xgboost')
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """P(positive class) for classifiers, the prediction for regressors"""
+        if self.is_classifier:
+            return self.model.predict_proba(features)[:, 1]
+        return self.model.predict(features)
+
+
+class TreeliteBackend:
+    """Scores through a shared library compiled from the booster by tl2cgen"""
+    name = 'treelite'
+
+    def __init__(self, model, cache_dir: str, nthread: int = 1):
+        import tl2cgen
+        import treelite
+
+        self._tl2cgen = tl2cgen
+        booster = _scoring_booster(model)
+        self.libpath = os.path.join(cache_dir, f"xgb-{_booster_digest(booster)}-tl2cgen-{tl2cgen.__version__}.so")
+        if not os.path.exists(self.libpath):
+            start = time.perf_counter()
+            os.makedirs(cache_dir, exist_ok=True)
+            # Compile next to the final path and rename, so that concurrent
+            # workers never load a half-written library
+            fd, tmp_path = tempfile.mkstemp(suffix='.so', dir=cache_dir)
+            os.close(fd)
+            try:
+                tl2cgen.export_lib(treelite.frontend.from_xgboost(booster), toolchain='gcc', libpath=tmp_path,
+                                   params={'parallel_comp': os.cpu_count() or 1})
+                os.replace(tmp_path, self.libpath)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            print(f"🛠️  Compiled Treelite model to {self.libpath} in {time.perf_counter() - start:.1f}s")
+        self.predictor = tl2cgen.Predictor(self.libpath, nthread=nthread)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        output = self.predictor.predict(self._tl2cgen.DMatrix(np.asarray(features, dtype=np.float32)))
+        return output.reshape(len(features), -1)[:, -1]
+
+
+class OnnxBackend:
+    """Scores through an ONNX Runtime CPU session built from the booster"""
+    name = 'onnx'
+
+    def __init__(self, model, nthread: int = 1):
+        import onnxruntime as ort
+        from onnxmltools.convert import convert_xgboost
+        from onnxmltools.convert.common.data_types import FloatTensorType
+
+        # The converter only understands positional feature names (f0, f1, ...)
+        model = copy.deepcopy(model)
+        num_features = model.get_booster().num_features()
+        model.get_booster().feature_names = None
+        onnx_model = convert_xgboost(model, initial_types=[('input', FloatTensorType([None, num_features]))])
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = nthread
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(onnx_model.SerializeToString(), options,
+                                            providers=['CPUExecutionProvider'])
+        self.is_classifier = _is_classifier(model)
+        self.output = 'probabilities' if self.is_classifier else self.session.get_outputs()[0].name
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        output = self.session.run([self.output], {'input': np.asarray(features, dtype=np.float32)})[0]
+        return output[:, 1] if self.is_classifier else output.reshape(-1)
+
+
+class RoutedBackend:
+    """
+    Sends batches of up to max_rows to a compiled backend and larger ones to xgboost
+
+    The compiled runtimes win by avoiding per-call overhead, but xgboost's
+    own predictor is faster once a batch has a few hundred rows.
+    """
+
+    def __init__(self, backend, reference: XGBoostBackend, max_rows: int):
+        self.backend = backend
+        self.reference = reference
+        self.max_rows = max_rows
+        self.name = backend.name
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        if len(features) <= self.max_rows:
+            return self.backend.predict(features)
+        return self.reference.predict(features)
+
+
+def check_parity(backend, reference, sample: np.ndarray) -> float:
+    """Largest absolute difference between two backends on the sample rows"""
+    expected = np.asarray(reference.predict(sample), dtype=np.float64)
+    actual = np.asarray(backend.predict(sample), dtype=np.float64)
+    if actual.shape != expected.shape:
+        raise ValueError(f"{backend.name} returned shape {actual.shape}, expected {expected.shape}")
+    return float(np.max(np.abs(actual - expected))) if len(sample) else 0.0
+
+
+def load_backend(name: str, model, sample: np.ndarray, cache_dir: Optional[str] = None,
+                 nthread: int = 1, max_rows: Optional[int] = None, tolerance: float = PARITY_TOLERANCE):
+    """
+    Build the requested backend and verify it against xgboost
+
+    Args:
+        name: One of BACKENDS
+        model: Loaded XGBClassifier / XGBRegressor
+        sample: Feature rows used for the parity check
+        cache_dir: Where compiled Treelite libraries are kept
+        nthread: Threads per prediction call
+        max_rows: If set, larger batches are still scored by xgboost
+        tolerance: Maximum accepted absolute difference
+
+    Returns:
+        The backend, or XGBoostBackend if the requested one is unavailable or
+        does not match. The outcome is recorded in backend.info.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend {name!r}, expected one of {', '.join(BACKENDS)}")
+
+    reference = XGBoostBackend(model)
+    reference.info['requested'] = name
+    if name == 'xgboost':
+        return reference
+
+    try:
+        if name == 'treelite':
+            backend = TreeliteBackend(model, cache_dir or tempfile.gettempdir(), nthread)
+        else:
+            backend = OnnxBackend(model, nthread)
+        max_diff = check_parity(backend, reference, sample)
+    except Exception as e:
+        reference.info['fallback_reason'] = f"{type(e).__name__}: {e}"
+        print(f"⚠️  Inference backend {name!r} unavailable ({reference.info['fallback_reason']}), using xgboost")
+        return reference
+
+    if not max_diff <= tolerance:
+        reference.info.update(parity_max_abs_diff=max_diff, parity_rows=len(sample),
+                              fallback_reason=f"parity check failed (max diff {max_diff:.2e} > {tolerance:.0e})")
+        print(f"⚠️  Inference backend {name!r} does not match xgboost (max diff {max_diff:.2e}), using xgboost")
+        return reference
+
+    info = _info(name, name, parity_max_abs_diff=max_diff, parity_rows=len(sample), max_rows=max_rows)
+    print(f"⚡ Inference backend {name!r} verified on {len(sample)} rows (max diff {max_diff:.2e})")
+    if max_rows is not None:
+        backend = RoutedBackend(backend, reference, max_rows)
+    backend.info = info
+    return backend
+
+
+def _info(backend: str, requested: str, **fields) -> Dict:
+    info = {'backend': backend, 'requested': requested, 'parity_max_abs_diff': 0.0,
+            'parity_rows': 0, 'max_rows': None, 'fallback_reason': None}
+    info.update(fields)
+    return info
+
+
+def _is_classifier(model) -> bool:
+    # Duck-typed so that this module does not need to import xgboost itself
+    return hasattr(model, 'predict_proba')
+
+
+def _scoring_booster(model):
+    """
+    The trees the sklearn wrapper actually uses
+
+    Models trained with early stopping keep every boosted round, but
+    predict() stops at best_iteration; compiled backends must do the same.
+    """
+    booster = model.get_booster()
+    try:
+        return booster[:model.best_iteration + 1]
+    except AttributeError:
+        return booster
+
+
+def _booster_digest(booster) -> str:
+    """Short content hash of the booster, used to name compiled artifacts"""
+    return hashlib.sha256(bytes(booster.save_raw('ubj'))).hexdigest()[:16]
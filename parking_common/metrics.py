@@ -0,0 +1,61 @@
+"""
+Minimal in-process metrics (latency histograms) for both services
+"""
+import bisect
+import threading
+from typing import Dict, Optional, Sequence
+
+# Default latency buckets in milliseconds
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 3, 5, 7.5, 10, 15, 25, 50, 100, 250, 500, 1000)
+
+
+class Histogram:
+    """Fixed-bucket histogram with count/sum and approximate percentiles"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Upper bound of the bucket containing the q-th percentile
+
+        Returns None when there are no samples or it falls beyond the
+        largest bucket (null in JSON snapshots).
+        """
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if total == 0:
+            return None
+        rank = q / 100 * total
+        seen = 0
+        for upper, count in zip(self.buckets + (None,), counts):
+            seen += count
+            if seen >= rank:
+                return upper
+        return None
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts, total, value_sum = list(self.counts), self.count, self.sum
+        return {
+            'count': total,
+            'mean': round(value_sum / total, 4) if total else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'buckets': {
+                str(upper): count
+                for upper, count in zip(self.buckets + ('+Inf',), counts)
+            },
+        }
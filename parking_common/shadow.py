@@ -0,0 +1,161 @@
+"""
+Shadow scoring for model comparisons under live traffic
+
+A ShadowScorer holds a second (candidate) model. A sample of the requests
+the primary model answers is handed to it together with the primary
+results; a background thread scores the same inputs with the candidate and
+records its latency and how far its outputs drift from the primary's.
+Nothing the shadow does is visible to the caller: submit() never blocks,
+and when the shadow falls behind, samples are dropped and counted.
+"""
+import os
+import queue
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from parking_common.metrics import Histogram, LATENCY_BUCKETS_MS
+
+# Absolute difference between primary and shadow outputs (both in 0-1)
+DRIFT_BUCKETS = (0.001, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5)
+
+_STOP = object()
+
+
+class ShadowScorer:
+    """Scores a sample of live inputs with a candidate model, off the request path"""
+
+    def __init__(self, score: Callable[[Sequence], np.ndarray], sample_rate: float = 0.1,
+                 max_queue: int = 100, threshold: Optional[float] = None, name: str = 'shadow'):
+        """
+        Args:
+            score: Scores a list of inputs with the shadow model, returning one
+                value per input (NaN for inputs it could not score)
+            sample_rate: Fraction of submitted requests that are shadow-scored
+            max_queue: Sampled requests waiting for the shadow beyond this are dropped
+            threshold: Decision threshold; outputs on opposite sides of it
+                count as a flip (e.g. 0.5 for FREE/OCCUPIED)
+            name: Label for logs and stats (e.g. the shadow model path)
+        """
+        self.score = score
+        self.sample_rate = sample_rate
+        self.max_queue = max_queue
+        self.threshold = threshold
+        self.name = name
+
+        self.primary_latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.shadow_latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.abs_diff = Histogram(DRIFT_BUCKETS)
+        self.sampled = 0
+        self.dropped = 0
+        self.errors = 0
+        self.rows = 0
+        self.flips = 0
+        self.primary_sum = 0.0
+        self.shadow_sum = 0.0
+        self.max_abs_diff = 0.0
+        self.last_error = None
+
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def submit(self, inputs: Sequence, primary: Sequence[float], primary_ms: float):
+        """
+        Offer one request's inputs and primary outputs for shadow scoring
+
+        primary holds one value per input (NaN where the primary failed).
+        Returns immediately whether or not the request is sampled.
+        """
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((list(inputs), np.asarray(primary, dtype=np.float64), primary_ms))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def stop(self, timeout: float = 5.0):
+        """Finish the queued samples, then stop the worker thread"""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            rows = self.rows
+            return {
+                'model': self.name,
+                'sample_rate': self.sample_rate,
+                'sampled': self.sampled,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'last_error': self.last_error,
+                'queued': self._queue.qsize(),
+                'rows_compared': rows,
+                'flips': self.flips,
+                'flip_rate': round(self.flips / rows, 6) if rows else 0.0,
+                'mean_primary': round(self.primary_sum / rows, 6) if rows else None,
+                'mean_shadow': round(self.shadow_sum / rows, 6) if rows else None,
+                'max_abs_diff': round(self.max_abs_diff, 6),
+                'abs_diff': self.abs_diff.snapshot(),
+                'primary_latency_ms': self.primary_latency_ms.snapshot(),
+                'shadow_latency_ms': self.shadow_latency_ms.snapshot(),
+            }
+
+    def _ensure_started(self):
+        # Started lazily so that each gunicorn worker (forked after preload)
+        # gets its own thread; the pid check restarts it after a fork
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._queue = queue.Queue(self.max_queue)
+            self._thread = threading.Thread(target=self._worker, name='shadow-scorer', daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            self._compare(*item)
+
+    def _compare(self, inputs, primary: np.ndarray, primary_ms: float):
+        start = time.perf_counter()
+        try:
+            shadow = np.asarray(self.score(inputs), dtype=np.float64)
+        except Exception as e:
+            with self._lock:
+                self.sampled += 1
+                self.errors += 1
+                self.last_error = str(e)
+            return
+        self.shadow_latency_ms.observe((time.perf_counter() - start) * 1e3)
+        self.primary_latency_ms.observe(primary_ms)
+
+        valid = ~(np.isnan(primary) | np.isnan(shadow))
+        primary, shadow = primary[valid], shadow[valid]
+        diff = np.abs(primary - shadow)
+        for value in diff.tolist():
+            self.abs_diff.observe(value)
+        flips = 0
+        if self.threshold is not None:
+            flips = int(np.count_nonzero((primary > self.threshold) != (shadow > self.threshold)))
+
+        with self._lock:
+            self.sampled += 1
+            self.rows += int(valid.sum())
+            self.flips += flips
+            self.primary_sum += float(primary.sum())
+            self.shadow_sum += float(shadow.sum())
+            if diff.size:
+                self.max_abs_diff = max(self.max_abs_diff, float(diff.max()))
+